@@ -1,33 +1,108 @@
 """Wrapper around `eye` module, adding types and input checking."""
 
-from eyepy.lcd import *
-from eyepy.keys import *
+from __future__ import annotations
 
-# TODO camera
-from eyepy.camera import *
+# Submodules are only imported when one of their names is first accessed,
+# so e.g. a script only driving motors doesn't pay for loading the LCD, camera, or image code.
 
-# TODO complete image processing
-from eyepy.image_processing import *
+import importlib as _importlib
 
-from eyepy.os_funcs import *
 
-# TODO usb/serial
+_LAZY_EXPORTS: dict[str, tuple[str, ...]] = {
+    "lcd": (
+        "LCDPrintf", "LCDSetPrintf", "LCDClear", "LCDSetPos", "LCDPos", "LCDGetPos", "LCDSetColor",
+        "Font", "HELVETICA", "TIMES", "COURIER", "FontVariation", "NORMAL", "BOLD", "ITALICS",
+        "LCDSetFont", "FontSize", "LCDSetFontSize", "LCDMode", "LCDSetMode", "LCDMenu", "LCDMenuI", "LCDSize", "LCDGetSize",
+        "lcd_make_coord_map", "lcd_default_point_map", "lcd_default_world_coord_map", "LCDSetPointMap",
+        "PointsLike", "ColoursLike", "LCDPixel", "LCDGetPixel", "LCDLine", "LCDArea", "LCDPixelArea", "LCDCircle",
+        "LCDPixels", "LCDLines", "LCDPolyline", "LCDAreas",
+        "LCDImageSize", "LCDImageStart", "LCDImage", "LCDImageGray", "LCDImageBinary", "LCDRefresh",
+    ),
+    "keys": ("lib", "Key", "KEY1", "KEY2", "KEY3", "KEY4", "KEYGet", "KEYRead", "KEYWait", "KEYGetXY", "KEYReadXY"),
 
-# TODO audio
+    # TODO camera
+    "camera": ("CAMInit", "CAMRelease", "CAMGet", "CAMGetGray", "CAMFrame", "CaptureMode", "CAMCapture"),
 
-from eyepy.psd import *
-from eyepy.lidar import *
-from eyepy.motors import *
-from eyepy.v_omega import *
+    # TODO complete image processing
+    "image_processing": (
+        "IPPRGB2Col", "IPPCol2RGB", "IPPCol2HSI", "IPPRGB2Hue", "IPPRGB2HSI", "IPPHSI2RGB",
+        "NO_HUE", "IPPRGB2HueImage", "IPPRGB2HSIImage", "IPPCol2HSIArray", "IPPHSI2RGBImage",
+        "HSILookupTable", "set_hsi_lookup_table", "get_hsi_lookup_table", "LookupTableOption",
+        "HSIRange", "Blob", "BlobResult", "label_blobs", "find_blobs", "LineSegment", "hough_lines",
+    ),
 
-# TODO digital and analog i/o
+    "os_funcs": (
+        "OSExecute", "OSVersion", "OSVersionIO", "OSMachineSpeed", "OSMachineType", "OSMachineName", "OSMachineID",
+        "OSWait", "Timer", "OSAttachTimer", "OSDetachTimer", "OSTime", "OSGetTime", "OSGetTimePy", "OSGetCount",
+    ),
 
-# TODO IR remote control
+    # TODO usb/serial
 
-# TODO radio communication
+    # TODO audio
 
-# TODO sim only functions
+    "psd": ("PSDPort", "PSD_FRONT", "PSD_LEFT", "PSD_RIGHT", "PSD_BACK", "PSDGet", "PSDGetRaw"),
+    "lidar": ("LIDARGet", "LIDARSet", "LIDARConfig", "LIDARGetConfig", "LIDARScan", "LIDARGetScan"),
+    "motors": (
+        "CommandCacheStats", "ServoPort", "clamp_servo_angle", "SERVOSet", "SERVOSetRaw", "SERVORange",
+        "SERVOSetMany", "SERVOResync", "servo_cache_stats", "reset_servo_cache_stats", "forget_servo_angles",
+        "clamp_motor_speed", "MotorPort", "MOTORDrive", "MOTORDriveRaw", "MOTORDriveMany", "MOTORResync",
+        "motor_cache_stats", "reset_motor_cache_stats", "forget_motor_speeds",
+        "MOTORPID", "MOTORPIDOff", "MOTORSpeed", "MOTORDualDrive", "EncoderPort", "ENCODERRead", "ENCODERReset",
+    ),
+    "v_omega": (
+        "wrap_turn_angle", "VWSetSpeed", "VWGetSpeed", "VWPosition", "VWSetPosition", "VWGetPosition",
+        "VWStraight", "VWTurn", "VWCurve", "VWDrive", "VWRemain", "VWDone", "VWWait", "VWStalled", "VWStop",
+    ),
 
-# new funcs
-from eyepy.utils import *
-from eyepy.drawing import *
+    # TODO digital and analog i/o
+
+    # TODO IR remote control
+
+    # TODO radio communication
+
+    # TODO sim only functions
+
+    # new funcs
+    "internal_utils": ("eye_lock",),
+    "utils": ("clamp", "wrap", "rad_to_deg", "deg_to_rad"),
+    "image_ops": ("BorderMode",),
+    "drawing": (
+        "IntPoint", "IntPointLike", "Point", "PointLike", "IntVector", "Vector",
+        "PointArray", "PointArrayLike", "VectorArray", "Affine2D", "RoundedAffine2D",
+        "make_linear_point_mapping", "make_coord_map",
+        "RED", "GREEN", "BLUE", "WHITE", "GRAY", "BLACK", "ORANGE", "SILVER", "LIGHTGRAY", "DARKGRAY",
+        "NAVY", "CYAN", "TEAL", "MAGENTA", "PURPLE", "MAROON", "YELLOW", "OLIVE",
+        "Colour", "colour_to_str", "colour_to_rgb",
+        "ImageResolution", "QQVGA", "QVGA", "VGA", "CAM1MP", "CAMHD", "CAM5MP", "resolution_from_size", "Image", "ImageView", "IntegralImage",
+    ),
+    "pose": ("Pose2D",),
+    "occupancy_grid": ("OccupancyGrid",),
+    "sensor_scheduler": ("SensorSample", "SensorScheduler"),
+    "lcd_shadow": ("LCDShadow",),
+    "sensor_log": ("SensorLogKind", "SensorLogWriter", "LogRecord", "SensorLog", "SensorRecorder", "SensorReplay"),
+    "fast_path": ("bind_motor_drive", "bind_servo_set", "bind_psd_get", "bind_encoder_read", "bind_vw_set_speed"),
+    "instrumentation": (
+        "CallStats", "enable_instrumentation", "disable_instrumentation", "instrumentation_enabled",
+        "reset_instrumentation", "instrumentation_snapshot", "instrumentation_report",
+    ),
+}
+
+_export_modules: dict[str, str] = {name: module for module, names in _LAZY_EXPORTS.items() for name in names}
+
+__all__ = list(_export_modules)
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        return _importlib.import_module(f"{__name__}.{name}")
+
+    module_name = _export_modules.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(_importlib.import_module(f"{__name__}.{module_name}"), name)
+    # cache, so later accesses don't go through `__getattr__`
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_export_modules))
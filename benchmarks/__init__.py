@@ -0,0 +1,11 @@
+"""
+Benchmarks of the per-call cost of eyepy, run against the headless backend (:mod:`eyepy.headless`)
+so no simulator is needed. Times include the backend's own work (e.g. ray casting for sensors and
+the camera, and rasterising LCD drawing), so compare them against a saved baseline rather than
+reading them as eyepy's overhead alone.
+
+Each benchmark reports calls per second, the peak memory allocated during one call, and the memory
+blocks still allocated after each call (e.g. by a growing cache).
+
+Run with `python -m eyepy.benchmarks`; see `--help` for saving and comparing against a baseline.
+"""
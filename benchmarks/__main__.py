@@ -0,0 +1,126 @@
+"""
+Runs the benchmarks against the headless `eye` backend.
+
+    python -m eyepy.benchmarks [--filter TEXT] [--save PATH] [--compare PATH]
+"""
+
+from __future__ import annotations
+import argparse
+import gc
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+from eyepy import headless
+
+
+def _ops_per_sec(func: Callable[[], object], *, repeats: int, min_time: float) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    # scale up so each repeat takes at least `min_time`
+    number = max(number, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=repeats, number=number))
+    return number / best
+
+def _peak_allocated(func: Callable[[], object]) -> int:
+    """
+    Returns the peak memory allocated (and traced by `tracemalloc`) during one call, in bytes.
+    """
+    func()  # warm up any caches first
+    tracemalloc.start()
+    try:
+        current_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - current_before
+
+def _retained_blocks(func: Callable[[], object], *, calls: int) -> float:
+    """
+    Returns the number of memory blocks (traced by `tracemalloc`) still allocated after each call, on average,
+    from snapshots before and after :param:`calls` calls; non-zero for e.g. growing caches or leaks.
+    """
+    func()  # warm up any caches first
+    ignore_tracemalloc = (tracemalloc.Filter(False, tracemalloc.__file__),)
+    tracemalloc.start()
+    try:
+        gc.collect()
+        before = tracemalloc.take_snapshot().filter_traces(ignore_tracemalloc)
+        for _ in range(calls):
+            func()
+        gc.collect()
+        after = tracemalloc.take_snapshot().filter_traces(ignore_tracemalloc)
+    finally:
+        tracemalloc.stop()
+    return sum(stat.count_diff for stat in after.compare_to(before, "filename")) / calls
+
+def _format_rate(ops: float) -> str:
+    for unit, scale in (("M", 1e6), ("k", 1e3)):
+        if ops >= scale:
+            return f"{ops / scale:8.2f}{unit}"
+    return f"{ops:8.2f} "
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m eyepy.benchmarks", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--repeats", type=int, default=5, help="timing repeats per benchmark; the best is reported")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per timing repeat")
+    parser.add_argument("--save", metavar="PATH", help="save the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="relative slowdown vs the baseline reported as a regression")
+    args = parser.parse_args(argv)
+
+    sim = headless.install(headless.World.box(2000, 2000))
+    sim.set_pose(1000, 1000, 0)
+    from eyepy.benchmarks.cases import BENCHMARKS
+
+    baseline: dict[str, Any] = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    results: dict[str, dict[str, float]] = {}
+    regressions: list[str] = []
+
+    print(f"{'benchmark':<42} {'ops/sec':>9} {'peak KiB':>9} {'blocks/call':>11}" + (f" {'vs base':>8}" if baseline else ""))
+    for bench in BENCHMARKS:
+        if args.filter not in bench.full_name:
+            continue
+
+        ops = _ops_per_sec(bench.func, repeats=args.repeats, min_time=args.min_time)
+        peak = _peak_allocated(bench.func)
+        # enough calls to amortise one-off allocations (e.g. NumPy's internal caches)
+        blocks = _retained_blocks(bench.func, calls=max(20, min(1000, int(ops / 20))))
+        results[bench.full_name] = {"ops_per_sec": ops, "peak_bytes": peak, "retained_blocks_per_call": blocks}
+
+        line = f"{bench.full_name:<42} {_format_rate(ops)} {peak / 1024:9.1f} {blocks:11.2f}"
+        base = baseline.get(bench.full_name)
+        if base is not None:
+            ratio = ops / base["ops_per_sec"]
+            line += f" {ratio:7.2f}x"
+            if ratio < 1 - args.tolerance:
+                line += "  REGRESSION"
+                regressions.append(bench.full_name)
+        print(line)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            }, f, indent=2)
+        print(f"saved baseline to {args.save}")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
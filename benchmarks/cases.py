@@ -0,0 +1,166 @@
+"""
+The benchmark cases. Importing this module imports eyepy, so the headless `eye` backend
+must be installed first (see :func:`eyepy.headless.install`).
+"""
+
+from __future__ import annotations
+import os
+import tempfile
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+import eyepy
+
+
+class Benchmark(NamedTuple):
+    group: str
+    name: str
+    func: Callable[[], object]
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.group}.{self.name}"
+
+BENCHMARKS: list[Benchmark] = []
+
+def benchmark(group: str, name: str, func: Callable[[], object]):
+    BENCHMARKS.append(Benchmark(group, name, func))
+
+
+# motors
+
+benchmark("motors", "MOTORDrive", lambda: eyepy.MOTORDrive(1, 50))
+benchmark("motors", "MOTORDrive_list4", lambda: eyepy.MOTORDrive([1, 2, 3, 4], 50))
+benchmark("motors", "MOTORDriveMany_unchanged4", lambda: eyepy.MOTORDriveMany({1: 50, 2: 50, 3: -50, 4: -50}))
+benchmark("motors", "MOTORDualDrive", lambda: eyepy.MOTORDualDrive(1, 2, speed=80, offset=40, overflow_coeff=0.5))
+benchmark("motors", "SERVOSet", lambda: eyepy.SERVOSet(1, 128))
+benchmark("motors", "ENCODERRead", lambda: eyepy.ENCODERRead(1))
+_drive1 = eyepy.bind_motor_drive(1)
+benchmark("motors", "bind_motor_drive", lambda: _drive1(50))
+
+
+# v-omega
+
+benchmark("vw", "VWSetSpeed", lambda: eyepy.VWSetSpeed(lin_speed=100, ang_speed=10))
+_set_speed = eyepy.bind_vw_set_speed()
+benchmark("vw", "bind_vw_set_speed", lambda: _set_speed(100, 10))
+benchmark("vw", "VWGetPosition", eyepy.VWGetPosition)
+benchmark("vw", "VWGetSpeed", eyepy.VWGetSpeed)
+benchmark("vw", "VWTurn", lambda: eyepy.VWTurn(270, ang_speed=45))
+
+
+# psd
+
+benchmark("psd", "PSDGet", lambda: eyepy.PSDGet(eyepy.PSD_FRONT))
+benchmark("psd", "bind_psd_get", eyepy.bind_psd_get(eyepy.PSD_FRONT))
+
+
+# lidar
+
+benchmark("lidar", "LIDARGet", eyepy.LIDARGet)
+benchmark("lidar", "LIDARGet_override", lambda: eyepy.LIDARGet(n_points=180))
+benchmark("lidar", "LIDARGetScan", eyepy.LIDARGetScan)
+_scan = eyepy.LIDARGetScan()
+_pose = eyepy.VWPosition(eyepy.IntPoint(500, 500), 45)
+benchmark("lidar", "LIDARScan.to_points_world", lambda: _scan.to_points(_pose))
+
+
+# lcd
+
+_world_map = eyepy.lcd_make_coord_map((2000, 2000))
+_scan_points = _scan.to_points(_pose) + 1000
+_scan_point_list = [eyepy.Point(x, y) for x, y in _scan_points.tolist()]
+
+benchmark("lcd", "LCDSetColor", lambda: eyepy.LCDSetColor(foreground=eyepy.WHITE, background=eyepy.BLACK))
+benchmark("lcd", "LCDPixel", lambda: eyepy.LCDPixel((10, 10), eyepy.RED))
+benchmark("lcd", "LCDLine_world_map", lambda: eyepy.LCDLine((0, 0), (1000, 1000), eyepy.RED, point_map_override=_world_map))
+benchmark("lcd", "LCDArea", lambda: eyepy.LCDArea((10, 10), (20, 20), eyepy.RED))
+benchmark("lcd", "LCDPixelArea_world_map", lambda: eyepy.LCDPixelArea((1000, 1000), eyepy.RED, pixel_dx=10, pixel_dy=10, point_map_override=_world_map))
+benchmark("lcd", "LCDPixel_x360_world_map", lambda: [eyepy.LCDPixel(p, eyepy.RED, point_map_override=_world_map) for p in _scan_point_list])
+benchmark("lcd", "LCDPixels_360_world_map", lambda: eyepy.LCDPixels(_scan_points, eyepy.RED, point_map_override=_world_map))
+benchmark("lcd", "LCDPolyline_360_world_map", lambda: eyepy.LCDPolyline(_scan_points, eyepy.RED, closed=True, point_map_override=_world_map))
+_shadow = eyepy.LCDShadow()
+_shadow.flush()
+def _shadow_flush_one_pixel():
+    _shadow.frame[20, 400] ^= 0xFF
+    return _shadow.flush()
+benchmark("lcd", "LCDShadow_flush_one_pixel", _shadow_flush_one_pixel)
+
+
+# point mapping
+
+_affine = eyepy.make_linear_point_mapping(((0, 0), (1, 0)), ((10, 10), (10, 12)), mirror=True)
+benchmark("mapping", "Affine2D_call", lambda: _affine(eyepy.Point(3, 4)))
+benchmark("mapping", "Affine2D_apply_many_360", lambda: _affine.apply_many(_scan_points))
+benchmark("mapping", "Vector_rotate", lambda: eyepy.Vector(3, 4) << 0.5)
+_vectors_1000 = eyepy.VectorArray.from_polar(magnitudes=100, angles=[i / 1000 for i in range(1000)])
+benchmark("mapping", "VectorArray_rotate_1000", lambda: _vectors_1000 << 0.5)
+benchmark("mapping", "PointArray_translate_round_1000", lambda: (_vectors_1000.as_points() + eyepy.Vector(3, 4)).round())
+
+
+# camera
+
+eyepy.CAMInit(eyepy.QVGA)
+benchmark("camera", "CAMGet_QVGA", eyepy.CAMGet)
+benchmark("camera", "CAMGetGray_QVGA", eyepy.CAMGetGray)
+benchmark("camera", "CAMGet_as_array_QVGA", lambda: eyepy.CAMGet().as_array())
+
+
+# images
+
+_rng = np.random.default_rng(0)
+_colour = eyepy.Image.from_array(_rng.integers(0, 256, (eyepy.QVGA.HEIGHT, eyepy.QVGA.WIDTH, 3), dtype=np.uint8))
+_gray = eyepy.Image.from_array(_rng.integers(0, 256, (eyepy.QVGA.HEIGHT, eyepy.QVGA.WIDTH), dtype=np.uint8))
+_gray_list = _gray.as_array().ravel().tolist()
+_sharpen = np.array(((0, -1, 0), (-1, 5, -1), (0, -1, 0)))
+
+benchmark("image", "get_gray", lambda: _gray.get_gray((100, 100)))
+benchmark("image", "get_colour", lambda: _colour.get_colour((100, 100)))
+benchmark("image", "as_array", _colour.as_array)
+benchmark("image", "from_list_gray_QVGA", lambda: eyepy.Image.from_list(_gray_list, gray=True, resolution=eyepy.QVGA))
+_colour_bytes = bytes(eyepy.QVGA.SIZE)
+benchmark("image", "from_buffer_colour_QVGA", lambda: eyepy.Image.from_buffer(_colour_bytes, resolution=eyepy.QVGA))
+_canvas = eyepy.Image.blank(resolution=eyepy.QVGA)
+benchmark("image", "set_colour", lambda: _canvas.set_colour((100, 100), 0x102030))
+benchmark("image", "fill_region_colour", lambda: _canvas.fill_region((10, 10), (109, 109), 0x102030))
+_vga = eyepy.Image.from_array(_rng.integers(0, 256, (eyepy.VGA.HEIGHT, eyepy.VGA.WIDTH, 3), dtype=np.uint8))
+def _pyramid_uncached():
+    _vga.mark_modified()
+    return _vga.pyramid(2)
+benchmark("image", "pyramid_2_colour_VGA", _pyramid_uncached)
+benchmark("image", "view_materialise_colour_QQVGA", lambda: _vga.view((100, 100), (259, 219)).materialise())
+benchmark("image", "filter_3x3_gray_QVGA", lambda: _gray.filter(_sharpen))
+benchmark("image", "gaussian_filter_colour_QVGA", lambda: _colour.gaussian_filter(1.0))
+benchmark("image", "median_filter_3_gray_QVGA", lambda: _gray.median_filter(3))
+benchmark("image", "histogram_colour_QVGA", _colour.histogram)
+_rects_p1 = _rng.integers(0, 100, (1000, 2))
+_rects_p2 = _rects_p1 + _rng.integers(0, 100, (1000, 2))
+benchmark("image", "integral_variance_1000_rects_QVGA", lambda: eyepy.IntegralImage(_gray.as_array()).variance(_rects_p1, _rects_p2))
+benchmark("image", "threshold_otsu_gray_QVGA", _gray.threshold_otsu)
+benchmark("image", "threshold_adaptive_31_gray_QVGA", lambda: _gray.threshold_adaptive(31))
+benchmark("image", "sobel_gray_QVGA", _gray.sobel)
+_scene = np.full((eyepy.QVGA.HEIGHT, eyepy.QVGA.WIDTH), 60, dtype=np.uint8)
+_scene[60:180, 80:240] = 200
+_scene = eyepy.Image.from_array(np.clip(_scene + _rng.normal(0, 5, _scene.shape), 0, 255).astype(np.uint8))
+benchmark("image", "canny_gray_QVGA", lambda: _scene.canny(50, 100))
+_scene_edges = _scene.canny(50, 100)
+benchmark("image", "hough_lines_QVGA", lambda: eyepy.hough_lines(_scene_edges))
+benchmark("image", "IPPRGB2HSIImage_QVGA", lambda: eyepy.IPPRGB2HSIImage(_colour))
+_red_range = eyepy.HSIRange(hue=(20, 60), saturation=(100, 255))
+benchmark("image", "find_blobs_noise_QVGA", lambda: eyepy.find_blobs(_colour, _red_range))
+_lut = eyepy.HSILookupTable.build(6)
+benchmark("image", "IPPRGB2HSIImage_lut6_QVGA", lambda: eyepy.IPPRGB2HSIImage(_colour, lut=_lut))
+benchmark("image", "IPPRGB2HSI_scalar", lambda: eyepy.IPPRGB2HSI((10, 20, 30)))
+
+
+# sensor logs
+
+_log_path = os.path.join(tempfile.mkdtemp(), "benchmark.log")
+with eyepy.SensorLogWriter(_log_path) as _log_writer:
+    for _i in range(100):
+        _log_writer.write_image(_colour, timestamp=_i * 33)
+        _log_writer.write_lidar(_scan, timestamp=_i * 33)
+_log = eyepy.SensorLog(_log_path)
+benchmark("sensor_log", "read_frame_QVGA", lambda: _log[50].value.as_array())
+benchmark("sensor_log", "records_lidar_100", lambda: list(_log.records("lidar")))
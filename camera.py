@@ -1,4 +1,19 @@
+from __future__ import annotations
+from collections import deque
+import ctypes
+import threading
+from typing import NamedTuple, Optional
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+from eye import lib
+
 from eyepy.drawing import Image, ImageResolution
+from eyepy.internal_utils import eye_lock
+from eyepy.os_funcs import OSGetCount
 
 
 def _CAM_OK(return_code: int) -> bool:
@@ -34,6 +49,7 @@ from eye import CAMGet as _CAMGet
 def CAMGet() -> Image:
     """
     Raises a `ValueError` if the resolution is not set (in testing, segfault-ed if not set).
+    The returned image wraps the buffer filled by `eye`, so :meth:`Image.as_array` doesn't copy.
     """
     if _camera_resolution.PIXELS == 0:
         raise ValueError("resolution not set")
@@ -46,6 +62,7 @@ from eye import CAMGetGray as _CAMGetGray
 def CAMGetGray() -> Image:
     """
     Raises a `ValueError` if the resolution is not set (in testing, segfault-ed if not set).
+    The returned image wraps the buffer filled by `eye`, so :meth:`Image.as_array` doesn't copy.
     """
     if _camera_resolution.PIXELS == 0:
         raise ValueError("resolution not set")
@@ -53,3 +70,192 @@ def CAMGetGray() -> Image:
     raw_image = _CAMGetGray()
     image = Image.from_c_bytes(raw_image, gray=True, resolution=_camera_resolution)
     return image
+
+
+# background capture
+
+class CAMFrame(NamedTuple):
+    image: Image
+    """only valid until the frame is released; see :meth:`CAMCapture.get`"""
+
+    seq: int
+    """sequence number of the frame, counting every frame captured (including dropped frames) from 0"""
+
+    timestamp: int
+    """:func:`OSGetCount` (ms) when the frame was captured"""
+
+CaptureMode = Literal["latest", "every"]
+
+class CAMCapture:
+    """
+    Captures frames continuously on a background thread into a fixed pool of reusable buffers,
+    so processing can overlap acquisition.
+
+    In `"latest"` mode :meth:`get` returns the most recent frame, and any older unconsumed frames
+    are dropped. In `"every"` mode frames are queued, and the oldest unconsumed frame is only
+    dropped when every buffer is in use (i.e. the consumer has fallen `n_buffers - 1` frames behind).
+
+    The camera must already be initialised with :func:`CAMInit`, and must not be re-initialised
+    while capturing. Each capture holds :data:`eye_lock`, so while capturing, calls into `eye` from
+    other threads (including the main thread) must hold it too; otherwise they may run concurrently
+    with a capture. Can be used as a context manager, which starts and stops the capture.
+    """
+    _gray: bool
+    _mode: CaptureMode
+    _resolution: ImageResolution
+    _images: list[Image]
+    _lock: threading.Condition
+    _free: deque[int]
+    _ready: deque[tuple[int, int, int]]
+    _held: Optional[int]
+    _thread: Optional[threading.Thread]
+    _running: bool
+    _seq: int
+    _dropped: int
+    _errors: int
+
+    def __init__(self, *, gray: bool = False, mode: CaptureMode = "latest", n_buffers: int = 3):
+        """
+        :param:`gray` if `True` captures gray frames (as :func:`CAMGetGray`), otherwise colour frames
+        :param:`mode` `"latest"` or `"every"`
+        :param:`n_buffers` the number of preallocated frame buffers (at least 2)
+
+        Raises a `ValueError` if the resolution is not set, or the arguments are invalid.
+        """
+        if _camera_resolution.PIXELS == 0:
+            raise ValueError("resolution not set")
+        if mode not in ("latest", "every"):
+            raise ValueError(f"unknown capture mode '{mode}'; expected 'latest' or 'every'")
+        if n_buffers < 2:
+            raise ValueError(f"at least 2 buffers are required but got {n_buffers}")
+
+        self._gray = gray
+        self._mode = mode
+        self._resolution = _camera_resolution
+
+        size = self._resolution.PIXELS if gray else self._resolution.SIZE
+        self._images = [
+            Image.from_c_bytes((ctypes.c_byte * size)(), gray=gray, resolution=self._resolution)
+            for _ in range(n_buffers)
+        ]
+
+        self._lock = threading.Condition()
+        self._free = deque(range(n_buffers))
+        self._ready = deque()
+        self._held = None
+        self._thread = None
+        self._running = False
+        self._seq = 0
+        self._dropped = 0
+        self._errors = 0
+
+    def __enter__(self) -> CAMCapture:
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def dropped(self) -> int:
+        """the number of captured frames that were never returned by :meth:`get`"""
+        return self._dropped
+
+    @property
+    def errors(self) -> int:
+        """the number of captures where the internal call to `CAMGet`/`CAMGetGray` returned an error value"""
+        return self._errors
+
+    @property
+    def frames_captured(self) -> int:
+        return self._seq
+
+    def start(self):
+        """
+        Starts the capture thread; does nothing if it is already running.
+        """
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="CAMCapture", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the capture thread and waits for the current capture to finish.
+        Frames already captured can still be retrieved with :meth:`get`.
+        """
+        with self._lock:
+            self._running = False
+            self._lock.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _capture_loop(self):
+        capture = lib.CAMGetGray if self._gray else lib.CAMGet
+        while True:
+            with self._lock:
+                if not self._running:
+                    return
+                if self._free:
+                    i = self._free.popleft()
+                else:
+                    # every buffer is either held or waiting; overwrite the oldest waiting frame
+                    i, _, _ = self._ready.popleft()
+                    self._dropped += 1
+
+            # the lock isn't held during the capture, so consumers aren't blocked by it
+            with eye_lock:
+                return_code = capture(self._images[i]._c_bytes)
+                timestamp = OSGetCount()
+            # the buffer is reused, so invalidate anything cached from its previous frame
+            self._images[i].mark_modified()
+
+            with self._lock:
+                if not _CAM_OK(return_code):
+                    self._errors += 1
+                    self._free.append(i)
+                    continue
+
+                if self._mode == "latest":
+                    while self._ready:
+                        self._free.append(self._ready.popleft()[0])
+                        self._dropped += 1
+                self._ready.append((i, self._seq, timestamp))
+                self._seq += 1
+                self._lock.notify_all()
+
+    def release(self):
+        """
+        Returns the frame most recently returned by :meth:`get` to the buffer pool.
+        Called automatically by :meth:`get`.
+        """
+        with self._lock:
+            if self._held is not None:
+                self._free.append(self._held)
+                self._held = None
+
+    def get(self, timeout: Optional[float] = None) -> CAMFrame | None:
+        """
+        Blocks until a frame is available, and returns it.
+        Returns `None` if :param:`timeout` (seconds) expires first, or if the capture is stopped
+        with no frames waiting.
+
+        The returned frame's image is only valid until the next call to :meth:`get` or :meth:`release`,
+        after which its buffer will be reused; copy the image if it is needed for longer.
+        """
+        with self._lock:
+            if self._held is not None:
+                self._free.append(self._held)
+                self._held = None
+
+            if not self._lock.wait_for(lambda: self._ready or not self._running, timeout):
+                return None
+            if not self._ready:
+                return None
+
+            i, seq, timestamp = self._ready.popleft()
+            self._held = i
+            return CAMFrame(self._images[i], seq, timestamp)
@@ -1,15 +1,25 @@
 from __future__ import annotations
+import array
 from collections.abc import Sequence
 import ctypes
 import itertools
 import math
-from typing import Callable, NamedTuple, cast, overload
+from typing import Callable, NamedTuple, Optional, cast, overload
+
+import numpy as np
 
 try:
     from typing import Final, Literal, TypeAlias
 except ImportError:
     from typing_extensions import Final, Literal, TypeAlias
 
+from eyepy.image_ops import (
+    BorderMode, box_mean as _box_mean, correlate as _correlate, correlate_separable as _correlate_separable,
+    gaussian_kernel as _gaussian_kernel, histogram as _histogram, hysteresis as _hysteresis, integral as _integral,
+    median as _median, non_maximum_suppression as _non_maximum_suppression, otsu_level as _otsu_level,
+    rect_sums as _rect_sums, sobel as _sobel, to_uint8 as _to_uint8,
+)
+
 
 class IntPoint(NamedTuple):
     x: int
@@ -160,8 +170,430 @@ class Vector(NamedTuple):
         """
         return Vector.from_angle(angle) * magnitude
     
-def make_linear_point_mapping(initial_points: tuple[PointLike, PointLike], final_points: tuple[PointLike, PointLike], mirror: bool = False) -> Callable[[Point], Point]:
-    """see also lcd.lcd_make_coord_map"""
+class _XYArray:
+    """
+    `N` 2D values stored as a struct of arrays: :attr:`x` and :attr:`y` (or `dx` and `dy`) are
+    contiguous rows of one `(2, N)` array, and `np.asarray` gives an `(N, 2)` view without copying.
+    """
+    _data: np.ndarray
+    """shape `(2, N)`"""
+
+    def __init__(self, values: np.ndarray | Sequence[tuple[float, float]] | _XYArray):
+        """
+        :param:`values` an `(N, 2)` array, or a sequence of `(x, y)` pairs (e.g. :class:`Point`)
+        """
+        if isinstance(values, _XYArray):
+            data = values._data.copy()
+        else:
+            values = np.asarray(values)
+            if values.size == 0:
+                values = values.reshape(0, 2)
+            if values.ndim != 2 or values.shape[1] != 2:
+                raise ValueError(f"expected an (N, 2) array but got shape {values.shape}")
+            if not np.issubdtype(values.dtype, np.number):
+                raise ValueError(f"expected a numeric array but got dtype {values.dtype}")
+            data = np.ascontiguousarray(values.T)
+        self._data = data
+
+    @classmethod
+    def _from_data(cls, data: np.ndarray):
+        """
+        Wraps a `(2, N)` array without copying.
+        """
+        result = cls.__new__(cls)
+        result._data = data
+        return result
+
+    @classmethod
+    def from_xy(cls, x: np.ndarray | Sequence[float], y: np.ndarray | Sequence[float]):
+        """
+        Creates an array from separate x and y coordinates.
+        """
+        return cls._from_data(np.stack(np.broadcast_arrays(np.asarray(x), np.asarray(y))).reshape(2, -1))
+
+    def __len__(self) -> int:
+        return self._data.shape[1]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """an `(N, 2)` view"""
+        values = self._data.T
+        if dtype is not None and values.dtype != dtype:
+            return values.astype(dtype)
+        return values.copy() if copy else values
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    def _operand(self, other: object) -> np.ndarray | float | None:
+        """
+        Returns :param:`other` as a `(2, N)` (or `(2, 1)`) array, for element-wise operations.
+        """
+        if isinstance(other, _XYArray):
+            if len(other) != len(self):
+                raise ValueError(f"array lengths differ: {len(self)} and {len(other)}")
+            return other._data
+        if isinstance(other, tuple) and len(other) == 2:
+            return np.array(other, dtype=np.float64).reshape(2, 1)
+        return None
+
+    def _scalar(self, n: object) -> np.ndarray | float | None:
+        """
+        Returns :param:`n` as a number or an array broadcastable over every element, or `None` if it's neither.
+        """
+        if isinstance(n, (int, float, np.number)):
+            return n  # type: ignore[return-value]
+        if isinstance(n, np.ndarray) and n.ndim <= 1:
+            return n
+        return None
+
+    def round(self):
+        """
+        Rounds to integer (`int64`) coordinates, as :meth:`Point.round`.
+        """
+        return type(self)._from_data(np.rint(self._data).astype(np.int64))
+
+    def floor(self):
+        return type(self)._from_data(np.floor(self._data).astype(np.int64))
+
+    def ceil(self):
+        return type(self)._from_data(np.ceil(self._data).astype(np.int64))
+
+    def copy(self):
+        return type(self)._from_data(self._data.copy())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({np.asarray(self).tolist()})"
+
+class PointArray(_XYArray):
+    """
+    An array of points, supporting the same operators as :class:`Point`, applied to every point at once.
+    Indexing with an integer gives a :class:`Point` (or :class:`IntPoint` if the coordinates are integers),
+    and with a slice or mask gives a :class:`PointArray`.
+
+    Can be passed directly to functions taking an `(N, 2)` array of points, e.g. :func:`LCDPixels`.
+    """
+    @property
+    def x(self) -> np.ndarray:
+        return self._data[0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._data[1]
+
+    @staticmethod
+    def from_points(points: Sequence[PointLike]) -> PointArray:
+        return PointArray(points)
+
+    def to_points(self) -> list[Point] | list[IntPoint]:
+        point_type = IntPoint if np.issubdtype(self.dtype, np.integer) else Point
+        return [point_type(x, y) for x, y in zip(self.x.tolist(), self.y.tolist())]
+
+    def __iter__(self):
+        return iter(self.to_points())
+
+    @overload
+    def __getitem__(self, key: int) -> Point | IntPoint: ...
+    @overload
+    def __getitem__(self, key: slice | np.ndarray) -> PointArray: ...
+    def __getitem__(self, key: int | slice | np.ndarray) -> Point | IntPoint | PointArray:
+        if isinstance(key, (int, np.integer)):
+            x, y = self._data[:, key].tolist()
+            return IntPoint(x, y) if np.issubdtype(self.dtype, np.integer) else Point(x, y)
+        return PointArray._from_data(self._data[:, key])
+
+    def __add__(self, v: VectorArray | Vector | tuple[float, float]) -> PointArray:
+        if isinstance(v, PointArray):
+            return NotImplemented
+        other = self._operand(v)
+        if other is None:
+            return NotImplemented
+        return PointArray._from_data(self._data + other)
+
+    def __mul__(self, n: float | np.ndarray) -> PointArray:
+        scalar = self._scalar(n)
+        if scalar is None:
+            return NotImplemented
+        return PointArray._from_data(self._data * scalar)
+
+    # commutativity
+    def __rmul__(self, n: float | np.ndarray) -> PointArray:
+        return self * n
+
+    @overload
+    def __sub__(self, obj: VectorArray | Vector) -> PointArray: ...
+    @overload
+    def __sub__(self, obj: PointArray | PointLike) -> VectorArray: ...
+    def __sub__(self, obj: VectorArray | Vector | PointArray | PointLike) -> PointArray | VectorArray:
+        other = self._operand(obj)
+        if other is None:
+            return NotImplemented
+        if isinstance(obj, (Vector, VectorArray)):
+            return PointArray._from_data(self._data - other)
+        return VectorArray._from_data(self._data - other)
+
+    def __truediv__(self, n: float | np.ndarray) -> PointArray:
+        scalar = self._scalar(n)
+        if scalar is None:
+            return NotImplemented
+        return PointArray._from_data(self._data / scalar)
+
+    def __abs__(self) -> np.ndarray:
+        """magnitudes"""
+        return np.hypot(self._data[0], self._data[1])
+
+    def as_vectors(self) -> VectorArray:
+        """shares the data"""
+        return VectorArray._from_data(self._data)
+
+PointArrayLike: TypeAlias = "PointArray | np.ndarray | Sequence[PointLike]"
+
+class VectorArray(_XYArray):
+    """
+    An array of vectors, supporting the same operators as :class:`Vector`, applied to every vector at once.
+    Indexing with an integer gives a :class:`Vector` (or :class:`IntVector` if the components are integers),
+    and with a slice or mask gives a :class:`VectorArray`.
+    """
+    @property
+    def dx(self) -> np.ndarray:
+        return self._data[0]
+
+    @property
+    def dy(self) -> np.ndarray:
+        return self._data[1]
+
+    @staticmethod
+    def from_vectors(vectors: Sequence[Vector | tuple[float, float]]) -> VectorArray:
+        return VectorArray(vectors)
+
+    def to_vectors(self) -> list[Vector] | list[IntVector]:
+        vector_type = IntVector if np.issubdtype(self.dtype, np.integer) else Vector
+        return [vector_type(dx, dy) for dx, dy in zip(self.dx.tolist(), self.dy.tolist())]
+
+    def __iter__(self):
+        return iter(self.to_vectors())
+
+    @overload
+    def __getitem__(self, key: int) -> Vector | IntVector: ...
+    @overload
+    def __getitem__(self, key: slice | np.ndarray) -> VectorArray: ...
+    def __getitem__(self, key: int | slice | np.ndarray) -> Vector | IntVector | VectorArray:
+        if isinstance(key, (int, np.integer)):
+            dx, dy = self._data[:, key].tolist()
+            return IntVector(dx, dy) if np.issubdtype(self.dtype, np.integer) else Vector(dx, dy)
+        return VectorArray._from_data(self._data[:, key])
+
+    @overload
+    def __add__(self, obj: VectorArray | Vector) -> VectorArray: ...
+    @overload
+    def __add__(self, obj: PointArray | PointLike) -> PointArray: ...
+    def __add__(self, obj: VectorArray | Vector | PointArray | PointLike) -> VectorArray | PointArray:
+        other = self._operand(obj)
+        if other is None:
+            return NotImplemented
+        if isinstance(obj, (Vector, VectorArray)):
+            return VectorArray._from_data(self._data + other)
+        return PointArray._from_data(self._data + other)
+
+    def __mul__(self, n: float | np.ndarray) -> VectorArray:
+        scalar = self._scalar(n)
+        if scalar is None:
+            return NotImplemented
+        return VectorArray._from_data(self._data * scalar)
+
+    # commutativity
+    def __rmul__(self, n: float | np.ndarray) -> VectorArray:
+        return self * n
+
+    # must be left-multiplied
+    def __rmatmul__(self, mat: np.ndarray | tuple[tuple[float, float], tuple[float, float]]) -> VectorArray:
+        return VectorArray._from_data(np.asarray(mat, dtype=np.float64) @ self._data)
+
+    def __sub__(self, v: VectorArray | Vector) -> VectorArray:
+        if not isinstance(v, (Vector, VectorArray)):
+            return NotImplemented
+        return VectorArray._from_data(self._data - self._operand(v))
+
+    def __truediv__(self, n: float | np.ndarray) -> VectorArray:
+        scalar = self._scalar(n)
+        if scalar is None:
+            return NotImplemented
+        return VectorArray._from_data(self._data / scalar)
+
+    def __abs__(self) -> np.ndarray:
+        """magnitudes"""
+        return np.hypot(self._data[0], self._data[1])
+
+    def __neg__(self) -> VectorArray:
+        return VectorArray._from_data(-self._data)
+
+    # positive rotation
+    def __lshift__(self, angle: float | np.ndarray) -> VectorArray:
+        """rads; a single angle, or one per vector"""
+        cos, sin = np.cos(angle), np.sin(angle)
+        dx, dy = self._data
+        return VectorArray._from_data(np.stack((cos * dx - sin * dy, sin * dx + cos * dy)).reshape(2, -1))
+
+    # negative rotation
+    def __rshift__(self, angle: float | np.ndarray) -> VectorArray:
+        """rads; a single angle, or one per vector"""
+        return self << -np.asarray(angle)
+
+    def as_points(self) -> PointArray:
+        """shares the data"""
+        return PointArray._from_data(self._data)
+
+    def get_angle(self) -> np.ndarray:
+        """rads"""
+        return np.arctan2(self._data[1], self._data[0])
+
+    @staticmethod
+    def from_angle(angles: np.ndarray | Sequence[float]) -> VectorArray:
+        """
+        :param:`angles` rads
+
+        Returns a unit vector in the direction of each angle.
+        """
+        angles = np.asarray(angles, dtype=np.float64).reshape(-1)
+        return VectorArray._from_data(np.stack((np.cos(angles), np.sin(angles))))
+
+    @staticmethod
+    def from_polar(*, magnitudes: float | np.ndarray | Sequence[float], angles: np.ndarray | Sequence[float]) -> VectorArray:
+        """
+        :param:`angles` rads
+        """
+        return VectorArray.from_angle(angles) * np.asarray(magnitudes, dtype=np.float64)
+
+class Affine2D:
+    """
+    An affine point mapping `p' = A p + t`, stored as the precomputed 2x3 matrix `[A | t]`.
+
+    Calling it maps a single point; :meth:`apply_many` maps an `(N, 2)` array of points at once.
+    `f @ g` is the composition "apply `g`, then `f`".
+    """
+    matrix: Final[np.ndarray]
+    """2x3, read-only"""
+
+    def __init__(self, matrix: np.ndarray | Sequence[Sequence[float]]):
+        matrix = np.array(matrix, dtype=np.float64)
+        if matrix.shape != (2, 3):
+            raise ValueError(f"expected a 2x3 matrix but got shape {matrix.shape}")
+        matrix.flags.writeable = False
+        self.matrix = matrix
+
+        # plain floats are considerably faster than numpy scalars for single points
+        (self._a, self._b, self._tx), (self._c, self._d, self._ty) = matrix.tolist()
+
+    @classmethod
+    def from_linear(cls, linear: np.ndarray | Sequence[Sequence[float]], translation: PointLike | Vector = (0, 0)) -> Affine2D:
+        """
+        :param:`linear` the 2x2 matrix `A`
+        :param:`translation` the vector `t`
+        """
+        return cls(np.column_stack((np.asarray(linear, dtype=np.float64), np.asarray(translation, dtype=np.float64))))
+
+    @classmethod
+    def identity(cls) -> Affine2D:
+        return cls.from_linear(np.eye(2))
+
+    @classmethod
+    def translation(cls, v: Vector | tuple[float, float]) -> Affine2D:
+        return cls.from_linear(np.eye(2), v)
+
+    @classmethod
+    def rotation(cls, angle: float, centre: PointLike = (0, 0)) -> Affine2D:
+        """
+        :param:`angle` rads, positive rotation about :param:`centre`
+        """
+        cos, sin = math.cos(angle), math.sin(angle)
+        linear = np.array(((cos, -sin), (sin, cos)))
+        centre_array = np.asarray(centre, dtype=np.float64)
+        return cls.from_linear(linear, centre_array - linear @ centre_array)
+
+    @classmethod
+    def scaling(cls, sx: float, sy: float | None = None) -> Affine2D:
+        """
+        If :param:`sy` is `None`, scales both axes by :param:`sx`.
+        """
+        return cls.from_linear(np.diag((sx, sx if sy is None else sy)))
+
+    @property
+    def linear(self) -> np.ndarray:
+        """the 2x2 matrix `A`"""
+        return self.matrix[:, :2]
+
+    @property
+    def offset(self) -> Vector:
+        """the vector `t`"""
+        return Vector(self._tx, self._ty)
+
+    def __call__(self, p: PointLike) -> Point:
+        x, y = p
+        return Point(self._a * x + self._b * y + self._tx, self._c * x + self._d * y + self._ty)
+
+    def apply_many(self, points: PointArrayLike) -> np.ndarray:
+        """
+        Maps an `(N, 2)` array (or sequence, or :class:`PointArray`) of points, returning an `(N, 2)` array.
+        """
+        values = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return values @ self.matrix[:, :2].T + self.matrix[:, 2]
+
+    def __matmul__(self, other: Affine2D) -> Affine2D:
+        """
+        `(f @ g)(p) == f(g(p))`
+        """
+        if not isinstance(other, Affine2D):
+            return NotImplemented
+        linear = self.linear @ other.linear
+        translation = self.linear @ other.matrix[:, 2] + self.matrix[:, 2]
+        return type(self).from_linear(linear, translation)
+
+    def then(self, other: Affine2D) -> Affine2D:
+        """
+        `f.then(g)(p) == g(f(p))`
+        """
+        return other @ self
+
+    def inverse(self) -> Affine2D:
+        """
+        Throws a `ValueError` if the mapping is not invertible.
+        """
+        det = self._a * self._d - self._b * self._c
+        if det == 0:
+            raise ValueError("mapping is not invertible")
+        linear_inv = np.array(((self._d, -self._b), (-self._c, self._a))) / det
+        return Affine2D.from_linear(linear_inv, -(linear_inv @ self.matrix[:, 2]))
+
+    def rounded(self) -> RoundedAffine2D:
+        """
+        Returns the same mapping, but rounding mapped points to integers (e.g. for use as an LCD point map).
+        """
+        return RoundedAffine2D(self.matrix)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.matrix.tolist()})"
+
+class RoundedAffine2D(Affine2D):
+    """
+    An :class:`Affine2D` rounding mapped points to integers, as :meth:`Point.round`.
+    """
+    def __call__(self, p: PointLike) -> IntPoint:  # type: ignore[override]
+        x, y = p
+        return IntPoint(round(self._a * x + self._b * y + self._tx), round(self._c * x + self._d * y + self._ty))
+
+    def apply_many(self, points: PointArrayLike) -> np.ndarray:
+        """
+        Maps an `(N, 2)` array (or sequence, or :class:`PointArray`) of points, returning an `(N, 2)` integer array.
+        """
+        return np.rint(super().apply_many(points)).astype(np.int64)
+
+def make_linear_point_mapping(initial_points: tuple[PointLike, PointLike], final_points: tuple[PointLike, PointLike], mirror: bool = False) -> Affine2D:
+    """
+    Produces a mapping taking :param:`initial_points` to :param:`final_points` via
+    only rotation, uniform scaling, and translation (and reflection if :param:`mirror` is `True`).
+
+    see also lcd.lcd_make_coord_map
+    """
     o1 = Point(*initial_points[0])
     v1 = Point(*initial_points[1]) - o1
     v1_angle = v1.get_angle()
@@ -172,27 +604,19 @@ def make_linear_point_mapping(initial_points: tuple[PointLike, PointLike], final
     rot_rads = v2.get_angle() - v1_angle
     scaling = abs(v2) / abs(v1)
 
-    def f(p: Point) -> Point:
-        # get vector from 'origin'
-        v = p - o1
-
-        if mirror:
-            ang_diff_rads = v.get_angle() - v1_angle
-            v = v >> 2 * ang_diff_rads
+    cos, sin = math.cos(rot_rads), math.sin(rot_rads)
+    linear = scaling * np.array(((cos, -sin), (sin, cos)))
 
-        # rotate and scale vector
-        v = (v << rot_rads) * scaling
+    if mirror:
+        # reflect in the line through o1 in the direction of v1
+        cos2, sin2 = math.cos(2 * v1_angle), math.sin(2 * v1_angle)
+        linear = linear @ np.array(((cos2, sin2), (sin2, -cos2)))
 
-        # final position
-        p_prime = o2 + v
+    return Affine2D.from_linear(linear, np.asarray(o2) - linear @ np.asarray(o1))
 
-        return p_prime
-    
-    return f
-
-def make_coord_map(initial_points: tuple[PointLike, PointLike], final_points: tuple[PointLike, PointLike]) -> Callable[[Point], Point]:
+def make_coord_map(initial_points: tuple[PointLike, PointLike], final_points: tuple[PointLike, PointLike]) -> Affine2D:
     """
-    Produces a function mapping initial_points to final_points via
+    Produces a mapping taking initial_points to final_points via
     only stretches and translations to the x and y axis (independently).
     """
     initial_p1 = Point(*initial_points[0])
@@ -203,21 +627,9 @@ def make_coord_map(initial_points: tuple[PointLike, PointLike], final_points: tu
     final_p2 = Point(*final_points[1])
     final_delta = final_p2 - final_p1
 
-    matrix = ((final_delta.dx / initial_delta.dx, 0), (0, final_delta.dy / initial_delta.dy))
-
-    def f(p: Point) -> Point:
-        # get vector from p1 to p
-        v = p - initial_p1
+    linear = np.diag((final_delta.dx / initial_delta.dx, final_delta.dy / initial_delta.dy))
 
-        # flip and scale
-        v = matrix @ v
-
-        # translate to screen coords
-        p_prime = final_p1 + v
-
-        return p_prime
-    
-    return f
+    return Affine2D.from_linear(linear, np.asarray(final_p1) - linear @ np.asarray(initial_p1))
 
 
 from eye import RED, GREEN, BLUE, WHITE, GRAY, BLACK, ORANGE, SILVER, LIGHTGRAY, DARKGRAY, NAVY, CYAN, TEAL, MAGENTA, PURPLE, MAROON, YELLOW, OLIVE
@@ -265,19 +677,113 @@ CAMHD: Final[ImageResolution] = ImageResolution(_CAMHD_X, _CAMHD_Y, _CAMHD)
 from eye import CAM5MP as _CAM5MP, CAM5MP_X as _CAM5MP_X, CAM5MP_Y as _CAM5MP_Y
 CAM5MP: Final[ImageResolution] = ImageResolution(_CAM5MP_X, _CAM5MP_Y, _CAM5MP)
 
+def resolution_from_size(width: int, height: int) -> ImageResolution:
+    """
+    Returns the predefined resolution matching the dimensions if there is one,
+    otherwise a new custom resolution.
+    """
+    for resolution in (QQVGA, QVGA, VGA, CAM1MP, CAMHD, CAM5MP):
+        if resolution.WIDTH == width and resolution.HEIGHT == height:
+            return resolution
+    return ImageResolution(width, height)
+
 class Image(Sequence):
     _c_bytes: ctypes.Array[ctypes.c_byte]
     is_gray: Final[bool]
     resolution: Final[ImageResolution]
 
+    _version: int
+    """incremented by every tracked modification; see :meth:`mark_modified`"""
+    _pyramid: list[Image]
+    _pyramid_version: int
+    _integral: Optional[IntegralImage]
+    _integral_version: int
+
     def __init__(self, c_bytes: ctypes.Array[ctypes.c_byte], *, gray: bool = False, resolution: ImageResolution):
         self._c_bytes = c_bytes
         self.is_gray = gray
         self.resolution = resolution
+        self._version = 0
+        self._pyramid = []
+        self._pyramid_version = -1
+        self._integral = None
+        self._integral_version = -1
 
     @staticmethod
     def from_c_bytes(image: ctypes.Array[ctypes.c_byte], *, gray: bool = False, resolution: ImageResolution) -> Image:
         return Image(image, gray=gray, resolution=resolution)
+
+    @staticmethod
+    def blank(*, gray: bool = False, resolution: ImageResolution) -> Image:
+        """
+        Returns a new black image, e.g. to use as a reusable frame buffer.
+        """
+        size = resolution.PIXELS if gray else resolution.SIZE
+        return Image((ctypes.c_byte * size)(), gray=gray, resolution=resolution)
+
+    @staticmethod
+    def from_buffer(data: bytes | bytearray | memoryview | array.array, *, gray: bool = False, resolution: ImageResolution, copy: bool = True) -> Image:
+        """
+        Creates an image from raw pixel bytes (row by row, and `r, g, b` for colour images).
+
+        :param:`copy` if `True`, the data is copied in one block; if `False` the image wraps
+        :param:`data` directly, so writes to either are visible through the other
+
+        Throws a `ValueError` if the data is not a contiguous buffer of bytes of the right size,
+        or if :param:`copy` is `False` and the buffer is read-only (e.g. `bytes`).
+        """
+        view = memoryview(data)
+        if view.itemsize != 1:
+            raise ValueError(f"expected a buffer of bytes but got items of size {view.itemsize}")
+        if not view.contiguous:
+            raise ValueError("buffer is not contiguous")
+
+        size = resolution.PIXELS if gray else resolution.SIZE
+        if view.nbytes != size:
+            raise ValueError(f"expected {size} bytes for a {'gray' if gray else 'colour'} {resolution.WIDTH}x{resolution.HEIGHT} image but got {view.nbytes}")
+
+        if copy:
+            c_bytes = (ctypes.c_byte * size).from_buffer_copy(view)
+        else:
+            if view.readonly:
+                raise ValueError("buffer is read-only; use `copy=True`")
+            # `from_buffer` keeps a reference to the buffer, so it won't be freed while the image is alive
+            c_bytes = (ctypes.c_byte * size).from_buffer(view)
+        return Image(c_bytes, gray=gray, resolution=resolution)
+
+    @staticmethod
+    def from_array(array: np.ndarray, *, resolution: ImageResolution | None = None) -> Image:
+        """
+        Wraps an existing `uint8` array of shape `(HEIGHT, WIDTH)` (gray) or `(HEIGHT, WIDTH, 3)`
+        (colour) without copying; writes to either are visible through the other.
+
+        Throws a `ValueError` if the array can't be wrapped without a copy (i.e. it is not
+        `uint8`, not C-contiguous, or is read-only), or if the shape is not a valid image shape.
+        If :param:`resolution` is `None`, it is inferred from the shape of the array.
+        """
+        if array.dtype != np.uint8:
+            raise ValueError(f"expected a uint8 array but got dtype '{array.dtype}'")
+        if not array.flags.c_contiguous:
+            raise ValueError("array is not C-contiguous; use `np.ascontiguousarray` first")
+        if not array.flags.writeable:
+            raise ValueError("array is read-only")
+
+        if array.ndim == 2:
+            gray = True
+        elif array.ndim == 3 and array.shape[2] == 3:
+            gray = False
+        else:
+            raise ValueError(f"expected an array of shape (H, W) or (H, W, 3) but got {array.shape}")
+
+        height, width = array.shape[:2]
+        if resolution is None:
+            resolution = resolution_from_size(width, height)
+        elif (resolution.WIDTH, resolution.HEIGHT) != (width, height):
+            raise ValueError(f"array shape {array.shape} does not match resolution {resolution.WIDTH}x{resolution.HEIGHT}")
+
+        # `from_buffer` keeps a reference to the array, so it won't be freed while the image is alive
+        c_bytes = (ctypes.c_byte * array.size).from_buffer(array)
+        return Image(c_bytes, gray=gray, resolution=resolution)
     
     @overload
     @staticmethod
@@ -289,18 +795,37 @@ class Image(Sequence):
 
     @staticmethod
     def from_list(image: Sequence[tuple[int, int, int]] | Sequence[int], *, gray: bool = False, resolution: ImageResolution) -> Image:
-        flat_image: Sequence[int]
-        if not gray:
-            image = cast("Sequence[tuple[int, int, int]]", image)
-            flat_image = list(itertools.chain.from_iterable(image))
+        """
+        For large images, prefer :meth:`from_buffer` or :meth:`from_array`, which avoid converting every value.
+        """
+        flat_image: np.ndarray
+        if isinstance(image, np.ndarray):
+            if image.size > 0 and not np.issubdtype(image.dtype, np.integer):
+                raise TypeError(f"expected integer pixel values but got dtype '{image.dtype}'")
+            flat_image = image.reshape(-1)
+        elif gray:
+            flat_image = np.fromiter(cast("Sequence[int]", image), dtype=np.int64, count=len(image))
         else:
-            flat_image = cast("Sequence[int]", image)
-        c_bytes = (ctypes.c_byte * len(flat_image))(*flat_image)
-        return Image(c_bytes, gray=gray, resolution=resolution)
-    
+            # considerably faster than `np.asarray` for a list of tuples
+            values = itertools.chain.from_iterable(cast("Sequence[tuple[int, int, int]]", image))
+            flat_image = np.fromiter(values, dtype=np.int64, count=len(image) * 3)
+        return Image._from_flat(flat_image, gray=gray, resolution=resolution)
+
     @staticmethod
     def from_colour_list(colour_image: Sequence[int], *, resolution: ImageResolution) -> Image:
-        return Image.from_list(list(map(colour_to_rgb, colour_image)), gray=False, resolution=resolution)
+        """
+        Creates a colour image from a :class:`Colour` per pixel.
+        """
+        colours = np.asarray(colour_image, dtype=np.int64).reshape(-1, 1)
+        rgb = (colours >> np.array((16, 8, 0))) & 0xFF
+        return Image._from_flat(rgb.reshape(-1), gray=False, resolution=resolution)
+
+    @staticmethod
+    def _from_flat(flat_image: np.ndarray, *, gray: bool, resolution: ImageResolution) -> Image:
+        c_bytes = (ctypes.c_byte * flat_image.size)()
+        # values wrap to 8 bits, as when assigning to the `c_byte` array directly
+        np.frombuffer(c_bytes, dtype=np.uint8)[:] = flat_image.astype(np.uint8, copy=False)
+        return Image(c_bytes, gray=gray, resolution=resolution)
     
     @overload
     def __getitem__(self, __key: int) -> int: ...
@@ -312,6 +837,25 @@ class Image(Sequence):
     def __len__(self) -> int:
         return self._c_bytes.__len__()
     
+    @property
+    def shape(self) -> tuple[int, int] | tuple[int, int, int]:
+        """
+        The shape of :meth:`as_array`.
+        """
+        if self.is_gray:
+            return (self.resolution.HEIGHT, self.resolution.WIDTH)
+        return (self.resolution.HEIGHT, self.resolution.WIDTH, 3)
+
+    def as_array(self) -> np.ndarray:
+        """
+        Returns a zero-copy `uint8` view of the image, of shape `(HEIGHT, WIDTH)` for
+        gray images or `(HEIGHT, WIDTH, 3)` for colour images.
+        Writing to the array modifies the image.
+        """
+        shape = self.shape
+        count = shape[0] * shape[1] * (1 if self.is_gray else 3)
+        return np.frombuffer(self._c_bytes, dtype=np.uint8, count=count).reshape(shape)
+
     def get_gray(self, p: IntPointLike) -> int:
         p = IntPoint(*p)
         i = p.x + p.y * self.resolution.WIDTH
@@ -322,6 +866,123 @@ class Image(Sequence):
         i = (p.x + p.y * self.resolution.WIDTH) * 3
         return (self[i], self[i + 1], self[i + 2])
 
+    def _pixel_index(self, p: IntPointLike) -> int:
+        """
+        Throws a `ValueError` if :param:`p` is outside the image.
+        """
+        p = IntPoint(*p)
+        if not Image.point_in_image(self.resolution, p):
+            raise ValueError(f"point {tuple(p)} is outside the {self.resolution.WIDTH}x{self.resolution.HEIGHT} image")
+        return p.x + p.y * self.resolution.WIDTH
+
+    def set_gray(self, p: IntPointLike, value: int):
+        """
+        Sets the pixel at :param:`p` of a gray image to :param:`value` (0 to 255).
+        """
+        if not self.is_gray:
+            raise ValueError("image is not gray; use `set_colour`")
+        if value < 0 or value > 255:
+            raise ValueError(f"gray value out of bounds; expected a value from 0 to 255 but got: {value}")
+        self._c_bytes[self._pixel_index(p)] = value
+        self._version += 1
+
+    def set_colour(self, p: IntPointLike, colour: Colour | tuple[int, int, int]):
+        """
+        Sets the pixel at :param:`p` of a colour image to :param:`colour` (a :class:`Colour` or `(r, g, b)`).
+        """
+        if self.is_gray:
+            raise ValueError("image is gray; use `set_gray`")
+        r, g, b = self._rgb(colour)
+        i = self._pixel_index(p) * 3
+        self._c_bytes[i] = r
+        self._c_bytes[i + 1] = g
+        self._c_bytes[i + 2] = b
+        self._version += 1
+
+    def _rgb(self, colour: Colour | tuple[int, int, int]) -> tuple[int, int, int]:
+        rgb = colour_to_rgb(int(colour)) if isinstance(colour, (int, np.integer)) else tuple(colour)
+        if len(rgb) != 3 or any(v < 0 or v > 255 for v in rgb):
+            raise ValueError(f"expected a colour or (r, g, b) values from 0 to 255 but got: {colour}")
+        return cast("tuple[int, int, int]", rgb)
+
+    def _fill_value(self, value: int | Colour | tuple[int, int, int]) -> int | tuple[int, int, int]:
+        if not self.is_gray:
+            return self._rgb(value)
+        if not isinstance(value, (int, np.integer)) or value < 0 or value > 255:
+            raise ValueError(f"gray value out of bounds; expected a value from 0 to 255 but got: {value}")
+        return int(value)
+
+    def fill(self, value: int | Colour | tuple[int, int, int]):
+        """
+        Sets every pixel, in place, to :param:`value`: a gray value (0 to 255) for gray images,
+        or a :class:`Colour` or `(r, g, b)` for colour images.
+        """
+        self.as_array()[...] = self._fill_value(value)
+        self._version += 1
+
+    def fill_region(self, p1: IntPointLike, p2: IntPointLike, value: int | Colour | tuple[int, int, int]):
+        """
+        As :meth:`fill`, but only for the rectangle with corners :param:`p1` and :param:`p2` (inclusive,
+        in any order). The rectangle is clipped to the image.
+        """
+        fill_value = self._fill_value(value)
+        (x1, y1), (x2, y2) = IntPoint(*p1), IntPoint(*p2)
+        # clamp both ends, since negative slice ends would count from the other side
+        x1, x2 = max(min(x1, x2), 0), max(max(x1, x2) + 1, 0)
+        y1, y2 = max(min(y1, y2), 0), max(max(y1, y2) + 1, 0)
+        self.as_array()[y1:y2, x1:x2] = fill_value
+        self._version += 1
+
+    def mark_modified(self):
+        """
+        Invalidates cached data derived from the pixels (i.e. :meth:`pyramid` and :meth:`integral`).
+        Modifications through the methods of :class:`Image` and :class:`ImageView` are tracked
+        automatically, but writes through :meth:`as_array` (or to the wrapped buffer) are not.
+        """
+        self._version += 1
+
+    def view(self, p1: IntPointLike, p2: IntPointLike) -> ImageView:
+        """
+        Returns a view of the rectangle with corners :param:`p1` and :param:`p2` (inclusive, in any order),
+        sharing this image's pixels.
+
+        Throws a `ValueError` if the rectangle is not entirely inside the image.
+        """
+        return ImageView._from_corners(self, IntPoint(0, 0), self.resolution, p1, p2)
+
+    def pyramid(self, levels: int) -> list[Image]:
+        """
+        Returns this image followed by :param:`levels` successive downsamples, each half the width
+        and height of the previous (averaging each 2x2 block, and dropping any odd last row or column).
+        Stops early if an image would have no pixels.
+
+        The downsamples are cached until the image is modified (see :meth:`mark_modified`);
+        they should be treated as read-only.
+        """
+        if levels < 0:
+            raise ValueError(f"levels must not be negative but got {levels}")
+
+        if self._pyramid_version != self._version:
+            self._pyramid = [self]
+            self._pyramid_version = self._version
+
+        pyramid = self._pyramid
+        while len(pyramid) <= levels:
+            array = pyramid[-1].as_array()
+            height, width = array.shape[0] // 2, array.shape[1] // 2
+            if height == 0 or width == 0:
+                break
+            # sum the four strided corners of every 2x2 block in place (much faster than reshaping
+            # into blocks and reducing), then round to nearest
+            sums = array[0:height * 2:2, 0:width * 2:2].astype(np.uint16)
+            sums += array[1:height * 2:2, 0:width * 2:2]
+            sums += array[0:height * 2:2, 1:width * 2:2]
+            sums += array[1:height * 2:2, 1:width * 2:2]
+            sums += 2
+            sums >>= 2
+            pyramid.append(Image.from_array(sums.astype(np.uint8)))
+        return pyramid[:levels + 1]
+
     @staticmethod
     def point_from_index(resolution: ImageResolution, i: int) -> IntPoint:
         return IntPoint(i % resolution.WIDTH, i // resolution.WIDTH)
@@ -340,7 +1001,10 @@ class Image(Sequence):
     
     def apply_local_op(self, local_op: Callable[[IntPoint, Callable[[IntPointLike, float], float]], int]) -> Image:
         """
-        TODO: support for colour images
+        Calls :param:`local_op` for every pixel, so is very slow; only supports gray images.
+        See :meth:`filter`, :meth:`filter_separable`, :meth:`box_filter`, :meth:`gaussian_filter`
+        and :meth:`median_filter` for vectorised filters which also support colour images,
+        and :meth:`gradients`, :meth:`sobel` and :meth:`canny` for edges.
         """
         def get_or_default(p: IntPointLike, default: float) -> float:
             p = IntPoint(*p)
@@ -355,3 +1019,284 @@ class Image(Sequence):
             image_data.append(value)
         
         return Image.from_list(image_data, gray=True, resolution=self.resolution)
+
+    def _with_array(self, array: np.ndarray) -> Image:
+        """
+        Wraps the result of an array operation as a new image with the same resolution.
+        """
+        return Image.from_array(_to_uint8(array), resolution=self.resolution)
+
+    def filter(self, kernel: np.ndarray | Sequence[Sequence[float]], *, border: BorderMode = "replicate", border_value: int = 0) -> Image:
+        """
+        Returns a new image with :param:`kernel` applied centred on every pixel (and each channel
+        independently for colour images). The kernel is not flipped, and its dimensions must be odd.
+        Results are rounded and saturated to 0 to 255.
+
+        Separable (rank-1) kernels are detected and applied as two 1D passes.
+        """
+        return self._with_array(_correlate(self.as_array(), np.asarray(kernel), border=border, border_value=border_value))
+
+    def filter_separable(self, kernel_x: np.ndarray | Sequence[float], kernel_y: np.ndarray | Sequence[float], *, border: BorderMode = "replicate", border_value: int = 0) -> Image:
+        """
+        Equivalent to :meth:`filter` with the kernel `outer(kernel_y, kernel_x)`,
+        but applied as a horizontal pass followed by a vertical pass.
+        """
+        return self._with_array(_correlate_separable(self.as_array(), np.asarray(kernel_x), np.asarray(kernel_y), border=border, border_value=border_value))
+
+    def box_filter(self, size: int = 3, *, border: BorderMode = "replicate", border_value: int = 0) -> Image:
+        """
+        Mean of the :param:`size` x :param:`size` neighbourhood of every pixel.
+        """
+        kernel = np.full(size, 1 / size)
+        return self.filter_separable(kernel, kernel, border=border, border_value=border_value)
+
+    def gaussian_filter(self, sigma: float, *, size: int | None = None, border: BorderMode = "replicate", border_value: int = 0) -> Image:
+        """
+        If :param:`size` is `None`, the kernel covers +-3 :param:`sigma`.
+        """
+        kernel = _gaussian_kernel(sigma, size)
+        return self.filter_separable(kernel, kernel, border=border, border_value=border_value)
+
+    def median_filter(self, size: int = 3, *, border: BorderMode = "replicate", border_value: int = 0) -> Image:
+        """
+        Median of the :param:`size` x :param:`size` neighbourhood of every pixel.
+        """
+        return self._with_array(_median(self.as_array(), size, border=border, border_value=border_value))
+
+    def histogram(self) -> np.ndarray:
+        """
+        Returns the count of each value (0 to 255), as an `int64` array of shape `(256,)` for gray images,
+        or `(3, 256)` (r, g, b) for colour images.
+        """
+        return _histogram(self.as_array())
+
+    def integral(self) -> IntegralImage:
+        """
+        Returns the integral images, for constant time rectangle statistics.
+        Cached until the image is modified (see :meth:`mark_modified`).
+        """
+        if self._integral is None or self._integral_version != self._version:
+            self._integral = IntegralImage(self.as_array())
+            self._integral_version = self._version
+        return self._integral
+
+    def _check_gray(self, operation: str):
+        if not self.is_gray:
+            raise ValueError(f"{operation} is only supported for gray images")
+
+    def threshold(self, level: int, *, invert: bool = False) -> Image:
+        """
+        Returns a binary gray image for :func:`LCDImageBinary`: pixels above :param:`level` are 0 (white) and
+        the rest 1 (black), so dark regions stay dark. If :param:`invert` is `True`, the values are swapped.
+        Only supports gray images.
+        """
+        self._check_gray("thresholding")
+        dark = self.as_array() <= level
+        return Image.from_array((dark != invert).astype(np.uint8), resolution=self.resolution)
+
+    def otsu_level(self) -> int:
+        """
+        Returns the threshold level best separating the pixels into two classes (Otsu's method).
+        Only supports gray images.
+        """
+        self._check_gray("Otsu's method")
+        return _otsu_level(self.histogram())
+
+    def threshold_otsu(self, *, invert: bool = False) -> Image:
+        """
+        :meth:`threshold` at :meth:`otsu_level`.
+        """
+        return self.threshold(self.otsu_level(), invert=invert)
+
+    def threshold_adaptive(self, size: int = 15, *, offset: float = 5, invert: bool = False) -> Image:
+        """
+        As :meth:`threshold`, but comparing every pixel to the mean of its :param:`size` x :param:`size`
+        neighbourhood minus :param:`offset`, so uneven lighting is tolerated. The means are computed
+        from an integral image, so the cost doesn't depend on :param:`size` (which must be odd).
+        Only supports gray images.
+        """
+        self._check_gray("thresholding")
+        array = self.as_array()
+        dark = array <= _box_mean(array, size) - offset
+        return Image.from_array((dark != invert).astype(np.uint8), resolution=self.resolution)
+
+    def gradients(self, *, border: BorderMode = "replicate", border_value: int = 0) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the horizontal and vertical (towards +y, i.e. down) Sobel gradients, as `float32` arrays
+        of shape `(HEIGHT, WIDTH)`. Only supports gray images.
+        """
+        self._check_gray("gradients")
+        return _sobel(self.as_array(), border=border, border_value=border_value)
+
+    def sobel(self, *, border: BorderMode = "replicate", border_value: int = 0) -> Image:
+        """
+        Returns the magnitude of :meth:`gradients`, saturated to 0 to 255. Only supports gray images.
+        """
+        gx, gy = self.gradients(border=border, border_value=border_value)
+        return self._with_array(np.hypot(gx, gy))
+
+    def canny(self, low: float = 50, high: float = 100, *, sigma: float | None = 1.0) -> Image:
+        """
+        Returns a binary gray image of the edges (Canny's method) for :func:`LCDImageBinary`, with edge
+        pixels 1 (black) and the rest 0 (white). Edges are thinned to one pixel wide, and kept where
+        the gradient magnitude (see :meth:`sobel`) is above :param:`high`, along with any pixels connected
+        to them above :param:`low`. Only supports gray images.
+
+        :param:`sigma` of the Gaussian smoothing applied first, or `None` for none
+        """
+        self._check_gray("edge detection")
+        if low > high:
+            raise ValueError(f"low threshold ({low}) must not be above high threshold ({high})")
+        array = self.as_array()
+        if sigma is not None:
+            kernel = _gaussian_kernel(sigma)
+            array = _correlate_separable(array, kernel, kernel)
+        gx, gy = _sobel(array)
+        magnitude = np.hypot(gx, gy)
+        thin = _non_maximum_suppression(magnitude, gx, gy)
+        edges = _hysteresis(thin & (magnitude > low), thin & (magnitude > high))
+        return Image.from_array(edges.astype(np.uint8), resolution=self.resolution)
+
+class ImageView:
+    """
+    A rectangular region of an :class:`Image`, sharing its pixels: :meth:`as_array` is a strided
+    view of the parent's array, so creating a view doesn't copy anything.
+
+    Can be passed to :func:`LCDImage` and :func:`LCDImageGray`, which draw a copy made by :meth:`materialise`.
+    """
+    parent: Final[Image]
+
+    start: Final[IntPoint]
+    """the top left pixel of the view, in the parent"""
+
+    resolution: Final[ImageResolution]
+    """the size of the view"""
+
+    def __init__(self, parent: Image, start: IntPoint, resolution: ImageResolution):
+        self.parent = parent
+        self.start = start
+        self.resolution = resolution
+
+    @staticmethod
+    def _from_corners(parent: Image, offset: IntPoint, bounds: ImageResolution, p1: IntPointLike, p2: IntPointLike) -> ImageView:
+        """
+        :param:`offset`, :param:`bounds` the region (of the parent) the corners are relative to
+        """
+        (x1, y1), (x2, y2) = IntPoint(*p1), IntPoint(*p2)
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        if not Image.point_in_image(bounds, (x1, y1)) or not Image.point_in_image(bounds, (x2, y2)):
+            raise ValueError(f"region ({x1}, {y1}) to ({x2}, {y2}) is not inside the {bounds.WIDTH}x{bounds.HEIGHT} image")
+        start = IntPoint(offset.x + x1, offset.y + y1)
+        return ImageView(parent, start, resolution_from_size(x2 - x1 + 1, y2 - y1 + 1))
+
+    @property
+    def is_gray(self) -> bool:
+        return self.parent.is_gray
+
+    @property
+    def shape(self) -> tuple[int, int] | tuple[int, int, int]:
+        """
+        The shape of :meth:`as_array`.
+        """
+        if self.is_gray:
+            return (self.resolution.HEIGHT, self.resolution.WIDTH)
+        return (self.resolution.HEIGHT, self.resolution.WIDTH, 3)
+
+    def as_array(self) -> np.ndarray:
+        """
+        Returns a zero-copy (non-contiguous) `uint8` view of the region, as :meth:`Image.as_array`.
+        Writing to the array modifies the parent image.
+        """
+        x, y = self.start
+        return self.parent.as_array()[y:y + self.resolution.HEIGHT, x:x + self.resolution.WIDTH]
+
+    def view(self, p1: IntPointLike, p2: IntPointLike) -> ImageView:
+        """
+        As :meth:`Image.view`, with the corners relative to this view.
+        """
+        return ImageView._from_corners(self.parent, self.start, self.resolution, p1, p2)
+
+    def materialise(self) -> Image:
+        """
+        Returns a new image with a copy of the region's pixels.
+        """
+        return Image.from_array(np.ascontiguousarray(self.as_array()), resolution=self.resolution)
+
+    def fill(self, value: int | Colour | tuple[int, int, int]):
+        """
+        As :meth:`Image.fill`, modifying the parent image.
+        """
+        self.as_array()[...] = self.parent._fill_value(value)
+        self.parent.mark_modified()
+
+class IntegralImage:
+    """
+    The summed-area tables of an image's pixels and of their squares, giving the sum, mean, or variance
+    of any rectangle with four lookups. Queries take the rectangle's corners (inclusive, in any order),
+    either as two points, or as two `(N, 2)` arrays of points for `N` rectangles at once.
+    For colour images, each statistic is per channel, in a trailing axis of size 3.
+
+    Usually obtained from :meth:`Image.integral`.
+    """
+    sums: np.ndarray
+    """`int64`, shape `(HEIGHT + 1, WIDTH + 1[, 3])`; `sums[y, x]` is the sum of the pixels above and left of `(x, y)`"""
+
+    _array: np.ndarray
+    """a copy of the image's pixels, for :attr:`squared_sums`"""
+
+    _squared_sums: Optional[np.ndarray]
+
+    def __init__(self, array: np.ndarray):
+        """
+        :param:`array` a `uint8` array, as from :meth:`Image.as_array`; the tables describe it as it is now,
+        even if it is modified later
+        """
+        # copied (which is much cheaper than computing the squared sums up front), so the lazily computed
+        # squared sums can't describe a different image to the sums
+        self._array = array.copy()
+        self.sums = _integral(self._array)
+        self._squared_sums = None
+
+    @property
+    def squared_sums(self) -> np.ndarray:
+        """as :attr:`sums`, for the squares of the pixels; computed on first use"""
+        if self._squared_sums is None:
+            self._squared_sums = _integral(self._array, squared=True)
+        return self._squared_sums
+
+    def _bounds(self, p1: IntPointLike | np.ndarray, p2: IntPointLike | np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns `x1, y1, x2, y2` with exclusive ends.
+        Throws a `ValueError` if any rectangle is not entirely inside the image.
+        """
+        a = np.asarray(p1, dtype=np.intp)
+        b = np.asarray(p2, dtype=np.intp)
+        x1, x2 = np.minimum(a[..., 0], b[..., 0]), np.maximum(a[..., 0], b[..., 0]) + 1
+        y1, y2 = np.minimum(a[..., 1], b[..., 1]), np.maximum(a[..., 1], b[..., 1]) + 1
+        height, width = self.sums.shape[0] - 1, self.sums.shape[1] - 1
+        if np.any(x1 < 0) or np.any(y1 < 0) or np.any(x2 > width) or np.any(y2 > height):
+            raise ValueError(f"rectangle is not inside the {width}x{height} image")
+        return x1, y1, x2, y2
+
+    def sum(self, p1: IntPointLike | np.ndarray, p2: IntPointLike | np.ndarray) -> np.ndarray:
+        return _rect_sums(self.sums, *self._bounds(p1, p2))
+
+    def _counts(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray) -> np.ndarray:
+        counts = (x2 - x1) * (y2 - y1)
+        return counts[..., np.newaxis] if self.sums.ndim == 3 else counts
+
+    def mean(self, p1: IntPointLike | np.ndarray, p2: IntPointLike | np.ndarray) -> np.ndarray:
+        bounds = self._bounds(p1, p2)
+        return _rect_sums(self.sums, *bounds) / self._counts(*bounds)
+
+    def variance(self, p1: IntPointLike | np.ndarray, p2: IntPointLike | np.ndarray) -> np.ndarray:
+        """
+        Population variance.
+        """
+        bounds = self._bounds(p1, p2)
+        counts = self._counts(*bounds)
+        mean = _rect_sums(self.sums, *bounds) / counts
+        variance = _rect_sums(self.squared_sums, *bounds) / counts - mean * mean
+        # rounding can make it very slightly negative
+        return np.maximum(variance, 0)
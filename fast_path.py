@@ -0,0 +1,90 @@
+"""
+Unchecked fast-path bindings, for tight control loops.
+
+Each `bind_*` function validates its port once, and returns a ctypes foreign function with fixed
+`argtypes` and `restype`, and its port bound with `functools.partial`. Values are not validated or clamped,
+and the raw return code is returned rather than a `bool`. Bindings are separate from the functions `eye`
+uses, so are not affected by (or visible to) :func:`enable_instrumentation`.
+
+Bindings which drive motors or set servos (:func:`bind_motor_drive`, :func:`bind_servo_set` and
+:func:`bind_vw_set_speed`) are instead Python closures around the foreign function, which make the last-value
+cache used by :func:`MOTORDriveMany` and :func:`SERVOSetMany` forget their ports on every call, so the next
+`...Many` call rewrites them. This costs an extra Python call (see the `motors.bind_motor_drive` and
+`vw.bind_vw_set_speed` benchmarks), but still skips all of the checked functions' validation and `repeat_func`.
+"""
+
+from __future__ import annotations
+import ctypes
+import functools
+from typing import Callable, get_args
+
+from eye import lib
+
+from eyepy.internal_utils import validate_ports
+from eyepy.motors import EncoderPort, MotorPort, ServoPort, forget_motor_speeds, forget_servo_angles
+from eyepy.psd import PSDPort
+
+
+def _bind(name: str, argtypes: list[type], *bound_args: int) -> Callable[..., int]:
+    # indexing (rather than attribute access) creates a new foreign function object,
+    # so the `argtypes` set here don't affect the one shared with `eye`
+    func = lib[name]
+    func.argtypes = argtypes
+    func.restype = ctypes.c_int
+    if not bound_args:
+        return func
+    return functools.partial(func, *bound_args)
+
+def _forgetting(func: Callable[..., int], forget: Callable[[list[int]], None], ports: list[int]) -> Callable[..., int]:
+    """
+    Wraps the binding :param:`func` to :param:`forget` the cached values of :param:`ports` before every call.
+    """
+    def call(*args: int) -> int:
+        forget(ports)
+        return func(*args)
+    return call
+
+def bind_motor_drive(motor: MotorPort, *, raw: bool = False) -> Callable[[int], int]:
+    """
+    Returns `drive(speed) -> return_code`, equivalent to `MOTORDrive(motor, speed, clamp_speed=False)`
+    (or :func:`MOTORDriveRaw` if :param:`raw` is `True`), but with no validation of the speed.
+
+    Throws a `ValueError` if :param:`motor` is not a valid port.
+    """
+    validate_ports("motor", (motor,), get_args(MotorPort))
+    return _forgetting(_bind("MOTORDriveRaw" if raw else "MOTORDrive", [ctypes.c_int, ctypes.c_int], motor), forget_motor_speeds, [motor])
+
+def bind_servo_set(servo: ServoPort, *, raw: bool = False) -> Callable[[int], int]:
+    """
+    Returns `set(angle) -> return_code`, equivalent to `SERVOSet(servo, angle)`
+    (or :func:`SERVOSetRaw` if :param:`raw` is `True`), but with no validation of the angle.
+
+    Throws a `ValueError` if :param:`servo` is not a valid port.
+    """
+    validate_ports("servo", (servo,), get_args(ServoPort))
+    return _forgetting(_bind("SERVOSetRaw" if raw else "SERVOSet", [ctypes.c_int, ctypes.c_int], servo), forget_servo_angles, [servo])
+
+def bind_psd_get(psd: PSDPort, *, raw: bool = False) -> Callable[[], int]:
+    """
+    Returns `get() -> distance`, equivalent to `PSDGet(psd)` (or :func:`PSDGetRaw` if :param:`raw` is `True`).
+
+    Throws a `ValueError` if :param:`psd` is not a valid port.
+    """
+    validate_ports("PSD", (psd,), get_args(PSDPort))
+    return _bind("PSDGetRaw" if raw else "PSDGet", [ctypes.c_int], psd)
+
+def bind_encoder_read(encoder: EncoderPort) -> Callable[[], int]:
+    """
+    Returns `read() -> ticks`, equivalent to `ENCODERRead(encoder)`.
+
+    Throws a `ValueError` if :param:`encoder` is not a valid port.
+    """
+    validate_ports("encoder", (encoder,), get_args(EncoderPort))
+    return _bind("ENCODERRead", [ctypes.c_int], encoder)
+
+def bind_vw_set_speed() -> Callable[[int, int], int]:
+    """
+    Returns `set_speed(lin_speed, ang_speed) -> return_code`, equivalent to :func:`VWSetSpeed`.
+    """
+    # drives the wheels, as :func:`VWSetSpeed`
+    return _forgetting(_bind("VWSetSpeed", [ctypes.c_int, ctypes.c_int]), forget_motor_speeds, [1, 2])
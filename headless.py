@@ -0,0 +1,1004 @@
+"""
+A headless stand-in for EyeSim: a pure Python/NumPy implementation of the `eye` functions eyepy uses,
+so eyepy code can run (e.g. in CI or load tests) without the simulator.
+
+The robot is a differential drive in a world of polygons (:class:`World`), with ray-cast PSD and
+LIDAR sensors, a synthetic camera rendering the walls, and an in-memory LCD. Time is simulated:
+by default it only moves forwards when :meth:`HeadlessEye.advance` is called (or by blocking calls
+such as `VWWait`), so runs are as fast as the code under test allows.
+
+Must be installed before any other eyepy submodule is imported::
+
+    from eyepy import headless
+    sim = headless.install(headless.World.box(2000, 2000))
+
+    import eyepy
+    eyepy.VWSetPosition((1000, 1000), 0)
+    eyepy.VWStraight(500, lin_speed=250)
+    eyepy.VWWait()  # advances the simulated clock by 2s
+"""
+
+from __future__ import annotations
+import ctypes
+import math
+import sys
+import time
+from collections import deque
+from types import ModuleType
+from typing import Any, Callable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from eyepy.image_ops import draw_circle, draw_image, draw_line, draw_rect
+
+
+# constants, as defined by `eye`
+
+QQVGA, QVGA, VGA, CAM1MP, CAMHD, CAM5MP, CUSTOM = 0, 1, 2, 3, 4, 5, 6
+QQVGA_X, QQVGA_Y = 160, 120
+QVGA_X, QVGA_Y = 320, 240
+VGA_X, VGA_Y = 640, 480
+CAM1MP_X, CAM1MP_Y = 1296, 730
+CAMHD_X, CAMHD_Y = 1920, 1080
+CAM5MP_X, CAM5MP_Y = 2592, 1944
+
+RED, GREEN, BLUE = 0xFF0000, 0x00FF00, 0x0000FF
+WHITE, GRAY, BLACK = 0xFFFFFF, 0x808080, 0x000000
+ORANGE, SILVER, LIGHTGRAY, DARKGRAY = 0xFFA500, 0xC0C0C0, 0xD3D3D3, 0xA9A9A9
+NAVY, CYAN, TEAL, MAGENTA = 0x000080, 0x00FFFF, 0x008080, 0xFF00FF
+PURPLE, MAROON, YELLOW, OLIVE = 0x800080, 0x800000, 0xFFFF00, 0x808000
+
+HELVETICA, TIMES, COURIER = 0, 1, 2
+NORMAL, BOLD, ITALICS = 0, 1, 2
+
+NOKEY, KEY1, KEY2, KEY3, KEY4, ANYKEY = 0, 1, 2, 4, 8, 15
+
+PSD_FRONT, PSD_LEFT, PSD_RIGHT, PSD_BACK = 1, 2, 3, 4
+
+LCD_WIDTH, LCD_HEIGHT = 480, 320
+
+_CONSTANT_NAMES: tuple[str, ...] = (
+    "QQVGA", "QVGA", "VGA", "CAM1MP", "CAMHD", "CAM5MP", "CUSTOM",
+    "QQVGA_X", "QQVGA_Y", "QVGA_X", "QVGA_Y", "VGA_X", "VGA_Y", "CAM1MP_X", "CAM1MP_Y", "CAMHD_X", "CAMHD_Y", "CAM5MP_X", "CAM5MP_Y",
+    "RED", "GREEN", "BLUE", "WHITE", "GRAY", "BLACK", "ORANGE", "SILVER", "LIGHTGRAY", "DARKGRAY",
+    "NAVY", "CYAN", "TEAL", "MAGENTA", "PURPLE", "MAROON", "YELLOW", "OLIVE",
+    "HELVETICA", "TIMES", "COURIER", "NORMAL", "BOLD", "ITALICS",
+    "NOKEY", "KEY1", "KEY2", "KEY3", "KEY4", "ANYKEY",
+    "PSD_FRONT", "PSD_LEFT", "PSD_RIGHT", "PSD_BACK",
+)
+
+_RESOLUTIONS: dict[int, tuple[int, int]] = {
+    QQVGA: (QQVGA_X, QQVGA_Y),
+    QVGA: (QVGA_X, QVGA_Y),
+    VGA: (VGA_X, VGA_Y),
+    CAM1MP: (CAM1MP_X, CAM1MP_Y),
+    CAMHD: (CAMHD_X, CAMHD_Y),
+    CAM5MP: (CAM5MP_X, CAM5MP_Y),
+}
+
+def _rgb(colour: int) -> tuple[int, int, int]:
+    return (colour >> 16) & 0xFF, (colour >> 8) & 0xFF, colour & 0xFF
+
+
+# world
+
+class World:
+    """
+    Walls and obstacles, as the edges of polygons (mm, with y up, as `VWGetPosition`), each with a colour
+    for the camera. Sensors and the robot collide with the edges, so open polylines can also be used.
+    """
+    _segments: np.ndarray
+    """`float64`, shape `(S, 4)`: `x1, y1, x2, y2`"""
+
+    _colours: np.ndarray
+    """`uint8`, shape `(S, 3)`"""
+
+    def __init__(self):
+        self._segments = np.zeros((0, 4))
+        self._colours = np.zeros((0, 3), dtype=np.uint8)
+
+    @staticmethod
+    def box(width: float, height: float, colour: int = GRAY) -> World:
+        """
+        Returns a world enclosed by walls from `(0, 0)` to `(width, height)`.
+        """
+        world = World()
+        world.add_box((0, 0), (width, height), colour)
+        return world
+
+    @property
+    def segments(self) -> np.ndarray:
+        """`(S, 4)` array of every edge, `x1, y1, x2, y2`; read-only"""
+        segments = self._segments.view()
+        segments.flags.writeable = False
+        return segments
+
+    def add_polygon(self, points: Sequence[tuple[float, float]] | np.ndarray, colour: int = GRAY, *, closed: bool = True):
+        """
+        :param:`closed` if `False`, the last point isn't joined to the first
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(points) < 2:
+            raise ValueError(f"expected at least 2 points but got {len(points)}")
+        ends = np.roll(points, -1, axis=0) if closed else points[1:]
+        segments = np.hstack((points[:len(ends)], ends))
+        self._segments = np.vstack((self._segments, segments))
+        self._colours = np.vstack((self._colours, np.tile(np.array(_rgb(colour), dtype=np.uint8), (len(segments), 1))))
+
+    def add_box(self, p1: tuple[float, float], p2: tuple[float, float], colour: int = GRAY):
+        (x1, y1), (x2, y2) = p1, p2
+        self.add_polygon(((x1, y1), (x2, y1), (x2, y2), (x1, y2)), colour)
+
+    def cast(self, x: float, y: float, angles: np.ndarray, max_range: float = math.inf) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Casts a ray from `(x, y)` at each of :param:`angles` (rads, anticlockwise from the x axis).
+        Returns the distance to the nearest edge hit by each ray (:param:`max_range` if none is hit
+        within it), and the index of the edge hit (`-1` if none).
+        """
+        angles = np.asarray(angles, dtype=np.float64)
+        if len(self._segments) == 0:
+            return np.full(angles.shape, max_range, dtype=np.float64), np.full(angles.shape, -1)
+
+        dx = np.cos(angles)[:, np.newaxis]
+        dy = np.sin(angles)[:, np.newaxis]
+        ax = self._segments[:, 0] - x
+        ay = self._segments[:, 1] - y
+        ex = self._segments[:, 2] - self._segments[:, 0]
+        ey = self._segments[:, 3] - self._segments[:, 1]
+
+        # solving `origin + t * d == a + u * e` with cross products
+        denominator = dx * ey - dy * ex
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (ax * ey - ay * ex) / denominator
+            u = (ax * dy - ay * dx) / denominator
+        hits = (t >= 0) & (u >= 0) & (u <= 1)
+        t = np.where(hits, t, np.inf)
+
+        nearest = np.argmin(t, axis=1)
+        distances = t[np.arange(len(angles)), nearest]
+        missed = distances > max_range
+        distances[missed] = max_range
+        nearest[missed] = -1
+        return distances, nearest
+
+    def clearance(self, x: float, y: float) -> float:
+        """
+        Returns the distance from `(x, y)` to the nearest edge.
+        """
+        if len(self._segments) == 0:
+            return math.inf
+        a = self._segments[:, :2]
+        e = self._segments[:, 2:] - a
+        p = np.array((x, y)) - a
+        lengths = np.maximum(np.einsum("ij,ij->i", e, e), 1e-12)
+        t = np.clip(np.einsum("ij,ij->i", p, e) / lengths, 0, 1)
+        nearest = a + e * t[:, np.newaxis]
+        return float(np.min(np.hypot(nearest[:, 0] - x, nearest[:, 1] - y)))
+
+
+# simulator
+
+class PSDMount(NamedTuple):
+    x: float
+    y: float
+    """mm, relative to the robot's centre (x forwards, y left)"""
+
+    angle: float
+    """degrees, anticlockwise from forwards"""
+
+class _Motion(NamedTuple):
+    """
+    A `VW` drive command: constant speeds for a duration.
+    """
+    lin_speed: float
+    """mm/s"""
+
+    ang_speed: float
+    """rads/s"""
+
+    distance: float
+    """mm, or degrees for turns; the total to travel, for `VWRemain`"""
+
+    start: float
+    end: float
+    """ms, on the simulated clock"""
+
+class _Timer:
+    def __init__(self, period_ms: int, func: Callable[[], None], due: float):
+        self.period_ms = period_ms
+        self.func = func
+        self.due = due
+
+class HeadlessEye:
+    """
+    The simulated robot, world, and devices; the `eye` functions are its methods of the same name
+    (e.g. :meth:`VWSetSpeed`), and the rest control the simulation.
+
+    Motors 1 and 2 (and encoders 1 and 2) are the left and right wheels. Positions are mm (y up) and degrees,
+    as `VWGetPosition`. Key presses and touches must be queued with :meth:`press_key` and :meth:`touch`;
+    blocking reads with none queued throw a `RuntimeError` rather than block forever.
+
+    The LCD is a framebuffer (:attr:`lcd`) which drawing and images update; printed text is kept as text
+    (:attr:`lcd_text`) rather than drawn.
+    """
+    world: World
+
+    time_scale: Optional[float]
+    """
+    if `None`, the simulated clock only advances with :meth:`advance` and blocking calls; otherwise
+    it follows the real clock, sped up by this factor
+    """
+
+    wheel_distance: float
+    wheel_diameter: float
+    """mm"""
+    ticks_per_rev: int
+    max_wheel_speed: float
+    """mm/s, at motor speed 100"""
+    robot_radius: float
+    """mm; the robot stalls rather than moving closer than this to an edge"""
+
+    psd_mounts: dict[int, PSDMount]
+    sensor_range: float
+    """mm; the maximum PSD and LIDAR distance"""
+    sensor_noise: float
+    """the standard deviation (mm) of the noise added to PSD and LIDAR distances"""
+
+    camera_fov: float
+    """degrees, horizontal"""
+    camera_height: float
+    wall_height: float
+    """mm"""
+    sky_colour: int
+    floor_colour: int
+
+    lcd: np.ndarray
+    """`uint8`, shape `(LCD_HEIGHT, LCD_WIDTH, 3)`"""
+    lcd_text: list[list[str]]
+    """printed characters, by row and column"""
+    lcd_refreshes: int
+    lcd_menu: list[str]
+
+    servos: dict[int, int]
+    """the last angle set for each servo"""
+
+    max_step_ms: float
+    """the longest step the robot is moved by at once when checking for collisions"""
+
+    def __init__(
+        self, world: Optional[World] = None, *, time_scale: Optional[float] = None,
+        wheel_distance: float = 90, wheel_diameter: float = 54, ticks_per_rev: int = 1100, max_wheel_speed: float = 600,
+        robot_radius: float = 80, psd_mounts: Optional[dict[int, PSDMount]] = None,
+        sensor_range: float = 9999, sensor_noise: float = 0, seed: Optional[int] = None,
+        camera_fov: float = 60, camera_height: float = 100, wall_height: float = 300,
+        sky_colour: int = LIGHTGRAY, floor_colour: int = DARKGRAY, max_step_ms: float = 10,
+    ):
+        self.world = world if world is not None else World()
+        self.time_scale = time_scale
+        self.wheel_distance = wheel_distance
+        self.wheel_diameter = wheel_diameter
+        self.ticks_per_rev = ticks_per_rev
+        self.max_wheel_speed = max_wheel_speed
+        self.robot_radius = robot_radius
+        self.psd_mounts = psd_mounts if psd_mounts is not None else {
+            PSD_FRONT: PSDMount(robot_radius, 0, 0),
+            PSD_LEFT: PSDMount(0, robot_radius, 90),
+            PSD_RIGHT: PSDMount(0, -robot_radius, -90),
+            PSD_BACK: PSDMount(-robot_radius, 0, 180),
+        }
+        self.sensor_range = sensor_range
+        self.sensor_noise = sensor_noise
+        self._rng = np.random.default_rng(seed)
+        self.camera_fov = camera_fov
+        self.camera_height = camera_height
+        self.wall_height = wall_height
+        self.sky_colour = sky_colour
+        self.floor_colour = floor_colour
+        self.max_step_ms = max_step_ms
+
+        self._time = 0.0
+        self._real_start = time.perf_counter()
+
+        self._x = 0.0
+        self._y = 0.0
+        self._phi = 0.0
+        self._wheel_speeds = (0.0, 0.0)
+        self._motion: Optional[_Motion] = None
+        self._stalled = False
+        self._wheel_travel = [0.0, 0.0]
+        self.servos = {}
+        self._timers: dict[int, _Timer] = {}
+
+        self._camera_size = (0, 0)
+        self._lidar_config = (360, 0, 360)
+
+        self.lcd = np.zeros((LCD_HEIGHT, LCD_WIDTH, 3), dtype=np.uint8)
+        self._text_size = (LCD_HEIGHT // 16, LCD_WIDTH // 8)
+        self.lcd_text = [[" "] * self._text_size[1] for _ in range(self._text_size[0])]
+        self._cursor = (0, 0)
+        self._colours = (WHITE, BLACK)
+        self._image_area = (0, 0, 0, 0)
+        self.lcd_refreshes = 0
+        self.lcd_menu = ["", "", "", ""]
+
+        self._keys: deque[int] = deque()
+        self._touches: deque[tuple[int, int]] = deque()
+
+        self._lib_overrides = self._lib_functions()
+
+    # simulation control
+
+    @property
+    def time_ms(self) -> float:
+        """the simulated time since the start"""
+        self._sync()
+        return self._time
+
+    def advance(self, ms: float):
+        """
+        Runs the simulation forwards by :param:`ms`.
+        """
+        self._advance_to(self._time + ms)
+
+    def _sync(self):
+        if self.time_scale is not None:
+            self._advance_to((time.perf_counter() - self._real_start) * 1000 * self.time_scale)
+
+    def _advance_to(self, end: float):
+        while self._time < end:
+            # stop at the end of a motion, and at timers, so they take effect exactly
+            step_end = end
+            if self._motion is not None:
+                step_end = min(step_end, self._motion.end)
+            if self._timers:
+                step_end = min(step_end, min(timer.due for timer in self._timers.values()))
+            step_end = max(step_end, self._time)
+
+            self._drive(step_end - self._time)
+            self._time = step_end
+
+            if self._motion is not None and self._time >= self._motion.end:
+                self._motion = None
+                self._wheel_speeds = (0.0, 0.0)
+            for timer in list(self._timers.values()):
+                if self._time >= timer.due:
+                    timer.due += timer.period_ms
+                    timer.func()
+            if step_end == end:
+                return
+
+    def _drive(self, ms: float):
+        """
+        Moves the robot at the current wheel speeds, in steps of at most :attr:`max_step_ms`
+        (when there are edges to collide with). The robot stalls instead of moving too close to an edge.
+        """
+        left, right = self._wheel_speeds
+        if left == 0 and right == 0:
+            return
+        lin_speed = (left + right) / 2
+        ang_speed = (right - left) / self.wheel_distance
+        n_steps = max(1, math.ceil(ms / self.max_step_ms)) if len(self.world._segments) else 1
+        dt = ms / 1000 / n_steps
+
+        for _ in range(n_steps):
+            x, y, phi = self._x, self._y, self._phi
+            if abs(ang_speed) < 1e-9:
+                x += lin_speed * dt * math.cos(phi)
+                y += lin_speed * dt * math.sin(phi)
+            else:
+                # exact arc for constant speeds
+                radius = lin_speed / ang_speed
+                x += radius * (math.sin(phi + ang_speed * dt) - math.sin(phi))
+                y -= radius * (math.cos(phi + ang_speed * dt) - math.cos(phi))
+            phi += ang_speed * dt
+
+            # moving away from an edge is allowed, to drive out of a stall
+            clearance = self.world.clearance(x, y)
+            if clearance < self.robot_radius and clearance < self.world.clearance(self._x, self._y):
+                self._stalled = True
+                return
+            self._stalled = False
+            self._x, self._y, self._phi = x, y, phi
+            self._wheel_travel[0] += left * dt
+            self._wheel_travel[1] += right * dt
+
+    def set_pose(self, x: float, y: float, phi: float):
+        """
+        :param:`x`, :param:`y` mm; :param:`phi` degrees
+        """
+        self._sync()
+        self._x, self._y, self._phi = float(x), float(y), math.radians(phi)
+
+    def press_key(self, key: int):
+        """
+        Queues a key press (`KEY1` to `KEY4`), for `KEYGet`, `KEYRead` or `KEYWait`.
+        """
+        self._keys.append(key)
+
+    def touch(self, x: int, y: int):
+        """
+        Queues a touch of the LCD, for `KEYGetXY` or `KEYReadXY`.
+        """
+        self._touches.append((x, y))
+
+    # camera
+
+    def CAMInit(self, resolution: int) -> int:
+        if resolution not in _RESOLUTIONS:
+            return 1
+        self._camera_size = _RESOLUTIONS[resolution]
+        return 0
+
+    def CAMRelease(self) -> int:
+        self._camera_size = (0, 0)
+        return 0
+
+    def render(self) -> np.ndarray:
+        """
+        Returns the camera's view of the world as an `(HEIGHT, WIDTH, 3)` array: each column shows the nearest
+        edge in its direction as a wall of :attr:`wall_height`, shaded by distance, between the sky and floor.
+        """
+        self._sync()
+        width, height = self._camera_size
+        focal_length = width / 2 / math.tan(math.radians(self.camera_fov) / 2)
+        # columns from left to right, i.e. decreasing angle
+        offsets = np.arctan((width / 2 - 0.5 - np.arange(width)) / focal_length)
+        distances, edges = self.world.cast(self._x, self._y, self._phi + offsets)
+        # perpendicular distances, so walls aren't curved
+        depth = np.maximum(distances * np.cos(offsets), 1)
+
+        horizon = height / 2
+        top = horizon - focal_length * (self.wall_height - self.camera_height) / depth
+        bottom = horizon + focal_length * self.camera_height / depth
+        rows = np.arange(height)[:, np.newaxis] + 0.5
+        hit = edges >= 0
+        wall = (rows >= top) & (rows < bottom) & hit
+
+        shade = np.clip(1 - depth / 8000, 0.25, 1)[:, np.newaxis]
+        # columns which hit nothing are masked out by `wall`; the world may have no edges at all
+        wall_colours = np.zeros((width, 3), dtype=np.uint8)
+        wall_colours[hit] = (self.world._colours[edges[hit]] * shade[hit]).astype(np.uint8)
+        image = np.where(rows < horizon, np.array(_rgb(self.sky_colour), dtype=np.uint8), np.array(_rgb(self.floor_colour), dtype=np.uint8))[:, np.newaxis, :]
+        return np.where(wall[..., np.newaxis], wall_colours[np.newaxis], image)
+
+    def _camera_buffer(self, gray: bool) -> ctypes.Array[ctypes.c_byte]:
+        width, height = self._camera_size
+        buffer = (ctypes.c_byte * (width * height * (1 if gray else 3)))()
+        self._capture_into(buffer, gray)
+        return buffer
+
+    def _capture_into(self, buffer: Any, gray: bool) -> int:
+        rgb = self.render()
+        target = np.frombuffer(buffer, dtype=np.uint8)
+        if gray:
+            target[:] = (rgb.astype(np.uint16).sum(axis=2) // 3).reshape(-1)
+        else:
+            target[:] = rgb.reshape(-1)
+        return 0
+
+    def CAMGet(self) -> ctypes.Array[ctypes.c_byte]:
+        return self._camera_buffer(False)
+
+    def CAMGetGray(self) -> ctypes.Array[ctypes.c_byte]:
+        return self._camera_buffer(True)
+
+    # image processing, with RoBIOS's integer arithmetic
+
+    def IPPRGB2Col(self, r: int, g: int, b: int) -> int:
+        return (r << 16) | (g << 8) | b
+
+    def IPPRGB2Hue(self, r: int, g: int, b: int) -> int:
+        max_rgb, min_rgb = max(r, g, b), min(r, g, b)
+        delta = max_rgb - min_rgb
+        if 2 * delta <= max_rgb:
+            return 255
+        def c_div(a: int, b: int) -> int:
+            return int(a / b)
+        if r == max_rgb:
+            return 42 + c_div(42 * (g - b), delta)
+        if g == max_rgb:
+            return 126 + c_div(42 * (b - r), delta)
+        return 210 + c_div(42 * (r - g), delta)
+
+    def IPPRGB2HSI(self, r: int, g: int, b: int) -> tuple[int, int, int]:
+        intensity = (r + g + b) // 3
+        saturation = 255 - (255 * min(r, g, b)) // intensity if intensity > 0 else 0
+        return self.IPPRGB2Hue(r, g, b), saturation, intensity
+
+    def IPPCol2HSI(self, col: int, h: Any, s: Any, i: Any) -> int:
+        for pointer, value in zip((h, s, i), self.IPPRGB2HSI(*_rgb(col))):
+            pointer.contents.value = value
+        return 0
+
+    # keys
+
+    def KEYGet(self) -> int:
+        if not self._keys:
+            raise RuntimeError("KEYGet would block forever; queue key presses with `press_key`")
+        return self._keys.popleft()
+
+    def KEYRead(self) -> int:
+        return self._keys.popleft() if self._keys else NOKEY
+
+    def KEYWait(self, key: int) -> int:
+        while self._keys:
+            pressed = self._keys.popleft()
+            if pressed & key:
+                return pressed
+        raise RuntimeError("KEYWait would block forever; queue key presses with `press_key`")
+
+    def _key_get_xy(self, x: Any, y: Any) -> int:
+        if not self._touches:
+            raise RuntimeError("KEYGetXY would block forever; queue touches with `touch`")
+        x.contents.value, y.contents.value = self._touches.popleft()
+        return 0
+
+    def _key_read_xy(self, x: Any, y: Any) -> int:
+        if not self._touches:
+            return 1
+        x.contents.value, y.contents.value = self._touches.popleft()
+        return 0
+
+    # LCD
+
+    def _newline(self):
+        row, _ = self._cursor
+        self._cursor = ((row + 1) % self._text_size[0], 0)
+
+    def LCDPrintf(self, format: str, *data: Any) -> int:
+        text = format % data if data else format
+        for char in text:
+            if char == "\n":
+                self._newline()
+                continue
+            row, col = self._cursor
+            self.lcd_text[row][col] = char
+            self._cursor = (row, col + 1)
+            if col + 1 >= self._text_size[1]:
+                self._newline()
+        return 0
+
+    def LCDSetPrintf(self, row: int, col: int, format: str, *data: Any) -> int:
+        self.LCDSetPos(row, col)
+        return self.LCDPrintf(format, *data)
+
+    def LCDSetPos(self, row: int, col: int) -> int:
+        rows, cols = self._text_size
+        if not (0 <= row < rows and 0 <= col < cols):
+            return 1
+        self._cursor = (row, col)
+        return 0
+
+    def _lcd_get_pos(self, row: Any, col: Any) -> int:
+        row.contents.value, col.contents.value = self._cursor
+        return 0
+
+    def LCDClear(self) -> int:
+        self.lcd[...] = _rgb(self._colours[1])
+        for row in self.lcd_text:
+            row[:] = [" "] * len(row)
+        self._cursor = (0, 0)
+        return 0
+
+    def LCDSetColor(self, foreground: int, background: int) -> int:
+        self._colours = (foreground, background)
+        return 0
+
+    def LCDSetFont(self, font: int, variation: int) -> int:
+        return 0
+
+    def _lcd_set_font_size(self, size: int) -> int:
+        return 0
+
+    def LCDSetMode(self, mode: int) -> int:
+        return 0
+
+    def LCDMenu(self, str1: str, str2: str, str3: str, str4: str) -> int:
+        self.lcd_menu = [str1, str2, str3, str4]
+        return 0
+
+    def LCDMenuI(self, entry: int, string: str, foreground: int, background: int) -> int:
+        if not 1 <= entry <= 4:
+            return 1
+        self.lcd_menu[entry - 1] = string
+        return 0
+
+    def _lcd_get_size(self, width: Any, height: Any) -> int:
+        width.contents.value, height.contents.value = LCD_WIDTH, LCD_HEIGHT
+        return 0
+
+    def LCDPixel(self, x: int, y: int, col: int) -> int:
+        if 0 <= x < LCD_WIDTH and 0 <= y < LCD_HEIGHT:
+            self.lcd[y, x] = _rgb(col)
+        return 0
+
+    def LCDGetPixel(self, x: int, y: int) -> int:
+        if not (0 <= x < LCD_WIDTH and 0 <= y < LCD_HEIGHT):
+            return BLACK
+        r, g, b = self.lcd[y, x].tolist()
+        return (r << 16) | (g << 8) | b
+
+    def LCDLine(self, x1: int, y1: int, x2: int, y2: int, col: int) -> int:
+        draw_line(self.lcd, x1, y1, x2, y2, _rgb(col))
+        return 0
+
+    def LCDArea(self, x1: int, y1: int, x2: int, y2: int, col: int, fill: int) -> int:
+        draw_rect(self.lcd, x1, y1, x2, y2, _rgb(col), fill=bool(fill))
+        return 0
+
+    def LCDCircle(self, x: int, y: int, size: int, col: int, fill: int) -> int:
+        """
+        :param:`size` is treated as the radius
+        """
+        draw_circle(self.lcd, x, y, size, _rgb(col), fill=bool(fill))
+        return 0
+
+    def LCDImageSize(self, resolution: int) -> int:
+        if resolution not in _RESOLUTIONS:
+            return 1
+        x, y, _, _ = self._image_area
+        self._image_area = (x, y) + _RESOLUTIONS[resolution]
+        return 0
+
+    def LCDImageStart(self, x: int, y: int, width: int, height: int) -> int:
+        self._image_area = (x, y, width, height)
+        return 0
+
+    def _lcd_image(self, buffer: Any, channels: int, convert: Callable[[np.ndarray], np.ndarray]) -> int:
+        x, y, width, height = self._image_area
+        pixels = np.frombuffer(buffer, dtype=np.uint8, count=width * height * channels).reshape(height, width, channels)
+        draw_image(self.lcd, x, y, pixels, convert)
+        return 0
+
+    def LCDRefresh(self) -> int:
+        self.lcd_refreshes += 1
+        return 0
+
+    # LIDAR and PSD
+
+    def _noisy(self, distances: np.ndarray) -> np.ndarray:
+        if self.sensor_noise > 0:
+            distances = distances + self._rng.normal(0, self.sensor_noise, distances.shape)
+        return np.clip(np.rint(distances), 0, self.sensor_range).astype(np.int64)
+
+    def LIDARSet(self, range: int, tilt: int, n_points: int) -> int:
+        self._lidar_config = (range, tilt, n_points)
+        return 0
+
+    def LIDARGet(self) -> list[int]:
+        """
+        Point `i` is at `range / 2 - i * range / n_points` degrees from forwards (anticlockwise), as :class:`LIDARScan`.
+        """
+        self._sync()
+        range, tilt, n_points = self._lidar_config
+        angles = self._phi + np.radians(range / 2 - np.arange(n_points) * (range / n_points))
+        distances, _ = self.world.cast(self._x, self._y, angles, self.sensor_range)
+        # tilted beams travel further to reach the same (horizontal) distance
+        return self._noisy(distances / math.cos(math.radians(tilt))).tolist()
+
+    def PSDGet(self, psd: int) -> int:
+        self._sync()
+        mount = self.psd_mounts.get(psd)
+        if mount is None:
+            return 0
+        cos_phi, sin_phi = math.cos(self._phi), math.sin(self._phi)
+        x = self._x + cos_phi * mount.x - sin_phi * mount.y
+        y = self._y + sin_phi * mount.x + cos_phi * mount.y
+        distances, _ = self.world.cast(x, y, np.array((self._phi + math.radians(mount.angle),)), self.sensor_range)
+        return int(self._noisy(distances)[0])
+
+    def PSDGetRaw(self, psd: int) -> int:
+        return self.PSDGet(psd)
+
+    # motors and servos
+
+    def _set_wheel(self, motor: int, speed: float) -> int:
+        if motor not in (1, 2):
+            return 0
+        self._sync()
+        self._motion = None
+        speeds = list(self._wheel_speeds)
+        speeds[motor - 1] = speed
+        self._wheel_speeds = (speeds[0], speeds[1])
+        return 0
+
+    def MOTORDrive(self, motor: int, speed: int) -> int:
+        return self._set_wheel(motor, speed / 100 * self.max_wheel_speed)
+
+    def MOTORDriveRaw(self, motor: int, speed: int) -> int:
+        return self.MOTORDrive(motor, speed)
+
+    def MOTORSpeed(self, motor: int, ticks: int) -> int:
+        """
+        :param:`ticks` per second
+        """
+        return self._set_wheel(motor, ticks * math.pi * self.wheel_diameter / self.ticks_per_rev)
+
+    def MOTORPID(self, motor: int, p: int, i: int, d: int) -> int:
+        return 0
+
+    def MOTORPIDOff(self, motor: int) -> int:
+        return 0
+
+    def SERVOSet(self, servo: int, angle: int) -> int:
+        self.servos[servo] = angle
+        return 0
+
+    def SERVOSetRaw(self, servo: int, angle: int) -> int:
+        return self.SERVOSet(servo, angle)
+
+    def SERVORange(self, servo: int, low: int, high: int) -> int:
+        return 0
+
+    def ENCODERRead(self, encoder: int) -> int:
+        if encoder not in (1, 2):
+            return 0
+        self._sync()
+        return round(self._wheel_travel[encoder - 1] * self.ticks_per_rev / (math.pi * self.wheel_diameter))
+
+    def ENCODERReset(self, encoder: int) -> int:
+        if encoder in (1, 2):
+            self._sync()
+            self._wheel_travel[encoder - 1] = 0.0
+        return 0
+
+    # v-omega
+
+    def _set_speeds(self, lin_speed: float, ang_speed: float):
+        """
+        :param:`lin_speed` mm/s, :param:`ang_speed` rads/s
+        """
+        offset = ang_speed * self.wheel_distance / 2
+        self._wheel_speeds = (lin_speed - offset, lin_speed + offset)
+
+    def _start_motion(self, lin_speed: float, ang_speed: float, distance: float, duration: float) -> int:
+        """
+        :param:`duration` s
+        """
+        self._sync()
+        if duration <= 0:
+            self._motion = None
+            self._wheel_speeds = (0.0, 0.0)
+            return 0
+        self._motion = _Motion(lin_speed, ang_speed, distance, self._time, self._time + duration * 1000)
+        self._set_speeds(lin_speed, ang_speed)
+        return 0
+
+    def VWSetSpeed(self, lin_speed: int, ang_speed: int) -> int:
+        self._sync()
+        self._motion = None
+        self._set_speeds(lin_speed, math.radians(ang_speed))
+        return 0
+
+    def _vw_get_speed(self, lin_speed: Any, ang_speed: Any) -> int:
+        self._sync()
+        left, right = (0.0, 0.0) if self._stalled else self._wheel_speeds
+        lin_speed.contents.value = round((left + right) / 2)
+        ang_speed.contents.value = round(math.degrees((right - left) / self.wheel_distance))
+        return 0
+
+    def VWSetPosition(self, x: int, y: int, phi: int) -> int:
+        self.set_pose(x, y, phi)
+        return 0
+
+    def VWGetPosition(self) -> tuple[int, int, int]:
+        self._sync()
+        phi = math.degrees(self._phi)
+        return round(self._x), round(self._y), round((phi + 180) % 360 - 180)
+
+    def VWStraight(self, dist: int, lin_speed: int) -> int:
+        speed = abs(lin_speed)
+        return self._start_motion(math.copysign(speed, dist), 0, abs(dist), abs(dist) / speed if speed else 0)
+
+    def VWTurn(self, angle: int, ang_speed: int) -> int:
+        speed = math.radians(abs(ang_speed))
+        angle_rads = math.radians(angle)
+        return self._start_motion(0, math.copysign(speed, angle_rads), abs(angle), abs(angle_rads) / speed if speed else 0)
+
+    def VWCurve(self, dist: int, angle: int, lin_speed: int) -> int:
+        speed = abs(lin_speed)
+        duration = abs(dist) / speed if speed else 0
+        ang_speed = math.radians(angle) / duration if duration else 0
+        return self._start_motion(math.copysign(speed, dist), ang_speed, abs(dist), duration)
+
+    def VWDrive(self, dx: int, dy: int, lin_speed: int) -> int:
+        """
+        Drives along the circular arc to `(dx, dy)` (relative to the robot, x forwards),
+        starting tangent to the current heading.
+        """
+        if dy == 0:
+            return self.VWStraight(dx, lin_speed)
+        angle = 2 * math.atan2(dy, dx)
+        radius = (dx * dx + dy * dy) / (2 * dy)
+        return self.VWCurve(abs(radius * angle), round(math.degrees(angle)), lin_speed)
+
+    def VWRemain(self) -> int:
+        """
+        Returns the remaining distance (mm), or angle (degrees) for turns.
+        """
+        self._sync()
+        motion = self._motion
+        if motion is None:
+            return 0
+        return round(motion.distance * (motion.end - self._time) / (motion.end - motion.start))
+
+    def VWDone(self) -> int:
+        self._sync()
+        return int(self._motion is None)
+
+    def VWWait(self) -> int:
+        """
+        Without a :attr:`time_scale`, advances the simulated clock until the motion finishes (or stalls).
+        """
+        while self._motion is not None and not self._stalled:
+            if self.time_scale is None:
+                # in chunks, to return soon after stalling
+                self._advance_to(min(self._motion.end, self._time + 100))
+            else:
+                time.sleep(max(self._motion.end - self._time, 1) / 1000 / self.time_scale)
+                self._sync()
+        return 0
+
+    def VWStalled(self) -> int:
+        self._sync()
+        return 0b11 if self._stalled else 0
+
+    # OS
+
+    def OSGetCount(self) -> int:
+        self._sync()
+        return int(self._time)
+
+    def _os_get_time(self, hours: Any, mins: Any, secs: Any, ms: Any) -> int:
+        total = int(self.time_ms)
+        hours.contents.value = total // 3_600_000 % 24
+        mins.contents.value = total // 60_000 % 60
+        secs.contents.value = total // 1000 % 60
+        ms.contents.value = total % 1000
+        return 0
+
+    def OSAttachTimer(self, period_ms: int, func: Callable[[], None]) -> int:
+        """
+        Timers are called as the simulated clock passes their due times.
+        Throws a `ValueError` if :param:`period_ms` is not positive.
+        """
+        if period_ms <= 0:
+            raise ValueError(f"timer period must be positive but got {period_ms}")
+        self._sync()
+        timer = next(i for i in range(1, len(self._timers) + 2) if i not in self._timers)
+        self._timers[timer] = _Timer(period_ms, func, self._time + period_ms)
+        return timer
+
+    def OSDetachTimer(self, timer: int) -> int:
+        return 0 if self._timers.pop(timer, None) is not None else 1
+
+    def OSExecute(self, command: Any) -> int:
+        return -1
+
+    def OSMachineSpeed(self) -> int:
+        return 0
+
+    def OSMachineType(self) -> int:
+        return 0
+
+    def OSMachineID(self) -> int:
+        return 0
+
+    # ctypes `lib` functions which differ from the `eye` functions (taking pointers or buffers)
+
+    def _lib_functions(self) -> dict[str, Callable[..., int]]:
+        return {
+            "CAMGet": lambda buffer: self._capture_into(buffer, False),
+            "CAMGetGray": lambda buffer: self._capture_into(buffer, True),
+            "KEYGetXY": self._key_get_xy,
+            "KEYReadXY": self._key_read_xy,
+            "LCDGetPos": self._lcd_get_pos,
+            "LCDGetSize": self._lcd_get_size,
+            "LCDSetFontSize": self._lcd_set_font_size,
+            "LCDImage": lambda buffer: self._lcd_image(buffer, 3, lambda rgb: rgb),
+            "LCDImageGray": lambda buffer: self._lcd_image(buffer, 1, lambda gray: np.repeat(gray, 3, axis=2)),
+            # as the simulator: 0 => 255 (white), 1 => 0 (black)
+            "LCDImageBinary": lambda buffer: self._lcd_image(buffer, 1, lambda binary: np.repeat(binary - np.uint8(1), 3, axis=2)),
+            "OSGetTime": self._os_get_time,
+            "VWGetSpeed": self._vw_get_speed,
+        }
+
+
+# installing as `eye`
+
+_EYE_FUNCTIONS: tuple[str, ...] = (
+    "CAMInit", "CAMRelease", "CAMGet", "CAMGetGray",
+    "IPPRGB2Col", "IPPRGB2Hue", "IPPRGB2HSI", "IPPCol2HSI",
+    "KEYGet", "KEYRead", "KEYWait",
+    "LCDPrintf", "LCDSetPrintf", "LCDSetPos", "LCDClear", "LCDSetColor", "LCDSetFont", "LCDSetMode",
+    "LCDMenu", "LCDMenuI", "LCDPixel", "LCDGetPixel", "LCDLine", "LCDArea", "LCDCircle",
+    "LCDImageSize", "LCDImageStart", "LCDRefresh",
+    "LIDARSet", "LIDARGet", "PSDGet", "PSDGetRaw",
+    "MOTORDrive", "MOTORDriveRaw", "MOTORSpeed", "MOTORPID", "MOTORPIDOff",
+    "SERVOSet", "SERVOSetRaw", "SERVORange", "ENCODERRead", "ENCODERReset",
+    "VWSetSpeed", "VWSetPosition", "VWGetPosition", "VWStraight", "VWTurn", "VWCurve", "VWDrive",
+    "VWRemain", "VWDone", "VWWait", "VWStalled",
+    "OSGetCount", "OSAttachTimer", "OSDetachTimer", "OSExecute", "OSMachineSpeed", "OSMachineType", "OSMachineID",
+)
+
+_current: Optional[HeadlessEye] = None
+_module: Optional[ModuleType] = None
+
+def _forward(name: str) -> Callable[..., Any]:
+    """
+    Returns a plain function calling :param:`name` on the currently installed simulator,
+    so eyepy modules (which bind `eye` functions at import) follow a re-install.
+    """
+    def forward(*args: Any) -> Any:
+        return getattr(_current, name)(*args)
+    forward.__name__ = forward.__qualname__ = name
+    return forward
+
+class _HeadlessCFunction:
+    """
+    Stands in for a ctypes foreign function; `argtypes` and `restype` can be set but are ignored.
+    """
+    argtypes: Any
+    restype: Any
+
+    def __init__(self, name: str):
+        self.__name__ = name
+        self.argtypes = None
+        self.restype = ctypes.c_int
+
+    def __call__(self, *args: Any) -> int:
+        sim = _current
+        assert sim is not None
+        special = sim._lib_overrides.get(self.__name__)
+        if special is not None:
+            return special(*args)
+        return getattr(sim, self.__name__)(*args)
+
+class _HeadlessLib:
+    """
+    Stands in for the `ctypes.CDLL` of the simulator library.
+    """
+    def __getattr__(self, name: str) -> _HeadlessCFunction:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        function = self[name]
+        # cached like `ctypes.CDLL`, so `argtypes` set by eyepy persist
+        setattr(self, name, function)
+        return function
+
+    def __getitem__(self, name: str) -> _HeadlessCFunction:
+        # like `ctypes.CDLL`, indexing always returns a new function object
+        return _HeadlessCFunction(name)
+
+def _make_module() -> ModuleType:
+    module = ModuleType("eye", "Headless stand-in for the EyeSim `eye` module; see `eyepy.headless`.")
+    for name in _CONSTANT_NAMES:
+        setattr(module, name, globals()[name])
+    for name in _EYE_FUNCTIONS:
+        setattr(module, name, _forward(name))
+    setattr(module, "lib", _HeadlessLib())
+    return module
+
+def install(world: Optional[World] = None, **options: Any) -> HeadlessEye:
+    """
+    Creates a :class:`HeadlessEye` (see it for :param:`options`) and registers it as the `eye` module.
+    The first install must happen before any other eyepy submodule is imported; later installs replace
+    the simulator used by eyepy, e.g. to reset it between tests.
+
+    Throws a `RuntimeError` if a different `eye` module has already been imported.
+    """
+    global _current, _module
+    existing = sys.modules.get("eye")
+    if existing is not None and existing is not _module:
+        raise RuntimeError("a different `eye` module has already been imported")
+    if _module is None:
+        _module = _make_module()
+    _current = HeadlessEye(world, **options)
+    sys.modules["eye"] = _module
+    return _current
+
+def current() -> Optional[HeadlessEye]:
+    """
+    Returns the installed simulator, if any.
+    """
+    return _current
@@ -0,0 +1,377 @@
+"""Vectorised operations on image arrays, as returned by `Image.as_array`."""
+
+from __future__ import annotations
+import math
+from typing import Callable
+
+import numpy as np
+
+try:
+    from typing import Literal, TypeAlias
+except ImportError:
+    from typing_extensions import Literal, TypeAlias
+
+
+BorderMode: TypeAlias = Literal["constant", "replicate", "reflect", "wrap"]
+"""
+How pixels outside the image are treated:
+* `"constant"` => :param:`border_value`
+* `"replicate"` => the nearest edge pixel (`aaa|abcd|ddd`)
+* `"reflect"` => mirrored, without repeating the edge pixel (`dcb|abcd|cba`)
+* `"wrap"` => the opposite side of the image (`bcd|abcd|abc`)
+"""
+
+_NP_PAD_MODES: dict[str, str] = {
+    "constant": "constant",
+    "replicate": "edge",
+    "reflect": "reflect",
+    "wrap": "wrap",
+}
+
+def pad(array: np.ndarray, pad_y: int, pad_x: int, *, border: BorderMode, border_value: float = 0) -> np.ndarray:
+    """
+    Pads the first two (spatial) axes of :param:`array`; any channel axis is left alone.
+    """
+    if border not in _NP_PAD_MODES:
+        raise ValueError(f"unknown border mode '{border}'; expected one of {list(_NP_PAD_MODES)}")
+
+    pad_width = [(pad_y, pad_y), (pad_x, pad_x)] + [(0, 0)] * (array.ndim - 2)
+    if border == "constant":
+        return np.pad(array, pad_width, mode="constant", constant_values=border_value)
+    return np.pad(array, pad_width, mode=_NP_PAD_MODES[border])
+
+def _check_kernel_size(*sizes: int):
+    for size in sizes:
+        if size < 1 or size % 2 == 0:
+            raise ValueError(f"kernel dimensions must be odd and positive but got {size}")
+
+def to_uint8(array: np.ndarray) -> np.ndarray:
+    """
+    Rounds and saturates to `0..255`, returning a C-contiguous `uint8` array.
+    """
+    if array.dtype == np.uint8:
+        return np.ascontiguousarray(array)
+    return np.ascontiguousarray(np.clip(np.rint(array), 0, 255).astype(np.uint8))
+
+def correlate(array: np.ndarray, kernel: np.ndarray, *, border: BorderMode = "replicate", border_value: float = 0) -> np.ndarray:
+    """
+    Applies :param:`kernel` (as-is, i.e. not flipped) centred on every pixel.
+    Kernel dimensions must be odd. Returns a `float32` array the same shape as :param:`array`.
+
+    Rank-1 kernels (e.g. box and Gaussian kernels) are automatically split and applied via
+    :func:`correlate_separable`, which is much faster for larger kernels.
+    """
+    kernel = np.asarray(kernel, dtype=np.float64)
+    if kernel.ndim != 2:
+        raise ValueError(f"expected a 2D kernel but got shape {kernel.shape}")
+    kh, kw = kernel.shape
+    _check_kernel_size(kh, kw)
+
+    if kh > 1 and kw > 1 and np.linalg.matrix_rank(kernel) == 1:
+        u, s, vt = np.linalg.svd(kernel)
+        scale = math.sqrt(s[0])
+        return correlate_separable(array, vt[0] * scale, u[:, 0] * scale, border=border, border_value=border_value)
+
+    ry, rx = kh // 2, kw // 2
+    padded = pad(array.astype(np.float32, copy=False), ry, rx, border=border, border_value=border_value)
+    h, w = array.shape[:2]
+
+    out = np.zeros(array.shape, dtype=np.float32)
+    for ky in range(kh):
+        for kx in range(kw):
+            weight = kernel[ky, kx]
+            if weight == 0:
+                continue
+            out += np.float32(weight) * padded[ky:ky + h, kx:kx + w]
+    return out
+
+def correlate_separable(array: np.ndarray, kernel_x: np.ndarray, kernel_y: np.ndarray, *, border: BorderMode = "replicate", border_value: float = 0) -> np.ndarray:
+    """
+    Applies the kernel `outer(kernel_y, kernel_x)` as a horizontal pass followed by a vertical pass.
+    Kernel lengths must be odd. Returns a `float32` array the same shape as :param:`array`.
+    """
+    kernel_x = np.asarray(kernel_x, dtype=np.float64).ravel()
+    kernel_y = np.asarray(kernel_y, dtype=np.float64).ravel()
+    _check_kernel_size(len(kernel_x), len(kernel_y))
+
+    h, w = array.shape[:2]
+    rx, ry = len(kernel_x) // 2, len(kernel_y) // 2
+
+    padded = pad(array.astype(np.float32, copy=False), ry, rx, border=border, border_value=border_value)
+
+    # horizontal pass over all (padded) rows, so the vertical pass sees the correct border values
+    rows = np.zeros((h + 2 * ry, w) + array.shape[2:], dtype=np.float32)
+    for kx, weight in enumerate(kernel_x):
+        if weight != 0:
+            rows += np.float32(weight) * padded[:, kx:kx + w]
+
+    out = np.zeros(array.shape, dtype=np.float32)
+    for ky, weight in enumerate(kernel_y):
+        if weight != 0:
+            out += np.float32(weight) * rows[ky:ky + h]
+    return out
+
+def gaussian_kernel(sigma: float, size: int | None = None) -> np.ndarray:
+    """
+    Returns a normalised 1D Gaussian kernel.
+    If :param:`size` is `None`, it is chosen to cover +-3 sigma.
+    """
+    if sigma <= 0:
+        raise ValueError(f"sigma must be positive but got {sigma}")
+    if size is None:
+        size = 2 * math.ceil(3 * sigma) + 1
+    _check_kernel_size(size)
+
+    x = np.arange(size) - size // 2
+    kernel = np.exp(-(x * x) / (2 * sigma * sigma))
+    return kernel / kernel.sum()
+
+def median(array: np.ndarray, size: int, *, border: BorderMode = "replicate", border_value: float = 0) -> np.ndarray:
+    """
+    Median of the :param:`size` x :param:`size` neighbourhood of every pixel (per channel).
+    """
+    _check_kernel_size(size)
+    r = size // 2
+    padded = pad(array, r, r, border=border, border_value=border_value)
+    windows = np.lib.stride_tricks.sliding_window_view(padded, (size, size), axis=(0, 1))
+    windows = windows.reshape(array.shape + (size * size,))
+
+    # partitioning is considerably faster than a full `np.median` sort
+    mid = (size * size) // 2
+    return np.partition(windows, mid, axis=-1)[..., mid]
+
+def histogram(array: np.ndarray) -> np.ndarray:
+    """
+    Returns the count of each value (0 to 255) of a `uint8` array of shape `(H, W)`, as an `int64` array
+    of shape `(256,)`, or per channel for shape `(H, W, C)`, as shape `(C, 256)`.
+    """
+    if array.ndim == 2:
+        return np.bincount(array.reshape(-1), minlength=256)
+    return np.stack([np.bincount(array[..., c].reshape(-1), minlength=256) for c in range(array.shape[2])])
+
+def integral(array: np.ndarray, *, squared: bool = False) -> np.ndarray:
+    """
+    Returns the summed-area table of :param:`array` (or of its squares) per channel, as an `int64` array
+    with a leading row and column of zeros, so `table[y, x]` is the sum of `array[:y, :x]`.
+    """
+    values = array.astype(np.int64)
+    if squared:
+        values *= values
+    table = np.zeros((array.shape[0] + 1, array.shape[1] + 1) + array.shape[2:], dtype=np.int64)
+    np.cumsum(values, axis=0, out=table[1:, 1:])
+    np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+    return table
+
+def rect_sums(table: np.ndarray, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray) -> np.ndarray:
+    """
+    Returns the sums of the rectangles `[y1, y2) x [x1, x2)` from the summed-area :param:`table`,
+    four lookups each. The coordinates may be scalars or arrays of any (matching) shape.
+    """
+    return table[y2, x2] - table[y1, x2] - table[y2, x1] + table[y1, x1]
+
+def box_mean(array: np.ndarray, size: int) -> np.ndarray:
+    """
+    Mean of the :param:`size` x :param:`size` neighbourhood of every pixel, using an integral image, so the
+    cost doesn't depend on :param:`size`. Near edges, only the neighbours inside the image are used.
+    Returns a `float64` array the same shape as :param:`array`.
+    """
+    _check_kernel_size(size)
+    r = size // 2
+    height, width = array.shape[:2]
+    table = integral(array)
+
+    x1 = np.clip(np.arange(width) - r, 0, width)
+    x2 = np.clip(np.arange(width) + r + 1, 0, width)
+    y1 = np.clip(np.arange(height) - r, 0, height)[:, np.newaxis]
+    y2 = np.clip(np.arange(height) + r + 1, 0, height)[:, np.newaxis]
+    counts = (x2 - x1) * (y2 - y1)
+    if array.ndim == 3:
+        counts = counts[..., np.newaxis]
+    return rect_sums(table, x1, y1, x2, y2) / counts
+
+def otsu_level(hist: np.ndarray) -> int:
+    """
+    Returns the threshold maximising the between-class variance of the 256-bin :param:`hist`,
+    splitting it into values `<= level` and values `> level`.
+    """
+    hist = hist.astype(np.float64)
+    values = np.arange(256)
+    weight_low = np.cumsum(hist)
+    weight_high = weight_low[-1] - weight_low
+    sum_low = np.cumsum(hist * values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_low = sum_low / weight_low
+        mean_high = (sum_low[-1] - sum_low) / weight_high
+        between = weight_low * weight_high * (mean_low - mean_high) ** 2
+    return int(np.argmax(np.nan_to_num(between)))
+
+def runs(classes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    Run-length encodes the non-zero values of the 2D array :param:`classes`, row by row.
+    Returns the start and (exclusive) end of each run as indices into the array flattened with an extra
+    zero column (so runs never cross rows), the value of each run, and the padded row length.
+    """
+    height, width = classes.shape
+    padded = np.zeros((height, width + 1), dtype=classes.dtype)
+    padded[:, :width] = classes
+    flat = padded.reshape(-1)
+
+    changes = np.flatnonzero(np.diff(flat, prepend=0))
+    # every change to a non-zero value starts a run, which ends at the next change
+    # (there always is one, since the array ends with the zero column)
+    starts = changes[flat[changes] != 0]
+    ends = changes[np.searchsorted(changes, starts, side="right")]
+    return starts, ends, flat[starts], width + 1
+
+def connect_runs(starts: np.ndarray, ends: np.ndarray, values: np.ndarray, row_length: int, connectivity: int) -> np.ndarray:
+    """
+    Returns the root run of the component containing each run from :func:`runs`.
+    """
+    n = len(starts)
+    k = 1 if connectivity == 8 else 0
+
+    # for each run, the runs in the row above it touching it form a contiguous range, since runs are sorted and disjoint
+    lo = np.searchsorted(ends, starts - row_length - k, side="right")
+    hi = np.searchsorted(starts, ends - row_length + k, side="left")
+    counts = np.maximum(hi - lo, 0)
+
+    below = np.repeat(np.arange(n), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    above = np.repeat(lo, counts) + offsets
+    same = values[below] == values[above]
+    below, above = below[same], above[same]
+
+    # union-find over all edges at once: hook every run to the smallest root it touches,
+    # then compress paths by pointer jumping, until nothing changes
+    parent = np.arange(n)
+    while True:
+        root_below, root_above = parent[below], parent[above]
+        smaller = np.minimum(root_below, root_above)
+        new_parent = parent.copy()
+        np.minimum.at(new_parent, root_below, smaller)
+        np.minimum.at(new_parent, root_above, smaller)
+        while True:
+            jumped = new_parent[new_parent]
+            if np.array_equal(jumped, new_parent):
+                break
+            new_parent = jumped
+        if np.array_equal(new_parent, parent):
+            return parent
+        parent = new_parent
+
+_SOBEL_DERIVATIVE = np.array((-1, 0, 1))
+_SOBEL_SMOOTHING = np.array((1, 2, 1))
+
+def sobel(array: np.ndarray, *, border: BorderMode = "replicate", border_value: float = 0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the horizontal and vertical gradients (towards +x and +y, i.e. down) of :param:`array`,
+    from the 3x3 Sobel kernels, as `float32` arrays the same shape as :param:`array`.
+    """
+    gx = correlate_separable(array, _SOBEL_DERIVATIVE, _SOBEL_SMOOTHING, border=border, border_value=border_value)
+    gy = correlate_separable(array, _SOBEL_SMOOTHING, _SOBEL_DERIVATIVE, border=border, border_value=border_value)
+    return gx, gy
+
+# tan(22.5 deg) and tan(67.5 deg), separating gradient directions into horizontal, diagonal and vertical
+_TAN_22_5 = math.tan(math.pi / 8)
+_TAN_67_5 = math.tan(3 * math.pi / 8)
+
+def non_maximum_suppression(magnitude: np.ndarray, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+    """
+    Returns a boolean array marking the pixels of the 2D :param:`magnitude` array which are local maxima
+    along their gradient direction (rounded to a multiple of 45 degrees), thinning edges to one pixel.
+    """
+    height, width = magnitude.shape
+    padded = np.pad(magnitude, 1)
+    def shifted(dy: int, dx: int) -> np.ndarray:
+        return padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+
+    ax, ay = np.abs(gx), np.abs(gy)
+    horizontal = ay <= ax * _TAN_22_5
+    vertical = ay >= ax * _TAN_67_5
+    # gradients pointing down-right or up-left (y is down); the rest of the diagonals point up-right or down-left
+    diagonal_down = ~horizontal & ~vertical & ((gx > 0) == (gy > 0))
+
+    before = np.select((horizontal, vertical, diagonal_down), (shifted(0, -1), shifted(-1, 0), shifted(-1, -1)), shifted(1, -1))
+    after = np.select((horizontal, vertical, diagonal_down), (shifted(0, 1), shifted(1, 0), shifted(1, 1)), shifted(-1, 1))
+    # strictly greater on one side only, so plateaus two pixels wide keep one pixel
+    return (magnitude > before) & (magnitude >= after) & (magnitude > 0)
+
+def hysteresis(weak: np.ndarray, strong: np.ndarray) -> np.ndarray:
+    """
+    Returns a boolean array marking the 8-connected regions of the 2D boolean array :param:`weak`
+    which contain at least one pixel of :param:`strong` (which should be a subset of :param:`weak`).
+    """
+    height, width = weak.shape
+    starts, ends, values, row_length = runs(weak.astype(np.uint8))
+    if len(starts) == 0:
+        return np.zeros((height, width), dtype=bool)
+    roots = connect_runs(starts, ends, values, row_length, 8)
+
+    # a run is strong if it contains a strong pixel, and its component is kept if any of its runs are strong
+    strong_padded = np.zeros((height, row_length), dtype=np.int32)
+    strong_padded[:, :width] = strong
+    strong_before = np.concatenate(((0,), np.cumsum(strong_padded.reshape(-1))))
+    run_is_strong = strong_before[ends] > strong_before[starts]
+    kept_roots = np.zeros(len(starts), dtype=bool)
+    kept_roots[roots[run_is_strong]] = True
+    kept = kept_roots[roots]
+
+    # paint the kept runs: +1 at each start, -1 at each end (runs are disjoint, so the indices are unique)
+    delta = np.zeros(height * row_length + 1, dtype=np.int8)
+    delta[starts[kept]] = 1
+    delta[ends[kept]] = -1
+    painted = np.cumsum(delta[:-1], dtype=np.int8).astype(bool)
+    return np.ascontiguousarray(painted.reshape(height, row_length)[:, :width])
+
+def draw_line(array: np.ndarray, x1: int, y1: int, x2: int, y2: int, value: float | tuple[float, ...]):
+    """
+    Sets the pixels of :param:`array` on the line from `(x1, y1)` to `(x2, y2)` (inclusive) to :param:`value`,
+    one pixel per step along the longer axis. Pixels outside the array are skipped.
+    """
+    n = max(abs(x2 - x1), abs(y2 - y1)) + 1
+    xs = np.rint(np.linspace(x1, x2, n)).astype(np.intp)
+    ys = np.rint(np.linspace(y1, y2, n)).astype(np.intp)
+    inside = (xs >= 0) & (xs < array.shape[1]) & (ys >= 0) & (ys < array.shape[0])
+    array[ys[inside], xs[inside]] = value
+
+def draw_rect(array: np.ndarray, x1: int, y1: int, x2: int, y2: int, value: float | tuple[float, ...], *, fill: bool = True):
+    """
+    Sets the pixels of :param:`array` in (or on the outline of) the rectangle with corners `(x1, y1)` and `(x2, y2)`
+    (inclusive) to :param:`value`. Pixels outside the array are skipped.
+    """
+    x1, x2 = sorted((x1, x2))
+    y1, y2 = sorted((y1, y2))
+    if fill:
+        array[max(y1, 0):max(y2 + 1, 0), max(x1, 0):max(x2 + 1, 0)] = value
+        return
+    for xa, ya, xb, yb in ((x1, y1, x2, y1), (x2, y1, x2, y2), (x1, y2, x2, y2), (x1, y1, x1, y2)):
+        draw_line(array, xa, ya, xb, yb, value)
+
+def draw_circle(array: np.ndarray, x: int, y: int, radius: int, value: float | tuple[float, ...], *, fill: bool = True):
+    """
+    Sets the pixels of :param:`array` within :param:`radius` of `(x, y)` (or only those on the outline,
+    one pixel wide) to :param:`value`. Pixels outside the array are skipped.
+    """
+    rows = slice(max(y - radius, 0), max(min(y + radius + 1, array.shape[0]), 0))
+    cols = slice(max(x - radius, 0), max(min(x + radius + 1, array.shape[1]), 0))
+    ys, xs = np.ogrid[rows, cols]
+    squared = (xs - x) ** 2 + (ys - y) ** 2
+    mask = squared <= radius * radius
+    if not fill:
+        mask &= squared > (radius - 1) ** 2
+    array[rows, cols][mask] = value
+
+def draw_image(array: np.ndarray, x: int, y: int, image: np.ndarray, convert: Callable[[np.ndarray], np.ndarray] | None = None):
+    """
+    Copies :param:`image` into :param:`array` with its top left corner at `(x, y)`. Pixels outside the array
+    are skipped, so the image may be partly or entirely off it.
+
+    :param:`convert` if given, applied to the part of the image inside the array before copying
+    """
+    height, width = image.shape[:2]
+    left, top = max(-x, 0), max(-y, 0)
+    right, bottom = min(width, array.shape[1] - x), min(height, array.shape[0] - y)
+    if right <= left or bottom <= top:
+        return
+    visible = image[top:bottom, left:right]
+    array[y + top:y + bottom, x + left:x + right] = visible if convert is None else convert(visible)
@@ -1,7 +1,20 @@
 from __future__ import annotations
 import ctypes
+from collections.abc import Sequence
+import math
+import os
+from pathlib import Path
+from typing import NamedTuple, Optional, Union, overload
 
-from eyepy.drawing import Colour, colour_to_rgb
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+import numpy as np
+
+from eyepy.drawing import Colour, Image, IntPoint, Point, colour_to_rgb
+from eyepy.image_ops import connect_runs as _connect_runs, runs as _runs
 
 
 from eye import IPPRGB2Col as _IPPRGB2Col
@@ -84,3 +97,577 @@ def IPPHSI2RGB(hsi: tuple[int, int, int]) -> tuple[int, int, int]:
     b *= 255
     
     return round(r), round(g), round(b)
+
+
+# batched conversions
+
+NO_HUE = 255
+"""Hue value used by :func:`IPPRGB2Hue` for gray (colourless) pixels."""
+
+def _rgb_array(rgb: Image | np.ndarray) -> np.ndarray:
+    """
+    Throws a `ValueError` if the input isn't a colour image or an array of shape `(..., 3)`.
+    """
+    if isinstance(rgb, Image):
+        if rgb.is_gray:
+            raise ValueError("expected a colour image but got a gray image")
+        rgb = rgb.as_array()
+    if rgb.shape[-1:] != (3,):
+        raise ValueError(f"expected an array of shape (..., 3) but got {rgb.shape}")
+    return rgb
+
+def _rgb_channels(rgb: Image | np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the r, g, and b channels of :param:`rgb` as `int32` arrays.
+    Throws a `ValueError` if the input isn't a colour image or an array of shape `(..., 3)`.
+    """
+    rgb = _rgb_array(rgb).astype(np.int32, copy=False)
+    return rgb[..., 0], rgb[..., 1], rgb[..., 2]
+
+def _c_div(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Integer division truncating towards zero (as in C), for positive :param:`b`.
+    """
+    return np.sign(a) * (np.abs(a) // b)
+
+def _rgb_to_hue(r: np.ndarray, g: np.ndarray, b: np.ndarray, max_rgb: np.ndarray, delta: np.ndarray) -> np.ndarray:
+    # mirrors the integer arithmetic of RoBIOS's `IPPRGB2Hue`
+    safe_delta = np.maximum(delta, 1)
+    hue = np.where(r == max_rgb, 42 + _c_div(42 * (g - b), safe_delta),
+          np.where(g == max_rgb, 126 + _c_div(42 * (b - r), safe_delta),
+                                 210 + _c_div(42 * (r - g), safe_delta)))
+    return np.where(2 * delta <= max_rgb, NO_HUE, hue)
+
+def _rgb_to_hsi(r: np.ndarray, g: np.ndarray, b: np.ndarray) -> np.ndarray:
+    max_rgb = np.maximum(np.maximum(r, g), b)
+    min_rgb = np.minimum(np.minimum(r, g), b)
+    delta = max_rgb - min_rgb
+
+    hsi = np.empty(r.shape + (3,), dtype=np.uint8)
+    hsi[..., 0] = _rgb_to_hue(r, g, b, max_rgb, delta)
+    intensity = (r + g + b) // 3
+    hsi[..., 1] = np.where(intensity > 0, 255 - (255 * min_rgb) // np.maximum(intensity, 1), 0)
+    hsi[..., 2] = intensity
+    return hsi
+
+
+# lookup tables
+
+class HSILookupTable:
+    """
+    The HSI value (as from :func:`IPPRGB2HSI`) of every RGB colour, quantised to :attr:`bits` bits per channel,
+    so batch conversions are a single table lookup per pixel. With 8 bits the table is exact (and 64MiB, in memory and in the cache file);
+    with fewer, each colour is converted as the centre of its quantisation cell.
+
+    Tables are usually loaded with :meth:`load`, which caches them on disk, and used by passing them as the
+    `lut` parameter of the batch conversions, or for all of them with :func:`set_hsi_lookup_table`.
+    """
+    bits: int
+    table: np.ndarray
+    """
+    `uint8`, shape `(2**(3 * bits), 4)`, indexed by the quantised `(r << 2 * bits) | (g << bits) | b`; may be read-only.
+    Each entry is `h, s, i, 0`, padded so it can be fetched as a single 32-bit word.
+    """
+
+    _FILE_VERSION = 1
+
+    def __init__(self, table: np.ndarray, bits: int):
+        if not 1 <= bits <= 8:
+            raise ValueError(f"bits must be from 1 to 8 but got {bits}")
+        if table.shape != (1 << (3 * bits), 4) or table.dtype != np.uint8 or not table.flags.c_contiguous:
+            raise ValueError(f"expected a contiguous uint8 table of shape {(1 << (3 * bits), 4)} but got {table.dtype} {table.shape}")
+        self.bits = bits
+        self.table = table
+        # gathering whole words is considerably faster than gathering rows of bytes
+        self._words = np.asarray(table).view(np.uint32).reshape(-1)
+
+    @staticmethod
+    def build(bits: int = 8) -> HSILookupTable:
+        """
+        Computes a new table, using the same integer arithmetic as :func:`IPPRGB2HSIImage`
+        (converting every colour through `eye` one by one would take minutes at 8 bits).
+        """
+        if not 1 <= bits <= 8:
+            raise ValueError(f"bits must be from 1 to 8 but got {bits}")
+        levels = 1 << bits
+        # the centre of each quantisation cell (exact for 8 bits)
+        values = (np.arange(levels, dtype=np.int32) << (8 - bits)) + ((1 << (8 - bits)) >> 1)
+        g, b = np.meshgrid(values, values, indexing="ij")
+
+        table = np.zeros((levels, levels * levels, 4), dtype=np.uint8)
+        # one red value at a time, to limit the size of the temporary arrays
+        for i, r in enumerate(values.tolist()):
+            table[i, :, :3] = _rgb_to_hsi(np.full(g.shape, r), g, b).reshape(-1, 3)
+        return HSILookupTable(table.reshape(-1, 4), bits)
+
+    @staticmethod
+    def cache_path(bits: int, cache_dir: Optional[Union[str, os.PathLike[str]]] = None) -> Path:
+        """
+        The file :meth:`load` uses; by default in `~/.cache/eyepy`.
+        """
+        directory = Path(cache_dir) if cache_dir is not None else Path.home() / ".cache" / "eyepy"
+        return directory / f"hsi_lut_v{HSILookupTable._FILE_VERSION}_{bits}bit.npy"
+
+    @staticmethod
+    def load(bits: int = 8, *, cache_dir: Optional[Union[str, os.PathLike[str]]] = None, rebuild: bool = False) -> HSILookupTable:
+        """
+        Memory-maps the cached table (see :meth:`cache_path`), which is nearly instant, and shares the
+        pages between processes. If there is no valid cached table (or :param:`rebuild` is `True`),
+        one is built and saved first.
+        """
+        path = HSILookupTable.cache_path(bits, cache_dir)
+        if not rebuild and path.exists():
+            try:
+                # the constructor checks the shape and dtype
+                return HSILookupTable(np.load(path, mmap_mode="r"), bits)
+            except (OSError, EOFError, ValueError):
+                pass  # truncated, corrupt, or from an incompatible version; rebuild
+
+        lut = HSILookupTable.build(bits)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write then rename, so concurrent loads never see a partial file
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                np.save(f, lut.table)
+            os.replace(temp_path, path)
+        finally:
+            # only still there if writing or renaming failed
+            if temp_path.exists():
+                temp_path.unlink()
+        return HSILookupTable(np.load(path, mmap_mode="r"), bits)
+
+    def _entries(self, rgb: np.ndarray) -> np.ndarray:
+        """
+        Returns the table entries for :param:`rgb`, as a `uint8` array of shape `(..., 4)`.
+        """
+        rgb = rgb.astype(np.uint8, copy=False)
+        shift = 8 - self.bits
+        # built in place, to avoid temporaries
+        indices = rgb[..., 0] >> shift if shift else rgb[..., 0]
+        indices = indices.astype(np.uint32)
+        for channel in (1, 2):
+            indices <<= self.bits
+            indices |= rgb[..., channel] >> shift if shift else rgb[..., channel]
+        return self._words[indices].view(np.uint8).reshape(*rgb.shape[:-1], 4)
+
+    def lookup(self, rgb: np.ndarray) -> np.ndarray:
+        """
+        Returns the HSI values of the `uint8` array :param:`rgb` of shape `(..., 3)`, as a `uint8` array of the same shape.
+        """
+        return np.ascontiguousarray(self._entries(rgb)[..., :3])
+
+    def lookup_hue(self, rgb: np.ndarray) -> np.ndarray:
+        """
+        As :meth:`lookup`, but only returns the hues, with shape `(...)`.
+        """
+        return np.ascontiguousarray(self._entries(rgb)[..., 0])
+
+_default_lut: Optional[HSILookupTable] = None
+
+def set_hsi_lookup_table(lut: Optional[HSILookupTable]):
+    """
+    Sets the table used by default by the batch HSI conversions (and :func:`find_blobs`), or `None` to compute them directly.
+    """
+    global _default_lut
+    _default_lut = lut
+
+def get_hsi_lookup_table() -> Optional[HSILookupTable]:
+    return _default_lut
+
+LookupTableOption = Union[HSILookupTable, Literal[False], None]
+"""a table to use, `None` for the default set by :func:`set_hsi_lookup_table`, or `False` to never use a table"""
+
+def _resolve_lut(lut: LookupTableOption) -> Optional[HSILookupTable]:
+    if lut is None:
+        return _default_lut
+    if lut is False:
+        return None
+    return lut
+
+
+@overload
+def IPPRGB2HueImage(rgb: Image, *, lut: LookupTableOption = None) -> Image: ...
+@overload
+def IPPRGB2HueImage(rgb: np.ndarray, *, lut: LookupTableOption = None) -> np.ndarray: ...
+def IPPRGB2HueImage(rgb: Image | np.ndarray, *, lut: LookupTableOption = None) -> Image | np.ndarray:
+    """
+    Vectorised :func:`IPPRGB2Hue` over a whole colour image (or an array of shape `(..., 3)`).
+    Returns a gray image of hues (or a `uint8` array of shape `(...)`), using :data:`NO_HUE` for gray pixels.
+
+    :param:`lut` see :data:`LookupTableOption`
+    """
+    table = _resolve_lut(lut)
+    if table is not None:
+        hue = table.lookup_hue(_rgb_array(rgb))
+    else:
+        r, g, b = _rgb_channels(rgb)
+        max_rgb = np.maximum(np.maximum(r, g), b)
+        delta = max_rgb - np.minimum(np.minimum(r, g), b)
+        hue = _rgb_to_hue(r, g, b, max_rgb, delta).astype(np.uint8)
+
+    if isinstance(rgb, Image):
+        return Image.from_array(hue, resolution=rgb.resolution)
+    return hue
+
+@overload
+def IPPRGB2HSIImage(rgb: Image, *, lut: LookupTableOption = None) -> Image: ...
+@overload
+def IPPRGB2HSIImage(rgb: np.ndarray, *, lut: LookupTableOption = None) -> np.ndarray: ...
+def IPPRGB2HSIImage(rgb: Image | np.ndarray, *, lut: LookupTableOption = None) -> Image | np.ndarray:
+    """
+    Vectorised :func:`IPPRGB2HSI` over a whole colour image (or an array of shape `(..., 3)`).
+    Returns a 3-channel image (or a `uint8` array of shape `(..., 3)`) with the channels being
+    hue, saturation, and intensity, in the same ranges as :func:`IPPRGB2HSI`.
+
+    :param:`lut` see :data:`LookupTableOption`
+    """
+    table = _resolve_lut(lut)
+    if table is not None:
+        hsi = table.lookup(_rgb_array(rgb))
+    else:
+        hsi = _rgb_to_hsi(*_rgb_channels(rgb))
+
+    if isinstance(rgb, Image):
+        return Image.from_array(hsi, resolution=rgb.resolution)
+    return hsi
+
+def IPPCol2HSIArray(cols: np.ndarray, *, lut: LookupTableOption = None) -> np.ndarray:
+    """
+    Vectorised :func:`IPPCol2HSI` over an array of colours.
+    Returns a `uint8` array of shape `(*cols.shape, 3)`.
+
+    :param:`lut` see :data:`LookupTableOption`
+    """
+    cols = np.asarray(cols, dtype=np.int64)
+    rgb = np.stack(((cols >> 16) & 0xFF, (cols >> 8) & 0xFF, cols & 0xFF), axis=-1)
+    return IPPRGB2HSIImage(rgb, lut=lut)
+
+@overload
+def IPPHSI2RGBImage(hsi: Image) -> Image: ...
+@overload
+def IPPHSI2RGBImage(hsi: np.ndarray) -> np.ndarray: ...
+def IPPHSI2RGBImage(hsi: Image | np.ndarray) -> Image | np.ndarray:
+    """
+    Vectorised :func:`IPPHSI2RGB` over a whole image (or an array of shape `(..., 3)`),
+    with the same input ranges. Note a hue of 255 or greater can't be represented in an
+    :class:`Image`, so an array is needed to cover the full hue range.
+
+    Throws a `ValueError` if any hue is out of range.
+    Returns a colour image (or a `uint8` array of shape `(..., 3)`).
+    """
+    array = hsi.as_array() if isinstance(hsi, Image) else np.asarray(hsi)
+    if array.shape[-1:] != (3,):
+        raise ValueError(f"expected an array of shape (..., 3) but got {array.shape}")
+
+    h = array[..., 0].astype(np.float64)
+    if h.size > 0 and not ((h >= 0).all() and (h < 360).all()):
+        bad = h[(h < 0) | (h >= 360)].flat[0]
+        raise ValueError(f"Hue out of range; expected 0 <= h < 360 but got '{bad:g}'")
+    s = array[..., 1] / 255
+    i = array[..., 2] / 255
+
+    # same algorithm as `IPPHSI2RGB`, evaluated for every sector at once
+    h_prime = h / 60
+    z = 1 - np.abs(h_prime % 2 - 1)
+    c = 3 * i * s / (1 + z)
+    x = c * z
+    m = i * (1 - s)
+    zero = np.zeros_like(c)
+
+    sector = np.floor(h_prime).astype(np.intp)
+    r = np.choose(sector, (c, x, zero, zero, x, c))
+    g = np.choose(sector, (x, c, c, x, zero, zero))
+    b = np.choose(sector, (zero, zero, x, c, c, x))
+
+    rgb = np.stack((r, g, b), axis=-1) + m[..., np.newaxis]
+    max_rgb = rgb.max(axis=-1, keepdims=True)
+    rgb = np.where(max_rgb > 1, rgb / np.maximum(max_rgb, 1), rgb)
+
+    rgb = np.rint(rgb * 255).astype(np.uint8)
+    if isinstance(hsi, Image):
+        return Image.from_array(rgb, resolution=hsi.resolution)
+    return rgb
+
+
+# blob detection
+
+class HSIRange(NamedTuple):
+    """
+    A range of hue, saturation, and intensity values (as from :func:`IPPRGB2HSI`), each inclusive.
+    """
+    hue: Optional[tuple[int, int]] = None
+    """
+    If the first value is greater than the second the range wraps around, e.g. `(240, 10)` for colours near magenta (hue 0).
+    Gray pixels (with a hue of :data:`NO_HUE`) never match a hue range; `None` matches any hue, including gray.
+    """
+
+    saturation: tuple[int, int] = (0, 255)
+    intensity: tuple[int, int] = (0, 255)
+
+    def matches(self, hsi: np.ndarray) -> np.ndarray:
+        """
+        Returns a boolean array of shape `(...)`, marking which values of the `(..., 3)` array :param:`hsi` are in range.
+        Throws a `ValueError` if any bound is outside 0 to 255.
+        """
+        for name, bounds in zip(self._fields, self):
+            if bounds is not None and not all(0 <= v <= 255 for v in bounds):
+                raise ValueError(f"{name} range out of bounds; expected values from 0 to 255 but got: {bounds}")
+
+        s, i = hsi[..., 1], hsi[..., 2]
+        s_low, s_high = self.saturation
+        i_low, i_high = self.intensity
+        mask = (s >= s_low) & (s <= s_high) & (i >= i_low) & (i <= i_high)
+
+        if self.hue is not None:
+            h = hsi[..., 0]
+            h_low, h_high = self.hue
+            if h_low <= h_high:
+                mask &= (h >= h_low) & (h <= h_high)
+            else:
+                mask &= (h >= h_low) | (h <= h_high)
+            mask &= h != NO_HUE
+        return mask
+
+class Blob(NamedTuple):
+    label: int
+    """the value of the blob's pixels in :attr:`BlobResult.labels`; blobs are labelled from 1, largest first"""
+
+    area: int
+    """pixels"""
+
+    centroid: Point
+
+    top_left: IntPoint
+    bottom_right: IntPoint
+    """inclusive"""
+
+    range_index: int
+    """the index of the range the blob matched for :func:`find_blobs`, or the mask value minus 1 for :func:`label_blobs`"""
+
+    @property
+    def width(self) -> int:
+        return self.bottom_right.x - self.top_left.x + 1
+
+    @property
+    def height(self) -> int:
+        return self.bottom_right.y - self.top_left.y + 1
+
+class BlobResult(NamedTuple):
+    labels: np.ndarray
+    """`int32`, shape `(HEIGHT, WIDTH)`; 0 for pixels not in any (kept) blob"""
+
+    blobs: list[Blob]
+    """largest first"""
+
+def label_blobs(mask: np.ndarray, *, connectivity: Literal[4, 8] = 8, min_area: int = 1) -> BlobResult:
+    """
+    Finds the connected components of the non-zero pixels of the 2D array :param:`mask`
+    (e.g. a boolean array). Pixels with different values are never connected.
+
+    :param:`connectivity` 4 to only connect horizontal and vertical neighbours, or 8 to also connect diagonals
+    :param:`min_area` smaller blobs are discarded
+    """
+    if connectivity not in (4, 8):
+        raise ValueError(f"connectivity must be 4 or 8 but got {connectivity}")
+    mask = np.asarray(mask)
+    if mask.ndim != 2:
+        raise ValueError(f"expected a 2D mask but got shape {mask.shape}")
+    classes = mask.astype(np.uint8) if mask.dtype == bool else mask
+    height, width = classes.shape
+
+    starts, ends, values, row_length = _runs(classes)
+    if len(starts) == 0:
+        return BlobResult(np.zeros((height, width), dtype=np.int32), [])
+
+    roots = _connect_runs(starts, ends, values, row_length, connectivity)
+    _, component = np.unique(roots, return_inverse=True)
+    n_components = int(component.max()) + 1
+
+    # per-component stats, accumulated over runs
+    lengths = ends - starts
+    rows = starts // row_length
+    first_cols = starts % row_length
+    last_cols = first_cols + lengths - 1
+
+    area = np.bincount(component, weights=lengths, minlength=n_components)
+    sum_x = np.bincount(component, weights=lengths * (first_cols + last_cols) / 2, minlength=n_components)
+    sum_y = np.bincount(component, weights=lengths * rows, minlength=n_components)
+    min_x = np.full(n_components, width)
+    max_x = np.full(n_components, -1)
+    min_y = np.full(n_components, height)
+    max_y = np.full(n_components, -1)
+    np.minimum.at(min_x, component, first_cols)
+    np.maximum.at(max_x, component, last_cols)
+    np.minimum.at(min_y, component, rows)
+    np.maximum.at(max_y, component, rows)
+    component_values = np.zeros(n_components, dtype=np.int64)
+    component_values[component] = values
+
+    # largest first, ties in order of position
+    kept = np.flatnonzero(area >= min_area)
+    kept = kept[np.argsort(-area[kept], kind="stable")]
+    new_labels = np.zeros(n_components, dtype=np.int32)
+    new_labels[kept] = np.arange(1, len(kept) + 1)
+
+    # paint every run with its label
+    run_labels = new_labels[component]
+    painted = run_labels != 0
+    paint_lengths = lengths[painted]
+    positions = np.repeat(starts[painted] - np.cumsum(paint_lengths) + paint_lengths, paint_lengths) + np.arange(paint_lengths.sum())
+    labels = np.zeros(height * row_length, dtype=np.int32)
+    labels[positions] = np.repeat(run_labels[painted], paint_lengths)
+    labels = np.ascontiguousarray(labels.reshape(height, row_length)[:, :width])
+
+    # plain lists, since indexing numpy arrays per blob is slow when there are many blobs
+    blobs = [
+        Blob(label, int(a), Point(sx / a, sy / a), IntPoint(x1, y1), IntPoint(x2, y2), v - 1)
+        for label, a, sx, sy, x1, y1, x2, y2, v in zip(
+            range(1, len(kept) + 1), area[kept].tolist(), sum_x[kept].tolist(), sum_y[kept].tolist(),
+            min_x[kept].tolist(), min_y[kept].tolist(), max_x[kept].tolist(), max_y[kept].tolist(),
+            component_values[kept].tolist(),
+        )
+    ]
+    return BlobResult(labels, blobs)
+
+def find_blobs(
+    image: Image | np.ndarray, ranges: HSIRange | Sequence[HSIRange], *,
+    connectivity: Literal[4, 8] = 8, min_area: int = 1, lut: LookupTableOption = None,
+) -> BlobResult:
+    """
+    Finds the connected regions of :param:`image` (a colour image, or an array of shape `(HEIGHT, WIDTH, 3)`)
+    whose colour is within one of :param:`ranges`. Where ranges overlap, the first matching range is used,
+    and regions matching different ranges are never connected.
+
+    :param:`lut` for the HSI conversion; see :data:`LookupTableOption`
+    See :func:`label_blobs` for the other parameters.
+    """
+    if isinstance(ranges, HSIRange):
+        ranges = [ranges]
+    if len(ranges) == 0 or len(ranges) > 255:
+        raise ValueError(f"expected 1 to 255 ranges but got {len(ranges)}")
+
+    hsi = IPPRGB2HSIImage(image.as_array() if isinstance(image, Image) else np.asarray(image), lut=lut)
+    classes = np.zeros(hsi.shape[:2], dtype=np.uint8)
+    # in reverse, so the first matching range takes precedence
+    for i, hsi_range in reversed(list(enumerate(ranges))):
+        classes[hsi_range.matches(hsi)] = i + 1
+    return label_blobs(classes, connectivity=connectivity, min_area=min_area)
+
+
+# line detection
+
+class LineSegment(NamedTuple):
+    p1: Point
+    p2: Point
+    """the ends, projected onto the detected line"""
+
+    rho: float
+    """the (signed) distance in pixels from the top left pixel to the line"""
+
+    theta: float
+    """rads, from 0 to pi; the direction of the line's normal, clockwise from the x axis (since y is down)"""
+
+    votes: int
+    """the number of edge pixels supporting the segment"""
+
+    @property
+    def length(self) -> float:
+        return math.dist(self.p1, self.p2)
+
+def _hough_accumulator(xs: np.ndarray, ys: np.ndarray, cos_t: np.ndarray, sin_t: np.ndarray, rho_offset: float, rho_resolution: float, n_rho: int) -> np.ndarray:
+    """
+    Returns the votes of every `(rho, theta)` bin, shape `(n_rho, len(cos_t))`.
+    """
+    rhos = np.outer(xs, cos_t) + np.outer(ys, sin_t)
+    bins = np.rint((rhos + rho_offset) / rho_resolution).astype(np.intp)
+    bins *= len(cos_t)
+    bins += np.arange(len(cos_t))
+    return np.bincount(bins.reshape(-1), minlength=n_rho * len(cos_t)).reshape(n_rho, len(cos_t))
+
+def _local_maxima(accumulator: np.ndarray, threshold: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the `(rho, theta)` bin indices of the peaks of at least :param:`threshold` votes, most votes first.
+    A peak has at least as many votes as its 8 neighbours, and strictly more than those before it (in row-major order).
+    """
+    height, width = accumulator.shape
+    padded = np.pad(accumulator, 1)
+    peaks = accumulator >= max(threshold, 1)
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dy == 0 and dx == 0:
+                continue
+            neighbour = padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+            # ties go to the first bin, so a plateau gives one peak
+            peaks &= accumulator > neighbour if (dy, dx) < (0, 0) else accumulator >= neighbour
+    rho_bins, theta_bins = np.nonzero(peaks)
+    order = np.argsort(-accumulator[rho_bins, theta_bins], kind="stable")
+    return rho_bins[order], theta_bins[order]
+
+def hough_lines(
+    edges: Image | np.ndarray, *,
+    rho_resolution: float = 1, theta_resolution: float = math.pi / 180,
+    threshold: int = 30, min_length: float = 20, max_gap: float = 5, max_lines: int = 10,
+) -> list[LineSegment]:
+    """
+    Finds straight line segments through the non-zero pixels of :param:`edges` (e.g. from :meth:`Image.canny`,
+    or a 2D array) with the Hough transform, ranked by their number of edge pixels, most first.
+
+    Every line with at least :param:`threshold` votes is split into segments where consecutive edge pixels along
+    it are more than :param:`max_gap` pixels apart, keeping segments at least :param:`min_length` pixels long.
+    Each edge pixel supports at most one segment, taken by the line with the most votes.
+
+    :param:`rho_resolution` pixels, :param:`theta_resolution` rads; the size of the accumulator bins
+    :param:`max_lines` the maximum number of segments returned
+    """
+    if rho_resolution <= 0 or theta_resolution <= 0:
+        raise ValueError(f"resolutions must be positive but got rho: {rho_resolution}, theta: {theta_resolution}")
+    mask = edges.as_array() if isinstance(edges, Image) else np.asarray(edges)
+    if mask.ndim != 2:
+        raise ValueError(f"expected gray edges of shape (HEIGHT, WIDTH) but got shape {mask.shape}")
+
+    ys, xs = np.nonzero(mask)
+    if len(xs) == 0 or max_lines <= 0:
+        return []
+    xs = xs.astype(np.float32)
+    ys = ys.astype(np.float32)
+
+    thetas = np.arange(0, math.pi, theta_resolution)
+    cos_t = np.cos(thetas).astype(np.float32)
+    sin_t = np.sin(thetas).astype(np.float32)
+    diagonal = math.hypot(*mask.shape)
+    n_rho = 2 * math.ceil(diagonal / rho_resolution) + 1
+    rho_offset = math.ceil(diagonal / rho_resolution) * rho_resolution
+    accumulator = _hough_accumulator(xs, ys, cos_t, sin_t, rho_offset, rho_resolution, n_rho)
+
+    segments: list[LineSegment] = []
+    unused = np.ones(len(xs), dtype=bool)
+    for rho_bin, theta_bin in zip(*(bins.tolist() for bins in _local_maxima(accumulator, threshold))):
+        rho = rho_bin * rho_resolution - rho_offset
+        c, s = float(cos_t[theta_bin]), float(sin_t[theta_bin])
+
+        # the unused pixels in this bin, ordered along the line
+        candidates = np.flatnonzero(unused)
+        distance = xs[candidates] * c + ys[candidates] * s - rho
+        on_line = candidates[np.abs(distance) <= rho_resolution / 2 + 0.5]
+        if len(on_line) < threshold:
+            continue
+        along = ys[on_line] * c - xs[on_line] * s
+        order = np.argsort(along)
+        on_line, along = on_line[order], along[order]
+
+        splits = np.flatnonzero(np.diff(along) > max_gap) + 1
+        run_starts = np.concatenate(((0,), splits))
+        run_ends = np.concatenate((splits, (len(on_line),)))
+        for start, end in zip(run_starts.tolist(), run_ends.tolist()):
+            t1, t2 = float(along[start]), float(along[end - 1])
+            if t2 - t1 < min_length:
+                continue
+            unused[on_line[start:end]] = False
+            segments.append(LineSegment(
+                Point(rho * c - t1 * s, rho * s + t1 * c), Point(rho * c - t2 * s, rho * s + t2 * c),
+                rho, float(thetas[theta_bin]), end - start,
+            ))
+
+    segments.sort(key=lambda segment: -segment.votes)
+    return segments[:max_lines]
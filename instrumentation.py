@@ -0,0 +1,233 @@
+"""
+Opt-in timing of every call eyepy makes into `eye` (and its ctypes `lib`).
+
+While disabled, nothing is wrapped, so there is no overhead.
+"""
+
+from __future__ import annotations
+import sys
+import threading
+import time
+from types import FunctionType, ModuleType
+from typing import Any, Callable, NamedTuple, Optional
+
+from eyepy.internal_utils import original_attribute, patch_attribute, set_original_attribute, unpatch_attributes
+
+
+_N_BUCKETS = 32
+
+def _bucket_upper_ns(bucket: int) -> int:
+    """
+    Bucket `0` holds latencies below 1024ns, and bucket `b` latencies below `1024 * 2**b` ns.
+    """
+    return 1024 << bucket
+
+class CallStats(NamedTuple):
+    name: str
+    """e.g. `"eye.MOTORDrive"` or `"lib.LCDImage"`"""
+
+    calls: int
+    total_ns: int
+    min_ns: int
+    max_ns: int
+
+    histogram: tuple[int, ...]
+    """call counts per latency bucket; bucket `b` holds calls taking under `1024 * 2**b` ns (and at least half that, for `b > 0`)"""
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.calls if self.calls else 0
+
+    def percentile_ns(self, percentile: float) -> int:
+        """
+        Returns an upper bound on the :param:`percentile` (0 to 100) latency, from the histogram.
+        """
+        threshold = self.calls * percentile / 100
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= threshold and count > 0:
+                return min(_bucket_upper_ns(bucket), self.max_ns)
+        return self.max_ns
+
+class _Recorder:
+    name: str
+    calls: int
+    total_ns: int
+    min_ns: int
+    max_ns: int
+    histogram: list[int]
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.histogram = [0] * _N_BUCKETS
+
+    def record(self, elapsed_ns: int):
+        bucket = min((elapsed_ns >> 10).bit_length(), _N_BUCKETS - 1)
+        with self._lock:
+            if self.calls == 0 or elapsed_ns < self.min_ns:
+                self.min_ns = elapsed_ns
+            if elapsed_ns > self.max_ns:
+                self.max_ns = elapsed_ns
+            self.calls += 1
+            self.total_ns += elapsed_ns
+            self.histogram[bucket] += 1
+
+    def stats(self) -> CallStats:
+        with self._lock:
+            return CallStats(self.name, self.calls, self.total_ns, self.min_ns, self.max_ns, tuple(self.histogram))
+
+class _InstrumentedFunction:
+    """
+    Wraps an `eye` function or ctypes foreign function, forwarding attributes
+    such as `argtypes` and `restype` to the wrapped function.
+    """
+    def __init__(self, func: Callable[..., Any], recorder: _Recorder):
+        object.__setattr__(self, "_func", func)
+        object.__setattr__(self, "_recorder", recorder)
+
+    def __call__(self, *args: Any) -> Any:
+        start = time.perf_counter_ns()
+        try:
+            return self._func(*args)
+        finally:
+            self._recorder.record(time.perf_counter_ns() - start)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._func, name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._func, name, value)
+
+_recorders: dict[str, _Recorder] = {}
+
+_enabled: bool = False
+
+_OWNER = object()
+"""the owner of the patches applied by :func:`enable_instrumentation`"""
+
+def _recorder(name: str) -> _Recorder:
+    if name not in _recorders:
+        _recorders[name] = _Recorder(name)
+    return _recorders[name]
+
+def _instrumenting(name: str) -> Callable[[Any], _InstrumentedFunction]:
+    return lambda func: _InstrumentedFunction(func, _recorder(name))
+
+def _patch(target: Any, attribute: str, name: str):
+    # innermost, so only the call into `eye` is timed, even if e.g. a :class:`SensorRecorder` also wraps it
+    patch_attribute(_OWNER, target, attribute, _instrumenting(name), innermost=True)
+
+def _eye_functions(eye: ModuleType) -> dict[str, Callable[..., Any]]:
+    """
+    Returns the python functions provided by `eye`, excluding those from ctypes (which `eye` star-imports).
+    """
+    functions = {}
+    for name in list(vars(eye)):
+        value = original_attribute(eye, name)
+        if not name.startswith("_") and isinstance(value, FunctionType) and not value.__module__.startswith("ctypes"):
+            functions[name] = value
+    return functions
+
+def _eyepy_modules() -> list[ModuleType]:
+    return [
+        module for module_name, module in list(sys.modules.items())
+        if module is not None and module_name.startswith(f"{__package__}.") and module_name != __name__
+    ]
+
+def _is_foreign_function(value: Any) -> bool:
+    return callable(value) and hasattr(value, "argtypes") and not isinstance(value, _InstrumentedFunction)
+
+def enable_instrumentation():
+    """
+    Starts recording every call into `eye` from eyepy, and every call of a `lib` function
+    which has already been looked up (i.e. used or configured by an eyepy module).
+
+    eyepy modules imported while enabled are also instrumented, since they import the
+    wrapped `eye` functions. Functions bound before enabling (e.g. by the capture thread
+    of a running :class:`CAMCapture`) are not instrumented.
+    Does nothing if already enabled.
+    """
+    global _enabled
+    if _enabled:
+        return
+
+    import eye
+    originals = _eye_functions(eye)
+    for name in originals:
+        _patch(eye, name, f"eye.{name}")
+
+    # eyepy modules bind the functions at import (`from eye import X as _X`), so also patch those bindings
+    for module in _eyepy_modules():
+        for global_name in list(vars(module)):
+            eye_name = global_name[1:] if global_name.startswith("_") else global_name
+            if eye_name in originals and original_attribute(module, global_name) is originals[eye_name]:
+                _patch(module, global_name, f"eye.{eye_name}")
+
+    lib = eye.lib
+    for name in list(vars(lib)):
+        if not name.startswith("_") and _is_foreign_function(original_attribute(lib, name)):
+            _patch(lib, name, f"lib.{name}")
+
+    _enabled = True
+
+def disable_instrumentation():
+    """
+    Stops recording and removes all wrappers; recorded stats are kept.
+    Does nothing if not enabled.
+    """
+    global _enabled
+    unpatch_attributes(_OWNER)
+
+    # eyepy modules imported while enabled bound the wrappers themselves
+    for module in _eyepy_modules():
+        for global_name in list(vars(module)):
+            value = original_attribute(module, global_name)
+            if isinstance(value, _InstrumentedFunction):
+                set_original_attribute(module, global_name, value._func)
+
+    _enabled = False
+
+def instrumentation_enabled() -> bool:
+    return _enabled
+
+def reset_instrumentation():
+    """
+    Clears all recorded stats.
+    """
+    for recorder in _recorders.values():
+        recorder.reset()
+
+def instrumentation_snapshot() -> dict[str, CallStats]:
+    """
+    Returns the stats of every instrumented function which has been called at least once.
+    """
+    stats = (recorder.stats() for recorder in list(_recorders.values()))
+    return {s.name: s for s in stats if s.calls > 0}
+
+def instrumentation_report(*, sort_by: str = "total_ns", limit: Optional[int] = None) -> str:
+    """
+    Returns a text table of :func:`instrumentation_snapshot`.
+
+    :param:`sort_by` a :class:`CallStats` field or property to sort by (descending), e.g. `"calls"` or `"mean_ns"`
+    :param:`limit` the maximum number of rows
+    """
+    stats = sorted(instrumentation_snapshot().values(), key=lambda s: getattr(s, sort_by), reverse=True)
+    if limit is not None:
+        stats = stats[:limit]
+
+    lines = [f"{'function':<28} {'calls':>9} {'total ms':>10} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'max us':>9}"]
+    for s in stats:
+        lines.append(
+            f"{s.name:<28} {s.calls:>9} {s.total_ns / 1e6:>10.2f} {s.mean_ns / 1e3:>9.2f} "
+            f"{s.percentile_ns(50) / 1e3:>9.2f} {s.percentile_ns(99) / 1e3:>9.2f} {s.max_ns / 1e3:>9.2f}"
+        )
+    return "\n".join(lines)
@@ -1,10 +1,110 @@
 from __future__ import annotations
-from typing import Callable, TypeVar
+import threading
+from typing import Any, Callable, Iterable, NamedTuple, TypeVar
 
 
 T = TypeVar("T")
 R = TypeVar("R")
 def repeat_func(inputs: T | list[T], func: Callable[[T], R], ok_predicate: Callable[[R], bool]) -> bool:
-    input_list: list[T] = inputs if isinstance(inputs, list) else [inputs]
-    return_codes = [func(input) for input in input_list]
-    return all(ok_predicate(code) for code in return_codes)
+    if not isinstance(inputs, list):
+        # common single-input case; avoid building any intermediate lists
+        return ok_predicate(func(inputs))
+    return_codes = [func(input) for input in inputs]
+    return all(map(ok_predicate, return_codes))
+
+def validate_ports(kind: str, ports: Iterable[int], valid_ports: tuple[int, ...]):
+    """
+    Throws a `ValueError` if any of :param:`ports` (e.g. the keys of a mapping) is not one of :param:`valid_ports`.
+    """
+    for port in ports:
+        if port not in valid_ports:
+            raise ValueError(f"{kind} port out of bounds; expected one of {list(valid_ports)} but got: {port}")
+
+
+eye_lock = threading.RLock()
+"""
+Held by eyepy's background threads (of a :class:`SensorScheduler` or :class:`CAMCapture`) around their
+calls into `eye`, which isn't known to be thread safe. While one is running, hold it around calls into
+`eye` made from any other thread too, e.g. `with eyepy.eye_lock: eyepy.MOTORDrive(1, 50)`.
+"""
+
+
+# patching
+# instrumentation, sensor recording/replay and the LCD shadow all replace attributes (mostly the
+# `eye` bindings of eyepy modules), possibly the same ones at once, and may be undone in any order
+
+class _PatchLayer(NamedTuple):
+    owner: object
+    wrap: Callable[[Any], Any]
+    innermost: bool
+
+class _PatchedAttribute:
+    original: Any
+    layers: list[_PatchLayer]
+
+    def __init__(self, original: Any):
+        self.original = original
+        self.layers = []
+
+_patched: dict[tuple[int, str], tuple[Any, _PatchedAttribute]] = {}
+"""`(id(target), attribute)` => `(target, patches)`"""
+
+_patch_lock = threading.Lock()
+
+def _apply(target: Any, attribute: str, patched: _PatchedAttribute):
+    value = patched.original
+    layers = [layer for layer in patched.layers if layer.innermost] + [layer for layer in patched.layers if not layer.innermost]
+    for layer in layers:
+        value = layer.wrap(value)
+    setattr(target, attribute, value)
+
+def patch_attribute(owner: object, target: Any, attribute: str, wrap: Callable[[Any], Any], *, innermost: bool = False):
+    """
+    Replaces `target.attribute` with `wrap(inner)`, where `inner` is the value the attribute would have without
+    this patch. Patches are layered, so :func:`unpatch_attributes` can undo them in any order: the attribute
+    is rebuilt from its original value and the remaining layers, each applied in the order they were added.
+
+    :param:`innermost` if `True`, applied before (so wrapped by) every layer which isn't, e.g. for timing
+    the original function regardless of what else is patched
+    """
+    with _patch_lock:
+        key = (id(target), attribute)
+        if key not in _patched:
+            _patched[key] = (target, _PatchedAttribute(getattr(target, attribute)))
+        _, patched = _patched[key]
+        patched.layers.append(_PatchLayer(owner, wrap, innermost))
+        _apply(target, attribute, patched)
+
+def unpatch_attributes(owner: object):
+    """
+    Removes every patch applied by :param:`owner`.
+    """
+    with _patch_lock:
+        for key, (target, patched) in list(_patched.items()):
+            remaining = [layer for layer in patched.layers if layer.owner is not owner]
+            if len(remaining) == len(patched.layers):
+                continue
+            patched.layers = remaining
+            _apply(target, key[1], patched)
+            if not remaining:
+                del _patched[key]
+
+def original_attribute(target: Any, attribute: str) -> Any:
+    """
+    Returns the value of `target.attribute` without any patches.
+    """
+    with _patch_lock:
+        entry = _patched.get((id(target), attribute))
+        return getattr(target, attribute) if entry is None else entry[1].original
+
+def set_original_attribute(target: Any, attribute: str, value: Any):
+    """
+    Sets the value of `target.attribute` without any patches, keeping any patches applied on top of it.
+    """
+    with _patch_lock:
+        entry = _patched.get((id(target), attribute))
+        if entry is None:
+            setattr(target, attribute, value)
+            return
+        entry[1].original = value
+        _apply(target, attribute, entry[1])
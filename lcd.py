@@ -1,18 +1,21 @@
 from __future__ import annotations
+from collections.abc import Sequence
 import ctypes
 from enum import Enum
 import itertools
 import math
 from typing import Any, Callable, NamedTuple, Optional, TypeVar
 
+import numpy as np
+
 try:
-    from typing import Final, Literal
+    from typing import Final, Literal, TypeAlias
 except ImportError:
-    from typing_extensions import Final, Literal
+    from typing_extensions import Final, Literal, TypeAlias
 
 from eye import lib
 
-from eyepy.drawing import Image, ImageResolution, Colour, IntPoint, IntPointLike, Point, PointLike, colour_to_str, make_coord_map
+from eyepy.drawing import Image, ImageResolution, ImageView, Colour, IntPoint, IntPointLike, Point, PointLike, PointArray, RoundedAffine2D, colour_to_str, make_coord_map
 
 
 def _LCD_OK(return_code: int) -> bool:
@@ -158,7 +161,7 @@ def LCDGetSize() -> LCDSize:
 
     return LCDSize(width=width.value, height=height.value)
 
-def lcd_make_coord_map(p2: PointLike, p1: PointLike = Point(0, 0)) -> Callable[[Point], IntPoint]:
+def lcd_make_coord_map(p2: PointLike, p1: PointLike = Point(0, 0)) -> RoundedAffine2D:
     """
     Produces a function flipping the y axis, mapping :param:`p2` to the
     top right of the screen, and :param:`p1` to the bottom left.
@@ -169,22 +172,74 @@ def lcd_make_coord_map(p2: PointLike, p1: PointLike = Point(0, 0)) -> Callable[[
     bottom_left = Point(0, display_max_y - 1)
     top_right = Point(display_max_x - 1, 0)
 
-    f = make_coord_map((p1, p2), (bottom_left, top_right))
-    f_int: Callable[[Point], IntPoint] = lambda p: f(p).round()
-
-    return f_int
+    return make_coord_map((p1, p2), (bottom_left, top_right)).rounded()
 
 def lcd_default_point_map(p: Point) -> IntPoint:
     return p.round()
 
-lcd_default_world_coord_map = lcd_make_coord_map((2000, 2000))
+lcd_default_world_coord_map: RoundedAffine2D
+"""
+Maps (0, 0) to (2000, 2000) onto the whole screen; see :func:`lcd_make_coord_map`.
+Created on first access, since it queries the LCD size.
+"""
+
+def __getattr__(name: str):
+    if name == "lcd_default_world_coord_map":
+        global lcd_default_world_coord_map
+        lcd_default_world_coord_map = lcd_make_coord_map((2000, 2000))
+        return lcd_default_world_coord_map
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | {"lcd_default_world_coord_map"})
 
 _lcd_point_map: Callable[[Point], IntPoint] = lcd_default_point_map
 
 def LCDSetPointMap(f: Callable[[Point], IntPoint]):
+    """
+    If :param:`f` also has an `apply_many` method, taking an `(N, 2)` array of points and returning
+    the `(N, 2)` array of mapped (integer) points, it will be used to map all the points passed to
+    the batched drawing functions (e.g. :func:`LCDPixels`) in one step; see :meth:`Affine2D.rounded`.
+    """
     global _lcd_point_map
     _lcd_point_map = f
 
+PointsLike: TypeAlias = "np.ndarray | PointArray | Sequence[PointLike]"
+ColoursLike: TypeAlias = "Colour | np.ndarray | Sequence[Colour]"
+
+def _map_points(points: PointsLike, point_map_override: Callable[[Point], IntPoint] | None) -> np.ndarray:
+    """
+    Maps all of :param:`points` through the active point map (or :param:`point_map_override`),
+    returning an `(N, 2)` integer array.
+    """
+    array = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+    coord_map = _lcd_point_map
+    if point_map_override is not None:
+        coord_map = point_map_override
+
+    if coord_map is lcd_default_point_map:
+        return np.rint(array).astype(np.int64)
+
+    apply_many: Callable[[np.ndarray], np.ndarray] | None = getattr(coord_map, "apply_many", None)
+    if apply_many is not None:
+        return np.asarray(apply_many(array)).astype(np.int64, copy=False).reshape(-1, 2)
+
+    # fall back to mapping each point individually
+    return np.array([coord_map(Point(x, y)) for x, y in array.tolist()], dtype=np.int64).reshape(-1, 2)
+
+def _colour_list(cols: ColoursLike, n: int, *, validate: bool) -> list[int]:
+    """
+    Broadcasts :param:`cols` to :param:`n` colours.
+    If :param:`validate` is `True`, throws a `ValueError` if a colour is invalid.
+    """
+    array = np.broadcast_to(np.asarray(cols, dtype=np.int64), (n,))
+    if validate:
+        invalid = (array < 0x000000) | (array > 0xFFFFFF)
+        if invalid.any():
+            _validate_colours(int(array[invalid][0]))
+    return array.tolist()
+
 from eye import LCDPixel as _LCDPixel
 def LCDPixel(pixel: PointLike, col: Colour, *, validate_col: bool = True, point_map_override: Callable[[Point], IntPoint] | None = None) -> bool:
     if validate_col: _validate_colours(col)
@@ -305,6 +360,80 @@ def LCDCircle(centre: PointLike, size: int, col: Colour, *, fill: bool = True, v
     return_code = _LCDCircle(mapped_centre.x, mapped_centre.y, size, col, int(fill))
     return _LCD_OK(return_code)
 
+# batched drawing
+
+def LCDPixels(pixels: PointsLike, cols: ColoursLike, *, validate_cols: bool = True, point_map_override: Callable[[Point], IntPoint] | None = None) -> bool:
+    """
+    Batched :func:`LCDPixel`.
+    :param:`pixels` a sequence of points or an `(N, 2)` array
+    :param:`cols` a colour for every pixel, or a single colour for all of them
+
+    Returns `True` if all ok.
+    """
+    mapped_points = _map_points(pixels, point_map_override).tolist()
+    col_list = _colour_list(cols, len(mapped_points), validate=validate_cols)
+
+    draw = _LCDPixel
+    return_codes = [draw(x, y, col) for (x, y), col in zip(mapped_points, col_list)]
+    return all(map(_LCD_OK, return_codes))
+
+def LCDLines(starts: PointsLike, ends: PointsLike, cols: ColoursLike, *, validate_cols: bool = True, point_map_override: Callable[[Point], IntPoint] | None = None) -> bool:
+    """
+    Batched :func:`LCDLine`, drawing a line from each point in :param:`starts` to the corresponding point in :param:`ends`.
+    :param:`cols` a colour for every line, or a single colour for all of them
+
+    Returns `True` if all ok.
+    """
+    mapped_starts = _map_points(starts, point_map_override)
+    mapped_ends = _map_points(ends, point_map_override)
+    if len(mapped_starts) != len(mapped_ends):
+        raise ValueError(f"expected the same number of start and end points but got {len(mapped_starts)} and {len(mapped_ends)}")
+
+    segments = np.hstack((mapped_starts, mapped_ends)).tolist()
+    col_list = _colour_list(cols, len(segments), validate=validate_cols)
+
+    draw = _LCDLine
+    return_codes = [draw(x1, y1, x2, y2, col) for (x1, y1, x2, y2), col in zip(segments, col_list)]
+    return all(map(_LCD_OK, return_codes))
+
+def LCDPolyline(points: PointsLike, col: Colour, *, closed: bool = False, validate_col: bool = True, point_map_override: Callable[[Point], IntPoint] | None = None) -> bool:
+    """
+    Draws lines joining consecutive points.
+    :param:`closed` if `True`, also joins the last point to the first
+
+    Returns `True` if all ok.
+    """
+    if validate_col: _validate_colours(col)
+    mapped_points = _map_points(points, point_map_override)
+    if closed and len(mapped_points) > 2:
+        mapped_points = np.vstack((mapped_points, mapped_points[:1]))
+
+    segments = np.hstack((mapped_points[:-1], mapped_points[1:])).tolist()
+
+    draw = _LCDLine
+    return_codes = [draw(x1, y1, x2, y2, col) for x1, y1, x2, y2 in segments]
+    return all(map(_LCD_OK, return_codes))
+
+def LCDAreas(p1s: PointsLike, p2s: PointsLike, cols: ColoursLike, *, fill: bool = True, validate_cols: bool = True, point_map_override: Callable[[Point], IntPoint] | None = None) -> bool:
+    """
+    Batched :func:`LCDArea`, drawing an area between each point in :param:`p1s` and the corresponding point in :param:`p2s`.
+    :param:`cols` a colour for every area, or a single colour for all of them
+
+    Returns `True` if all ok.
+    """
+    mapped_p1s = _map_points(p1s, point_map_override)
+    mapped_p2s = _map_points(p2s, point_map_override)
+    if len(mapped_p1s) != len(mapped_p2s):
+        raise ValueError(f"expected the same number of p1 and p2 points but got {len(mapped_p1s)} and {len(mapped_p2s)}")
+
+    areas = np.hstack((mapped_p1s, mapped_p2s)).tolist()
+    col_list = _colour_list(cols, len(areas), validate=validate_cols)
+
+    draw = _LCDArea
+    fill_int = int(fill)
+    return_codes = [draw(x1, y1, x2, y2, col, fill_int) for (x1, y1, x2, y2), col in zip(areas, col_list)]
+    return all(map(_LCD_OK, return_codes))
+
 _image_position: IntPoint = IntPoint(0, 0)
 
 from eye import LCDImageSize as _LCDImageSize
@@ -336,7 +465,11 @@ def LCDImageStart(start: IntPointLike, *, width: int, height: int) -> bool:
     return True
 
 R = TypeVar("R")
-def _lcd_image_print_base(image: Image, *, print_func: Callable[[ctypes.Array[ctypes.c_byte]], R], ok_predicate: Callable[[R], bool], start: Optional[IntPointLike]) -> bool:
+def _lcd_image_print_base(image: Image | ImageView, *, print_func: Callable[[ctypes.Array[ctypes.c_byte]], R], ok_predicate: Callable[[R], bool], start: Optional[IntPointLike]) -> bool:
+    if isinstance(image, ImageView):
+        # `eye` needs a contiguous buffer
+        image = image.materialise()
+
     default_position = _image_position
     if not LCDImageStart(
         start if start is not None else default_position,
@@ -354,7 +487,7 @@ def _lcd_image_print_base(image: Image, *, print_func: Callable[[ctypes.Array[ct
     return ok_predicate(return_code)
 
 # `eye.LCDImage` simply wraps it, so we directly use `lib.LCDImage`
-def LCDImage(image: Image, *, start: Optional[IntPointLike] = None) -> bool:
+def LCDImage(image: Image | ImageView, *, start: Optional[IntPointLike] = None) -> bool:
     """
     Returns `False` if the image is not the correct type (e.g. is a gray image),
     or if the internal calls to `LCDImageStart` or `LCDImage` return an error value.
@@ -368,7 +501,7 @@ def LCDImage(image: Image, *, start: Optional[IntPointLike] = None) -> bool:
     return _lcd_image_print_base(image, print_func=lib.LCDImage, ok_predicate=_LCD_OK, start=start)
 
 # `eye.LCDImageGray` simply wraps it, so we directly use `lib.LCDImageGray`
-def LCDImageGray(image: Image, *, start: Optional[IntPointLike] = None) -> bool:
+def LCDImageGray(image: Image | ImageView, *, start: Optional[IntPointLike] = None) -> bool:
     """
     Returns `False` if the image is not the correct type (e.g. is a colour image),
     or if the internal calls to `LCDImageStart` or `LCDImageGray` return an error value.
@@ -382,7 +515,7 @@ def LCDImageGray(image: Image, *, start: Optional[IntPointLike] = None) -> bool:
     return _lcd_image_print_base(image, print_func=lib.LCDImageGray, ok_predicate=_LCD_OK, start=start)
 
 # `eye.LCDImageBinary` simply wraps it, so we directly use `lib.LCDImageBinary`
-def LCDImageBinary(image: Image, *, start: Optional[IntPointLike] = None) -> bool:
+def LCDImageBinary(image: Image | ImageView, *, start: Optional[IntPointLike] = None) -> bool:
     """
     Expects a gray image using only 0 (white) and 1 (black).
     If :param:`validate` is `True`, will return `False` if the image is not
@@ -407,3 +540,7 @@ def LCDRefresh() -> bool:
     return _LCD_OK(return_code)
 
 # TODO LCD modes?
+
+
+# every public name, as a star import without `__all__` would export, plus the lazily created ones
+__all__ = sorted({name for name in globals() if not name.startswith("_")} | {"lcd_default_world_coord_map"})
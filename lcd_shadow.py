@@ -0,0 +1,252 @@
+"""
+A copy of the LCD kept in Python, so drawing can be diffed and only the changed parts sent.
+"""
+
+from __future__ import annotations
+import ctypes
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from eyepy import lcd as _lcd
+from eyepy.drawing import BLACK, CAM1MP, CAM5MP, CAMHD, QQVGA, QVGA, VGA, Colour, ImageResolution, colour_to_rgb
+from eyepy.image_ops import draw_circle, draw_image, draw_line, draw_rect, runs
+from eyepy.internal_utils import patch_attribute, unpatch_attributes
+
+
+_RESOLUTIONS_BY_CODE: dict[int, ImageResolution] = {resolution._code: resolution for resolution in (QQVGA, QVGA, VGA, CAM1MP, CAMHD, CAM5MP)}
+
+_BOUND_AS: dict[str, str] = {
+    "_LCDImageStart": "_image_start",
+    "LCDImage": "_image",
+    "_LCDRefresh": "_refresh",
+    "_LCDClear": "_clear",
+    "_LCDGetPixel": "_get_pixel",
+}
+"""patched attribute => the :class:`LCDShadow` attribute bound to the function beneath the patch"""
+
+_active: Optional[LCDShadow] = None
+
+class LCDShadow:
+    """
+    A shadow framebuffer for the LCD. While running, everything drawn through eyepy's `LCDPixel`, `LCDLine`,
+    `LCDArea`, `LCDCircle` and `LCDImage*` functions (including the batched versions) is only drawn into
+    :attr:`frame`, `LCDGetPixel` is answered from it, and `LCDRefresh` calls :meth:`flush`, which sends just
+    the tiles that differ from what the LCD already shows. Redrawing a whole dashboard every frame then
+    costs only as much LCD traffic as actually changed.
+
+    Text (`LCDPrintf`, `LCDSetPrintf`, menus) is still drawn directly, so isn't in :attr:`frame`. Each changed
+    tile is resent whole, so flushing erases any text inside it, e.g. a label printed next to a value which is
+    redrawn every frame; print such text after `LCDRefresh` (every frame), or keep it clear of the tiles being
+    drawn on. Call :meth:`invalidate` to resend everything after text overwrites drawn areas.
+    `LCDClear` clears both the LCD and :attr:`frame`.
+
+    Lines and circles are rasterised in Python, so may differ by a pixel from those drawn by the LCD itself.
+    """
+    frame: np.ndarray
+    """`uint8`, shape `(HEIGHT, WIDTH, 3)`: what has been drawn"""
+
+    tile_size: int
+    """px; changes are found and sent in squares of this size"""
+
+    clear_colour: Colour
+    """the colour `LCDClear` clears to"""
+
+    tiles_sent: int
+    """the total number of tiles sent by :meth:`flush`"""
+
+    _drawn: np.ndarray
+    """:attr:`frame`, padded to whole tiles"""
+
+    _sent: np.ndarray
+    """what the LCD shows, where known; padded as :attr:`_drawn`"""
+
+    _stale: np.ndarray
+    """`bool`, per tile: whether the LCD may differ from :attr:`_sent` (e.g. before the first flush)"""
+
+    _image_area: tuple[int, int, int, int]
+    """`x, y, width, height` set for the next image"""
+
+    def __init__(self, *, tile_size: int = 16, clear_colour: Colour = BLACK):
+        if tile_size < 1:
+            raise ValueError(f"tile size must be positive but got {tile_size}")
+        width, height = _lcd.LCDGetSize()
+        self.tile_size = tile_size
+        self.clear_colour = clear_colour
+        tile_rows, tile_cols = -(-height // tile_size), -(-width // tile_size)
+        # padded to whole tiles, so they can be compared by reshaping
+        self._drawn = np.zeros((tile_rows * tile_size, tile_cols * tile_size, 3), dtype=np.uint8)
+        self._drawn[...] = colour_to_rgb(clear_colour)
+        self.frame = self._drawn[:height, :width]
+        self._sent = self._drawn.copy()
+        self._stale = np.ones((tile_rows, tile_cols), dtype=bool)
+        self._image_area = (0, 0, 0, 0)
+        self.tiles_sent = 0
+        self._bind_lcd()
+
+    def _bind_lcd(self):
+        """
+        Binds the LCD functions, for flushing; must not be called while shadowing, during which the functions
+        beneath the shadow's patches (e.g. instrumented ones) are bound instead.
+        """
+        self._image_start = _lcd._LCDImageStart
+        self._image = _lcd.lib.LCDImage
+        self._refresh = _lcd._LCDRefresh
+        self._clear = _lcd._LCDClear
+        self._get_pixel = _lcd._LCDGetPixel
+
+    def __enter__(self) -> LCDShadow:
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return _active is self
+
+    def start(self):
+        """
+        Throws a `RuntimeError` if another shadow is running; does nothing if already running.
+        """
+        global _active
+        if self.running:
+            return
+        if _active is not None:
+            raise RuntimeError("an LCD shadow is already running")
+
+        def image(channels: int, convert: Callable[[np.ndarray], np.ndarray]) -> Callable[[Any], int]:
+            def draw(buffer: Any) -> int:
+                return self._draw_image(buffer, channels, convert)
+            return draw
+
+        lib = _lcd.lib
+        replacements: dict[tuple[Any, str], Callable[..., Any]] = {
+            (_lcd, "_LCDPixel"): self._draw_pixel,
+            (_lcd, "_LCDGetPixel"): self._read_pixel,
+            (_lcd, "_LCDLine"): lambda x1, y1, x2, y2, col: self._draw(draw_line, x1, y1, x2, y2, colour_to_rgb(col)),
+            (_lcd, "_LCDArea"): lambda x1, y1, x2, y2, col, fill: self._draw(draw_rect, x1, y1, x2, y2, colour_to_rgb(col), fill=bool(fill)),
+            (_lcd, "_LCDCircle"): lambda x, y, size, col, fill: self._draw(draw_circle, x, y, size, colour_to_rgb(col), fill=bool(fill)),
+            (_lcd, "_LCDClear"): self._clear_both,
+            (_lcd, "_LCDImageStart"): self._set_image_start,
+            (_lcd, "_LCDImageSize"): self._set_image_size,
+            (_lcd, "_LCDRefresh"): lambda: 0 if self.flush() else 1,
+            (lib, "LCDImage"): image(3, lambda rgb: rgb),
+            (lib, "LCDImageGray"): image(1, lambda gray: np.repeat(gray, 3, axis=2)),
+            # as the LCD: 0 => 255 (white), 1 => 0 (black)
+            (lib, "LCDImageBinary"): image(1, lambda binary: np.repeat(binary - np.uint8(1), 3, axis=2)),
+        }
+        for (owner, attribute), replacement in replacements.items():
+            patch_attribute(self, owner, attribute, self._replacing(attribute, replacement))
+        _active = self
+
+    def stop(self):
+        """
+        Stops shadowing, without flushing; later drawing goes directly to the LCD again.
+        """
+        global _active
+        if not self.running:
+            return
+        unpatch_attributes(self)
+        self._bind_lcd()
+        _active = None
+
+    def _replacing(self, attribute: str, replacement: Callable[..., Any]) -> Callable[[Any], Callable[..., Any]]:
+        def wrap(inner: Any) -> Callable[..., Any]:
+            # called again whenever the patches beneath change, e.g. when instrumentation is enabled or disabled
+            if attribute in _BOUND_AS:
+                setattr(self, _BOUND_AS[attribute], inner)
+            return replacement
+        return wrap
+
+    def invalidate(self):
+        """
+        Marks the whole LCD as unknown, so the next :meth:`flush` sends everything.
+        """
+        self._stale[...] = True
+
+    def dirty_tiles(self) -> np.ndarray:
+        """
+        Returns a `bool` array with an element per tile (row by row), marking those the next :meth:`flush` will send.
+        """
+        size = self.tile_size
+        tile_rows, tile_cols = self._stale.shape
+        # reducing over the rows of each tile first, then its columns (and channels), is much faster than `any(axis=2)`
+        changed = (self._drawn != self._sent).reshape(tile_rows, size, -1).any(axis=1)
+        return changed.reshape(tile_rows, tile_cols, -1).any(axis=2) | self._stale
+
+    def flush(self) -> bool:
+        """
+        Sends every changed tile to the LCD (joining neighbouring tiles in a row into one image), then refreshes it.
+        Text drawn directly on the LCD inside a changed tile is overwritten.
+
+        Returns `True` if ok.
+        """
+        dirty = self.dirty_tiles()
+        height, width = self.frame.shape[:2]
+        size = self.tile_size
+        starts, ends, _, row_length = runs(dirty.view(np.uint8))
+        ok = True
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            row, col = divmod(start, row_length)
+            x, y = col * size, row * size
+            w, h = min((end - start) * size, width - x), min(size, height - y)
+            region = np.ascontiguousarray(self.frame[y:y + h, x:x + w])
+            buffer = (ctypes.c_byte * region.nbytes).from_buffer(region)
+            if not (_lcd._LCD_OK(self._image_start(x, y, w, h)) and _lcd._LCD_OK(self._image(buffer))):
+                ok = False
+                continue
+            self._sent[y:y + h, x:x + w] = region
+            self._stale[row, col:col + end - start] = False
+            self.tiles_sent += end - start
+
+        if len(starts):
+            # leave the LCD's image area as eyepy last set it
+            self._image_start(*self._image_area)
+        return _lcd._LCD_OK(self._refresh()) and ok
+
+    def _in_bounds(self, x: int, y: int) -> bool:
+        height, width = self.frame.shape[:2]
+        return 0 <= x < width and 0 <= y < height
+
+    def _draw_pixel(self, x: int, y: int, col: Colour) -> int:
+        if self._in_bounds(x, y):
+            self.frame[y, x] = colour_to_rgb(col)
+        return 0
+
+    def _read_pixel(self, x: int, y: int) -> Colour:
+        if not self._in_bounds(x, y):
+            return self._get_pixel(x, y)
+        r, g, b = self.frame[y, x].tolist()
+        return (r << 16) | (g << 8) | b
+
+    def _draw(self, draw: Callable[..., None], *args: Any, **kwargs: Any) -> int:
+        draw(self.frame, *args, **kwargs)
+        return 0
+
+    def _clear_both(self) -> int:
+        return_code = self._clear()
+        if _lcd._LCD_OK(return_code):
+            self._drawn[...] = colour_to_rgb(self.clear_colour)
+            self._sent[...] = self._drawn
+            self._stale[...] = False
+        return return_code
+
+    def _set_image_start(self, x: int, y: int, width: int, height: int) -> int:
+        self._image_area = (x, y, width, height)
+        return 0
+
+    def _set_image_size(self, resolution_code: int) -> int:
+        resolution = _RESOLUTIONS_BY_CODE.get(resolution_code)
+        if resolution is None:
+            return 1
+        x, y, _, _ = self._image_area
+        self._image_area = (x, y, resolution.WIDTH, resolution.HEIGHT)
+        return 0
+
+    def _draw_image(self, buffer: Any, channels: int, convert: Callable[[np.ndarray], np.ndarray]) -> int:
+        x, y, width, height = self._image_area
+        pixels = np.frombuffer(buffer, dtype=np.uint8, count=width * height * channels).reshape(height, width, channels)
+        draw_image(self.frame, x, y, pixels, convert)
+        return 0
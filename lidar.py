@@ -1,37 +1,55 @@
 from __future__ import annotations
+import functools
+import math
 from typing import NamedTuple, Optional
 
+import numpy as np
+
+from eyepy.pose import Pose2D
+from eyepy.v_omega import VWPosition
+
 
 _lidar_range: int = 360
 _lidar_tilt: int = 0
 _lidar_n_points: int = 360
 
 from eye import LIDARGet as _LIDARGet
-def LIDARGet(*, range: Optional[int] = None, tilt: Optional[int] = None, n_points: Optional[int] = None) -> list[int]:
+def _lidar_get_raw(range: Optional[int], tilt: Optional[int], n_points: Optional[int]) -> tuple[object, LIDARConfig]:
     """
-    Returns distances in mm.
-    Default range is 360 degrees and 360 points, unless modified using :func:`LIDARSet`.
-    Any LIDAR config values passed in will have precedence over the current global LIDAR config.
+    Returns the raw scan from `eye`, and the config it was taken with.
+    Overrides equal to the current config don't cause any calls to `LIDARSet`.
     """
-    if all(value is None for value in [range, tilt, n_points]):
+    current = LIDARGetConfig()
+    config = LIDARConfig(
+        range=current.range if range is None else range,
+        tilt=current.tilt if tilt is None else tilt,
+        n_points=current.n_points if n_points is None else n_points,
+    )
+    if config == current:
         # no config changed; no extra logic needed
-        return list(_LIDARGet())
+        return _LIDARGet(), config
 
-    # save current config
-    old_range = _lidar_range
-    old_tilt = _lidar_tilt
-    old_n_points = _lidar_n_points
-
-    LIDARSet(range=range, tilt=tilt, n_points=n_points)
-    distances: list[int] = list(_LIDARGet())
+    LIDARSet(range=config.range, tilt=config.tilt, n_points=config.n_points)
+    raw_distances = _LIDARGet()
 
     # restore current config
-    LIDARSet(range=old_range, tilt=old_tilt, n_points=old_n_points)
+    LIDARSet(range=current.range, tilt=current.tilt, n_points=current.n_points)
+
+    return raw_distances, config
+
+def LIDARGet(*, range: Optional[int] = None, tilt: Optional[int] = None, n_points: Optional[int] = None) -> list[int]:
+    """
+    Returns distances in mm.
+    Default range is 360 degrees and 360 points, unless modified using :func:`LIDARSet`.
+    Any LIDAR config values passed in will have precedence over the current global LIDAR config.
 
-    return distances
+    See :func:`LIDARGetScan` for a version of this function that outputs a :class:`LIDARScan`.
+    """
+    raw_distances, _ = _lidar_get_raw(range, tilt, n_points)
+    return list(raw_distances)
 
 from eye import LIDARSet as _LIDARSet
-def LIDARSet(*, range: Optional[int] = None, tilt: Optional[int] = None, n_points: Optional[int] = None):
+def LIDARSet(*, range: Optional[int] = None, tilt: Optional[int] = None, n_points: Optional[int] = None, force: bool = False):
     """
     Updates the global LIDAR config.
     Any values set to `None` will keep their current values.
@@ -39,20 +57,26 @@ def LIDARSet(*, range: Optional[int] = None, tilt: Optional[int] = None, n_point
     :param:`range` degrees, centred forwards
     :param:`tilt` degrees, positive downwards
     :param:`n_points` the number of point in and returned by the scan
+    :param:`force` if `False`, the internal call to `LIDARSet` is skipped when the config is unchanged
     """
     global _lidar_range
     global _lidar_tilt
     global _lidar_n_points
 
+    old_config = LIDARGetConfig()
+
     if range is not None:
         _lidar_range = range
-    
+
     if tilt is not None:
         _lidar_tilt = tilt
-    
+
     if n_points is not None:
         _lidar_n_points = n_points
-    
+
+    if not force and LIDARGetConfig() == old_config:
+        return
+
     _LIDARSet(_lidar_range, _lidar_tilt, _lidar_n_points)
 
 class LIDARConfig(NamedTuple):
@@ -67,3 +91,80 @@ class LIDARConfig(NamedTuple):
 
 def LIDARGetConfig() -> LIDARConfig:
     return LIDARConfig(range=_lidar_range, tilt=_lidar_tilt, n_points=_lidar_n_points)
+
+
+# scans
+
+@functools.lru_cache(maxsize=16)
+def _lidar_tables(config: LIDARConfig) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the (read-only) angle (rads) of each point of a scan with :param:`config`,
+    and the cos and sin tables (scaled to project tilted distances onto the horizontal plane).
+    """
+    step = config.range / config.n_points
+    angles = np.radians(config.range / 2 - step * np.arange(config.n_points))
+
+    horizontal = math.cos(math.radians(config.tilt))
+    cos_table = np.cos(angles) * horizontal
+    sin_table = np.sin(angles) * horizontal
+
+    for table in (angles, cos_table, sin_table):
+        table.flags.writeable = False
+    return angles, cos_table, sin_table
+
+class LIDARScan:
+    """
+    The result of a LIDAR scan, holding the distances (mm) as a compact array along with
+    the config the scan was taken with.
+
+    Point `i` is at angle `range / 2 - i * range / n_points` degrees relative to forwards
+    (positive anticlockwise), i.e. the scan runs clockwise, and for the default config
+    point 180 is straight ahead.
+    """
+    distances: np.ndarray
+    """`int32`, mm"""
+
+    config: LIDARConfig
+
+    def __init__(self, distances: np.ndarray, config: LIDARConfig):
+        self.distances = distances
+        self.config = config
+
+    def __len__(self) -> int:
+        return len(self.distances)
+
+    def __getitem__(self, i: int) -> int:
+        return int(self.distances[i])
+
+    def angles(self) -> np.ndarray:
+        """
+        Returns the angle (rads, relative to forwards, positive anticlockwise) of each point.
+        The returned array is cached and read-only.
+        """
+        return _lidar_tables(self.config)[0]
+
+    def to_points(self, pose: Optional[VWPosition | Pose2D] = None) -> np.ndarray:
+        """
+        Converts the scan to an `(N, 2)` array of cartesian points (mm), projected onto the horizontal plane.
+
+        If :param:`pose` is `None` the points are in the LIDAR frame (x forwards, y left);
+        otherwise they are transformed by :param:`pose`, e.g. the robot's pose in the world
+        (composed with the LIDAR's pose on the robot, if it isn't at the robot's centre).
+        """
+        _, cos_table, sin_table = _lidar_tables(self.config)
+        x = self.distances * cos_table
+        y = self.distances * sin_table
+
+        if pose is None:
+            return np.column_stack((x, y))
+
+        if isinstance(pose, VWPosition):
+            pose = Pose2D.from_vw_position(pose)
+        return pose.apply_xy(x, y)
+
+def LIDARGetScan(*, range: Optional[int] = None, tilt: Optional[int] = None, n_points: Optional[int] = None) -> LIDARScan:
+    """
+    As :func:`LIDARGet`, but returns a :class:`LIDARScan`.
+    """
+    raw_distances, config = _lidar_get_raw(range, tilt, n_points)
+    return LIDARScan(np.asarray(raw_distances, dtype=np.int32), config)
@@ -1,14 +1,72 @@
 from __future__ import annotations
+from typing import Callable, Mapping, NamedTuple, Optional, get_args
 
 try:
     from typing import Literal
 except ImportError:
     from typing_extensions import Literal
 
-from eyepy.internal_utils import repeat_func
+from eyepy.internal_utils import repeat_func, validate_ports
 from eyepy.utils import clamp
 
 
+# LAST-VALUE CACHE
+
+class CommandCacheStats(NamedTuple):
+    writes: int
+    """values written by the `...Many` and `...Resync` functions"""
+
+    skipped: int
+    """values not written by the `...Many` functions, because they were unchanged"""
+
+class _CommandCache:
+    """
+    The last value successfully written to each port, kept up to date by every write.
+    A failed write forgets the port's value, so it is always rewritten next time.
+    """
+    values: dict[int, int]
+    writes: int
+    skipped: int
+
+    def __init__(self):
+        self.values = {}
+        self.writes = 0
+        self.skipped = 0
+
+    def record(self, port: int, value: int, ok: bool):
+        if ok:
+            self.values[port] = value
+        else:
+            self.values.pop(port, None)
+
+    def forget(self, ports: int | list[int]):
+        for port in ports if isinstance(ports, list) else [ports]:
+            self.values.pop(port, None)
+
+    def write_many(self, values: Mapping[int, int], write: Callable[[int, int], int], ok_predicate: Callable[[int], bool], force: bool) -> bool:
+        all_ok = True
+        for port, value in values.items():
+            if not force and self.values.get(port) == value:
+                self.skipped += 1
+                continue
+            ok = ok_predicate(write(port, value))
+            self.writes += 1
+            self.record(port, value, ok)
+            all_ok = all_ok and ok
+        return all_ok
+
+    def resync(self, ports: Optional[list[int]], write: Callable[[int, int], int], ok_predicate: Callable[[int], bool]) -> bool:
+        values = {port: value for port, value in self.values.items() if ports is None or port in ports}
+        return self.write_many(values, write, ok_predicate, force=True)
+
+    def stats(self) -> CommandCacheStats:
+        return CommandCacheStats(self.writes, self.skipped)
+
+    def reset_stats(self):
+        self.writes = 0
+        self.skipped = 0
+
+
 # SERVOS
 
 def _SERVO_OK(return_code: int) -> bool:
@@ -19,6 +77,8 @@ def _SERVO_OK(return_code: int) -> bool:
 
 ServoPort = Literal[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14]
 
+_servo_cache = _CommandCache()
+
 def clamp_servo_angle(angle: int, *, no_zero: bool = False) -> int:
     """
     Clamps the value to within the minimum and maximum servo angle values.
@@ -44,7 +104,55 @@ def SERVOSet(servos: ServoPort | list[ServoPort], angle: int, *, clamp_angle: bo
     if angle < 0 or angle > 255:
         raise ValueError(f"angle value out of bounds; expected a value from 0 to 255 but got: {angle}")
     
-    return repeat_func(servos, lambda servo: _SERVOSet(servo, angle), _SERVO_OK)
+    return repeat_func(servos, lambda servo: _servo_set_cached(servo, angle), _SERVO_OK)
+
+def _servo_set_cached(servo: ServoPort, angle: int) -> int:
+    return_code = _SERVOSet(servo, angle)
+    _servo_cache.record(servo, angle, _SERVO_OK(return_code))
+    return return_code
+
+def SERVOSetMany(angles: Mapping[ServoPort, int], *, clamp_angle: bool = False, force: bool = False) -> bool:
+    """
+    As :func:`SERVOSet`, but sets each servo in :param:`angles` to its own angle, skipping
+    servos whose last angle set (by this function or :func:`SERVOSet`) is unchanged.
+
+    :param:`force` if `True`, every angle is written
+    All ports and angles are checked before any are written.
+
+    See :func:`servo_cache_stats` for the number of writes skipped, and :func:`SERVOResync`.
+
+    Returns `True` if all ok.
+    """
+    validate_ports("servo", angles, get_args(ServoPort))
+    if clamp_angle:
+        angles = {servo: clamp_servo_angle(angle) for servo, angle in angles.items()}
+    for angle in angles.values():
+        if angle < 0 or angle > 255:
+            raise ValueError(f"angle value out of bounds; expected a value from 0 to 255 but got: {angle}")
+
+    return _servo_cache.write_many(angles, _SERVOSet, _SERVO_OK, force)
+
+def SERVOResync(servos: Optional[ServoPort | list[ServoPort]] = None) -> bool:
+    """
+    Rewrites the last angle set by :func:`SERVOSet` or :func:`SERVOSetMany` to :param:`servos`
+    (all servos with a known angle if `None`), e.g. in case something else has moved them.
+
+    Returns `True` if all ok.
+    """
+    ports = None if servos is None else servos if isinstance(servos, list) else [servos]
+    return _servo_cache.resync(ports, _SERVOSet, _SERVO_OK)
+
+def servo_cache_stats() -> CommandCacheStats:
+    return _servo_cache.stats()
+
+def reset_servo_cache_stats():
+    _servo_cache.reset_stats()
+
+def forget_servo_angles(servos: ServoPort | list[ServoPort]):
+    """
+    Makes :func:`SERVOSetMany` rewrite the angle of :param:`servos` next time, e.g. after setting them without eyepy.
+    """
+    _servo_cache.forget(servos)
 
 from eye import SERVOSetRaw as _SERVOSetRaw
 def SERVOSetRaw(servos: ServoPort | list[ServoPort], angle: int, *, clamp_angle: bool = False) -> bool:
@@ -65,6 +173,8 @@ def SERVOSetRaw(servos: ServoPort | list[ServoPort], angle: int, *, clamp_angle:
     if angle < 0 or angle > 255:
         raise ValueError(f"angle value out of bounds; expected a value from 0 to 255 but got: {angle}")
     
+    # bypassing the HDT, so the cached (HDT) angle no longer applies
+    _servo_cache.forget(servos)
     return repeat_func(servos, lambda servo: _SERVOSetRaw(servo, angle), _SERVO_OK)
 
 from eye import SERVORange as _SERVORange
@@ -95,6 +205,8 @@ def clamp_motor_speed(speed: int) -> int:
 
 MotorPort = Literal[1, 2, 3, 4]
 
+_motor_cache = _CommandCache()
+
 from eye import MOTORDrive as _MOTORDrive
 def MOTORDrive(motors: MotorPort | list[MotorPort], speed: int, *, clamp_speed: bool = True) -> bool:
     """
@@ -110,7 +222,60 @@ def MOTORDrive(motors: MotorPort | list[MotorPort], speed: int, *, clamp_speed:
     if speed < -100 or speed > 100:
         raise ValueError(f"speed value out of bounds; expected a value from -100 to 100 but got: {speed}")
     
-    return repeat_func(motors, lambda motor: _MOTORDrive(motor, speed), _MOTOR_OK)
+    return repeat_func(motors, lambda motor: _motor_drive_cached(motor, speed), _MOTOR_OK)
+
+def _motor_drive_cached(motor: MotorPort, speed: int) -> int:
+    return_code = _MOTORDrive(motor, speed)
+    _motor_cache.record(motor, speed, _MOTOR_OK(return_code))
+    return return_code
+
+def MOTORDriveMany(speeds: Mapping[MotorPort, int], *, clamp_speed: bool = True, force: bool = False) -> bool:
+    """
+    As :func:`MOTORDrive`, but drives each motor in :param:`speeds` at its own speed, skipping
+    motors whose last speed set (by this function or :func:`MOTORDrive`) is unchanged.
+
+    :param:`force` if `True`, every speed is written
+    All ports and speeds are checked before any are written.
+
+    The VW functions (e.g. :func:`VWSetSpeed`), :func:`MOTORDriveRaw`, :func:`MOTORSpeed` and bindings from
+    :func:`bind_motor_drive` and :func:`bind_vw_set_speed` make the motors they drive be rewritten next time.
+    Use :func:`forget_motor_speeds`, :func:`MOTORResync` or :param:`force` if the motors may have been driven
+    any other way.
+
+    See :func:`motor_cache_stats` for the number of writes skipped, and :func:`MOTORResync`.
+
+    Returns `True` if all ok.
+    """
+    validate_ports("motor", speeds, get_args(MotorPort))
+    if clamp_speed:
+        speeds = {motor: clamp_motor_speed(speed) for motor, speed in speeds.items()}
+    for speed in speeds.values():
+        if speed < -100 or speed > 100:
+            raise ValueError(f"speed value out of bounds; expected a value from -100 to 100 but got: {speed}")
+
+    return _motor_cache.write_many(speeds, _MOTORDrive, _MOTOR_OK, force)
+
+def MOTORResync(motors: Optional[MotorPort | list[MotorPort]] = None) -> bool:
+    """
+    Rewrites the last speed set by :func:`MOTORDrive` or :func:`MOTORDriveMany` to :param:`motors`
+    (all motors with a known speed if `None`), e.g. in case something else has driven them.
+
+    Returns `True` if all ok.
+    """
+    ports = None if motors is None else motors if isinstance(motors, list) else [motors]
+    return _motor_cache.resync(ports, _MOTORDrive, _MOTOR_OK)
+
+def motor_cache_stats() -> CommandCacheStats:
+    return _motor_cache.stats()
+
+def reset_motor_cache_stats():
+    _motor_cache.reset_stats()
+
+def forget_motor_speeds(motors: MotorPort | list[MotorPort]):
+    """
+    Makes :func:`MOTORDriveMany` rewrite the speed of :param:`motors` next time, e.g. after driving them without eyepy.
+    """
+    _motor_cache.forget(motors)
 
 from eye import MOTORDriveRaw as _MOTORDriveRaw
 def MOTORDriveRaw(motors: MotorPort | list[MotorPort], speed: int, *, clamp_speed: bool = False) -> bool:
@@ -129,6 +294,8 @@ def MOTORDriveRaw(motors: MotorPort | list[MotorPort], speed: int, *, clamp_spee
     if speed < -100 or speed > 100:
         raise ValueError(f"speed value out of bounds; expected a value from -100 to 100 but got: {speed}")
     
+    # bypassing the HDT, so the cached (HDT) speed no longer applies
+    _motor_cache.forget(motors)
     return repeat_func(motors, lambda motor: _MOTORDriveRaw(motor, speed), _MOTOR_OK)
 
 from eye import MOTORPID as _MOTORPID
@@ -155,6 +322,7 @@ def MOTORPIDOff(motors: MotorPort | list[MotorPort]) -> bool:
 
     Returns `True` if all ok.
     """
+    _motor_cache.forget(motors)
     return repeat_func(motors, lambda motor: _MOTORPIDOff(motor), _MOTOR_OK)
 
 from eye import MOTORSpeed as _MOTORSpeed
@@ -165,11 +333,16 @@ def MOTORSpeed(motors: MotorPort | list[MotorPort], ticks: int) -> bool:
 
     Returns `True` if all ok.
     """
+    # the motor is no longer driven at the cached percentage speed
+    _motor_cache.forget(motors)
     return repeat_func(motors, lambda motor: _MOTORSpeed(motor, ticks), _MOTOR_OK)
 
 # extra motor funcs
 
-def MOTORDualDrive(left_motor: MotorPort, right_motor: MotorPort, *, speed: float = 0, offset: float = 0, overflow_coeff: float = 0.0):
+def MOTORDualDrive(
+    left_motor: MotorPort, right_motor: MotorPort, *, speed: float = 0, offset: float = 0, overflow_coeff: float = 0.0,
+    skip_unchanged: bool = False,
+):
     """
     `left speed = speed - offset`, `right speed = speed + offset`
 
@@ -180,7 +353,14 @@ def MOTORDualDrive(left_motor: MotorPort, right_motor: MotorPort, *, speed: floa
 
     Both overflows are computed and applied simultaneously (they won't contribute to the other overflow),
     and the values after applying the overflows are clamped.
+
+    :param:`skip_unchanged` if `True`, uses :func:`MOTORDriveMany` so unchanged speeds aren't rewritten
+
+    Throws a `ValueError` if :param:`left_motor` and :param:`right_motor` are the same.
     """
+    if left_motor == right_motor:
+        raise ValueError(f"expected different left and right motors but got {left_motor} for both")
+
     left_speed = speed - offset
     right_speed = speed + offset
 
@@ -190,6 +370,9 @@ def MOTORDualDrive(left_motor: MotorPort, right_motor: MotorPort, *, speed: floa
     left_speed = round(left_speed - right_overflow * overflow_coeff)
     right_speed = round(right_speed - left_overflow * overflow_coeff)
 
+    if skip_unchanged:
+        return MOTORDriveMany({left_motor: left_speed, right_motor: right_speed}, clamp_speed=True)
+
     left_ok = MOTORDrive(left_motor, left_speed, clamp_speed=True)
     right_ok = MOTORDrive(right_motor, right_speed, clamp_speed=True)
     return left_ok and right_ok
@@ -0,0 +1,180 @@
+"""Occupancy grid mapping from LIDAR scans."""
+
+from __future__ import annotations
+import math
+from typing import Optional
+
+import numpy as np
+
+from eyepy.drawing import Image, IntPointLike, Point, PointLike, resolution_from_size
+from eyepy.lcd import LCDImageGray
+from eyepy.lidar import LIDARGetScan, LIDARScan
+from eyepy.pose import Pose2D
+from eyepy.v_omega import VWGetPosition, VWPosition
+
+
+class OccupancyGrid:
+    """
+    A grid of cells, each storing the log-odds of the cell being occupied.
+    Scans are integrated by tracing every ray at once: cells along a ray are marked as more likely
+    free, and the cell containing the end of the ray as more likely occupied.
+
+    Cell `(ix, iy)` covers world x from `origin.x + ix * cell_size` and world y from
+    `origin.y + iy * cell_size` (mm), so row 0 of :attr:`log_odds` is the bottom of the map.
+    """
+    log_odds: np.ndarray
+    """`float32`, shape `(height, width)`"""
+
+    origin: Point
+    """world position (mm) of the bottom left corner of the grid"""
+
+    cell_size: float
+    """mm"""
+
+    l_occupied: float
+    l_free: float
+    l_min: float
+    l_max: float
+
+    def __init__(
+        self, *, width: int, height: int, cell_size: float = 50, origin: PointLike = Point(0, 0),
+        l_occupied: float = 0.85, l_free: float = -0.4, l_min: float = -4, l_max: float = 4,
+    ):
+        """
+        :param:`width` cells
+        :param:`height` cells
+        :param:`cell_size` mm
+        :param:`origin` world position (mm) of the bottom left corner of the grid
+        :param:`l_occupied`, :param:`l_free` the log-odds added to a cell for a hit or a pass respectively
+        :param:`l_min`, :param:`l_max` the log-odds of each cell are clamped to this range
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError(f"grid dimensions must be positive but got {width}x{height}")
+        if cell_size <= 0:
+            raise ValueError(f"cell size must be positive but got {cell_size}")
+
+        self.log_odds = np.zeros((height, width), dtype=np.float32)
+        self.origin = Point(*origin)
+        self.cell_size = cell_size
+        self.l_occupied = l_occupied
+        self.l_free = l_free
+        self.l_min = l_min
+        self.l_max = l_max
+
+    @property
+    def width(self) -> int:
+        """cells"""
+        return self.log_odds.shape[1]
+
+    @property
+    def height(self) -> int:
+        """cells"""
+        return self.log_odds.shape[0]
+
+    def reset(self):
+        self.log_odds.fill(0)
+
+    def world_to_cell(self, points: np.ndarray) -> np.ndarray:
+        """
+        Converts an `(N, 2)` array of world points (mm) to an `(N, 2)` integer array of `(ix, iy)` cells.
+        Cells may be outside the grid.
+        """
+        return np.floor((np.asarray(points, dtype=np.float64) - self.origin) / self.cell_size).astype(np.int64)
+
+    def _cell_mask(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Returns a boolean mask over the flattened grid, marking the cells (inside the grid) in :param:`cells`.
+        """
+        ix, iy = cells[:, 0], cells[:, 1]
+        inside = (ix >= 0) & (ix < self.width) & (iy >= 0) & (iy < self.height)
+        mask = np.zeros(self.log_odds.size, dtype=bool)
+        mask[iy[inside] * self.width + ix[inside]] = True
+        return mask
+
+    def integrate_points(self, sensor: PointLike, ends: np.ndarray, *, hits: Optional[np.ndarray] = None):
+        """
+        Integrates rays from :param:`sensor` to each of the `(N, 2)` array of world points :param:`ends` (mm).
+
+        :param:`hits` a boolean array marking which rays ended on an obstacle; if `None`, all of them did.
+        Rays which didn't hit only clear the cells they pass through.
+        """
+        sensor_array = np.asarray(sensor, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+        if hits is None:
+            hits = np.ones(len(ends), dtype=bool)
+
+        if len(ends) == 0:
+            return
+
+        deltas = ends - sensor_array
+        lengths = np.hypot(deltas[:, 0], deltas[:, 1])
+
+        # sample every ray at half-cell steps, stopping short of the end cell
+        step = self.cell_size / 2
+        n_samples = max(1, math.ceil(lengths.max() / step))
+        t = np.arange(n_samples) * step
+        with np.errstate(invalid="ignore", divide="ignore"):
+            directions = np.where(lengths[:, np.newaxis] > 0, deltas / lengths[:, np.newaxis], 0)
+        along = t[np.newaxis, :] < (lengths[:, np.newaxis] - step)
+        samples = sensor_array + t[np.newaxis, :, np.newaxis] * directions[:, np.newaxis, :]
+
+        # masks rather than indices, so each cell is only updated once per scan
+        free = self._cell_mask(self.world_to_cell(samples[along]))
+        occupied = self._cell_mask(self.world_to_cell(ends[hits]))
+
+        # a cell containing a hit isn't cleared by other rays passing through it during the same scan
+        free &= ~occupied
+
+        flat = self.log_odds.reshape(-1)
+        flat[free] += self.l_free
+        flat[occupied] += self.l_occupied
+        np.clip(flat, self.l_min, self.l_max, out=flat)
+
+    def integrate_scan(self, scan: LIDARScan, pose: VWPosition | Pose2D, *, max_range: Optional[int] = None):
+        """
+        Integrates a LIDAR scan taken with the LIDAR at :param:`pose` (in the world frame).
+
+        :param:`max_range` mm; distances at or beyond this are treated as no hit, and are
+        only used to clear cells up to :param:`max_range`. If `None`, every distance is a hit.
+        Zero distances are ignored.
+        """
+        valid = scan.distances > 0
+        hits = valid.copy()
+        if max_range is not None:
+            hits &= scan.distances < max_range
+            scan = LIDARScan(np.minimum(scan.distances, max_range), scan.config)
+
+        if isinstance(pose, VWPosition):
+            pose = Pose2D.from_vw_position(pose)
+        ends = scan.to_points(pose)
+        self.integrate_points(pose.position, ends[valid], hits=hits[valid])
+
+    def update(self, *, max_range: Optional[int] = None):
+        """
+        Takes a scan with :func:`LIDARGetScan` and integrates it at the pose from :func:`VWGetPosition`.
+        """
+        pose = VWGetPosition()
+        self.integrate_scan(LIDARGetScan(), pose, max_range=max_range)
+
+    def probabilities(self) -> np.ndarray:
+        """
+        Returns the probability of each cell being occupied, as a `float32` array of shape `(height, width)`.
+        """
+        return 1 - 1 / (1 + np.exp(self.log_odds))
+
+    def to_image(self) -> Image:
+        """
+        Returns a gray image of the grid (one pixel per cell, north up), with free cells white,
+        occupied cells black, and unknown cells mid-gray.
+        """
+        gray = np.rint(255 * (1 - self.probabilities()))
+        return Image.from_array(
+            np.ascontiguousarray(np.flipud(gray).astype(np.uint8)),
+            resolution=resolution_from_size(self.width, self.height),
+        )
+
+    def draw(self, *, start: Optional[IntPointLike] = None) -> bool:
+        """
+        Draws the grid using :func:`LCDImageGray`; see :meth:`to_image`.
+        """
+        return LCDImageGray(self.to_image(), start=start)
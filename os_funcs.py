@@ -1,6 +1,7 @@
 from __future__ import annotations
 import ctypes
 import datetime
+import threading
 import time
 from typing import Callable, NamedTuple
 
@@ -73,8 +74,13 @@ from eye import OSAttachTimer as _OSAttachTimer
 def OSAttachTimer(period_ms: int, f: Callable[[], None]) -> Timer:
     """
     ! Unstable behaviour when tested in sim. While timers were running, other python operations could lead to segfaults.
+    See :class:`SensorScheduler` for polling sensors periodically without timers.
     """
-    return _OSAttachTimer(period_ms, f)
+    global _core_timer_initialised
+    with _core_timer_lock:
+        timer = _OSAttachTimer(period_ms, f)
+        _core_timer_initialised = True
+    return timer
 
 from eye import OSDetachTimer as _OSDetachTimer
 def OSDetachTimer(timer: Timer) -> bool:
@@ -113,15 +119,31 @@ def OSGetTimePy() -> datetime.time:
     return datetime.time(hour=hours, minute=mins, second=secs, microsecond=ms*1000)
 
 
-# It seems like OSGetCount requires a call to `TIMInitialise_core_timer` before
-# it will start counting. `OSAttachTimer` calls this, so we attach and then detach
-# a dummy function to initialise the timer (approximately) as the program starts
-OSDetachTimer(OSAttachTimer(1000, type(None)))
+_core_timer_initialised: bool = False
+
+_core_timer_lock = threading.Lock()
+
+def _init_core_timer():
+    # It seems like OSGetCount requires a call to `TIMInitialise_core_timer` before
+    # it will start counting. `OSAttachTimer` calls this, so we attach and then detach
+    # a dummy function to initialise the timer. This is deferred until the count is
+    # first needed, rather than done at import
+    global _core_timer_initialised
+    # e.g. a polling thread and the main thread may both get the first count
+    with _core_timer_lock:
+        if _core_timer_initialised:
+            return
+        # not :func:`OSAttachTimer`, which takes the lock itself
+        _OSDetachTimer(_OSAttachTimer(1000, type(None)))
+        _core_timer_initialised = True
 
 from eye import OSGetCount as _OSGetCount
 def OSGetCount() -> int:
     """
     Returns ms since system start.
-    In sim, the system start is approximately when the python program is started.
+    In sim, the system start is approximately when the core timer is initialised, which
+    happens on the first call to this function (or to :func:`OSAttachTimer`).
     """
+    if not _core_timer_initialised:
+        _init_core_timer()
     return _OSGetCount()
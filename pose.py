@@ -0,0 +1,138 @@
+"""Rigid 2D poses (SE(2)), for moving points between robot, sensor and world frames."""
+
+from __future__ import annotations
+import math
+
+import numpy as np
+
+from eyepy.drawing import Affine2D, IntPoint, Point, PointArray, PointArrayLike, PointLike, Vector
+from eyepy.utils import deg_to_rad, rad_to_deg, wrap
+from eyepy.v_omega import VWPosition, wrap_turn_angle
+
+
+class Pose2D:
+    """
+    A position (mm) and heading (rads, positive anticlockwise from the x axis), e.g. of the robot in
+    the world, or of a sensor on the robot. As a transform, it maps points from the pose's own frame
+    (x forwards, y left) into the frame the pose is given in.
+
+    `a @ b` composes poses: if `b` is relative to `a`'s frame, `a @ b` is `b` in the frame of `a`.
+    Immutable; the cos and sin of the heading are computed once.
+    """
+    __slots__ = ("_x", "_y", "_theta", "_cos", "_sin")
+
+    def __init__(self, x: float = 0, y: float = 0, theta: float = 0):
+        """
+        :param:`x`, :param:`y` mm
+        :param:`theta` rads; wrapped to `-pi` to `pi`
+        """
+        self._x = float(x)
+        self._y = float(y)
+        self._theta = wrap(float(theta), -math.pi, math.pi)
+        self._cos = math.cos(self._theta)
+        self._sin = math.sin(self._theta)
+
+    @staticmethod
+    def identity() -> Pose2D:
+        return Pose2D()
+
+    @staticmethod
+    def from_vw_position(position: VWPosition) -> Pose2D:
+        (x, y), phi = position
+        return Pose2D(x, y, deg_to_rad(phi))
+
+    def to_vw_position(self) -> VWPosition:
+        """
+        Rounds to whole mm and degrees.
+        """
+        return VWPosition(IntPoint(round(self._x), round(self._y)), wrap_turn_angle(round(rad_to_deg(self._theta))))
+
+    @property
+    def x(self) -> float:
+        """mm"""
+        return self._x
+
+    @property
+    def y(self) -> float:
+        """mm"""
+        return self._y
+
+    @property
+    def theta(self) -> float:
+        """rads"""
+        return self._theta
+
+    @property
+    def position(self) -> Point:
+        return Point(self._x, self._y)
+
+    def __iter__(self):
+        return iter((self._x, self._y, self._theta))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Pose2D):
+            return NotImplemented
+        return (self._x, self._y, self._theta) == (other._x, other._y, other._theta)
+
+    def __hash__(self) -> int:
+        return hash((self._x, self._y, self._theta))
+
+    def __repr__(self) -> str:
+        return f"Pose2D(x={self._x}, y={self._y}, theta={self._theta})"
+
+    def __matmul__(self, other: Pose2D) -> Pose2D:
+        """
+        `(a @ b)(p) == a(b(p))`
+        """
+        if not isinstance(other, Pose2D):
+            return NotImplemented
+        x, y = self(other.position)
+        return Pose2D(x, y, self._theta + other._theta)
+
+    def inverse(self) -> Pose2D:
+        """
+        `p.inverse() @ p` is the identity, e.g. the inverse of the robot's world pose maps world points into the robot frame.
+        """
+        return Pose2D(
+            -(self._cos * self._x + self._sin * self._y),
+            self._sin * self._x - self._cos * self._y,
+            -self._theta,
+        )
+
+    def relative_to(self, other: Pose2D) -> Pose2D:
+        """
+        Returns this pose in the frame of :param:`other` (both given in the same frame).
+        """
+        return other.inverse() @ self
+
+    def __call__(self, p: PointLike) -> Point:
+        """
+        Transforms a single point.
+        """
+        x, y = p
+        return Point(self._cos * x - self._sin * y + self._x, self._sin * x + self._cos * y + self._y)
+
+    def rotate(self, v: Vector | tuple[float, float]) -> Vector:
+        """
+        Rotates a vector by the heading (vectors aren't translated).
+        """
+        dx, dy = v
+        return Vector(self._cos * dx - self._sin * dy, self._sin * dx + self._cos * dy)
+
+    def apply_xy(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Transforms the points given by separate coordinate arrays, returning an `(N, 2)` array.
+        """
+        return np.column_stack((self._cos * x - self._sin * y + self._x, self._sin * x + self._cos * y + self._y))
+
+    def apply_many(self, points: PointArrayLike) -> np.ndarray:
+        """
+        Transforms an `(N, 2)` array (or sequence, or :class:`PointArray`) of points, returning an `(N, 2)` array.
+        """
+        if isinstance(points, PointArray):
+            return self.apply_xy(points.x, points.y)
+        array = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return self.apply_xy(array[:, 0], array[:, 1])
+
+    def to_affine(self) -> Affine2D:
+        return Affine2D(((self._cos, -self._sin, self._x), (self._sin, self._cos, self._y)))
@@ -0,0 +1,571 @@
+"""
+Recording of sensor readings (camera frames, LIDAR scans, PSD readings, encoder counts and
+`VW` positions) to a compact binary log, and replaying eyepy's sensor calls from one, e.g. to
+reproduce or profile field problems offline.
+
+A log is a header, then one record per reading (a small header and the raw payload), then an index
+of every record. Logs are read through `mmap`, so they aren't loaded whole, and frames and scans
+are served without copying.
+"""
+
+from __future__ import annotations
+import ctypes
+import mmap
+import os
+import struct
+import threading
+from types import ModuleType
+from typing import Any, Callable, Iterator, NamedTuple, Optional, Union
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+import numpy as np
+
+from eyepy import camera as _camera, lidar as _lidar, motors as _motors, os_funcs as _os_funcs, psd as _psd, v_omega as _v_omega
+from eyepy.drawing import Image, IntPoint, resolution_from_size
+from eyepy.internal_utils import patch_attribute, unpatch_attributes
+from eyepy.lidar import LIDARConfig, LIDARScan
+from eyepy.os_funcs import OSGetCount
+from eyepy.v_omega import VWPosition
+
+
+SensorLogKind = Literal["image", "gray_image", "lidar", "psd", "encoder", "position"]
+
+_KIND_CODES: dict[str, int] = {"image": 1, "gray_image": 2, "lidar": 3, "psd": 4, "encoder": 5, "position": 6}
+_KINDS: dict[int, str] = {code: kind for kind, code in _KIND_CODES.items()}
+
+_MAGIC = b"EYEPYLOG"
+_INDEX_MAGIC = b"EYEPYIDX"
+_VERSION = 1
+
+_FILE_HEADER = struct.Struct("<8sI4x")
+"""magic, version"""
+
+_RECORD_HEADER = struct.Struct("<HHqI")
+"""kind, channel, timestamp, payload size"""
+
+_FOOTER = struct.Struct("<8sQQ")
+"""magic, index offset, record count"""
+
+_IMAGE_HEADER = struct.Struct("<HH")
+"""width, height; followed by the pixels"""
+
+_LIDAR_HEADER = struct.Struct("<iii")
+"""range, tilt, n_points; followed by `int32` distances"""
+
+_INT = struct.Struct("<i")
+_POSITION = struct.Struct("<iii")
+
+_INDEX_DTYPE = np.dtype([("offset", "<u8"), ("timestamp", "<i8"), ("kind", "<u2"), ("channel", "<u2"), ("size", "<u4")])
+"""`offset` is of the payload, after the record header"""
+
+def _kind_code(kind: SensorLogKind) -> int:
+    if kind not in _KIND_CODES:
+        raise ValueError(f"unknown record kind '{kind}'; expected one of {list(_KIND_CODES)}")
+    return _KIND_CODES[kind]
+
+
+# writing
+
+class SensorLogWriter:
+    """
+    Appends readings to a new log file. Thread safe, so e.g. :class:`SensorScheduler` polls can be recorded.
+    The index is written by :meth:`close`; logs that weren't closed (e.g. after a crash) can still be read,
+    but are scanned when opened. Can be used as a context manager, which closes the log.
+
+    Timestamps are :func:`OSGetCount` (ms), read when the reading is written unless given.
+    """
+    path: str
+    _file: Any
+    _lock: threading.Lock
+    _offset: int
+    _index: list[tuple[int, int, int, int, int]]
+
+    def __init__(self, path: Union[str, os.PathLike[str]]):
+        """
+        Creates (or overwrites) the log at :param:`path`.
+        """
+        self.path = os.fspath(path)
+        self._file = open(self.path, "wb")
+        self._file.write(_FILE_HEADER.pack(_MAGIC, _VERSION))
+        self._lock = threading.Lock()
+        self._offset = _FILE_HEADER.size
+        self._index = []
+
+    def __enter__(self) -> SensorLogWriter:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def _write(self, kind: int, channel: int, timestamp: Optional[int], *payload: Any):
+        if timestamp is None:
+            timestamp = OSGetCount()
+        size = sum(memoryview(chunk).nbytes for chunk in payload)
+        with self._lock:
+            if self._file.closed:
+                raise ValueError("log is closed")
+            self._file.write(_RECORD_HEADER.pack(kind, channel, timestamp, size))
+            for chunk in payload:
+                self._file.write(chunk)
+            offset = self._offset + _RECORD_HEADER.size
+            self._index.append((offset, timestamp, kind, channel, size))
+            self._offset = offset + size
+
+    def write_image(self, image: Image, timestamp: Optional[int] = None):
+        """
+        Writes a frame, e.g. from :func:`CAMGet`, :func:`CAMGetGray` or :class:`CAMCapture`.
+        """
+        resolution = image.resolution
+        kind = _KIND_CODES["gray_image" if image.is_gray else "image"]
+        self._write(kind, 0, timestamp, _IMAGE_HEADER.pack(resolution.WIDTH, resolution.HEIGHT), image._c_bytes)
+
+    def write_lidar(self, scan: LIDARScan, timestamp: Optional[int] = None):
+        config = scan.config
+        distances = np.ascontiguousarray(scan.distances, dtype="<i4")
+        self._write(_KIND_CODES["lidar"], 0, timestamp, _LIDAR_HEADER.pack(config.range, config.tilt, config.n_points), distances)
+
+    def write_psd(self, psd: int, value: int, timestamp: Optional[int] = None):
+        self._write(_KIND_CODES["psd"], psd, timestamp, _INT.pack(value))
+
+    def write_encoder(self, encoder: int, value: int, timestamp: Optional[int] = None):
+        self._write(_KIND_CODES["encoder"], encoder, timestamp, _INT.pack(value))
+
+    def write_position(self, position: VWPosition, timestamp: Optional[int] = None):
+        (x, y), phi = position
+        self._write(_KIND_CODES["position"], 0, timestamp, _POSITION.pack(x, y, phi))
+
+    def flush(self):
+        """
+        Flushes written records to the file (the index is only written by :meth:`close`).
+        """
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        """
+        Writes the index and closes the file; does nothing if already closed.
+        """
+        with self._lock:
+            if self._file.closed:
+                return
+            index = np.array(self._index, dtype=_INDEX_DTYPE)
+            self._file.write(index.tobytes())
+            self._file.write(_FOOTER.pack(_INDEX_MAGIC, self._offset, len(index)))
+            self._file.close()
+
+
+# reading
+
+class LogRecord(NamedTuple):
+    kind: SensorLogKind
+
+    channel: int
+    """the PSD or encoder port; 0 for other kinds"""
+
+    timestamp: int
+    """:func:`OSGetCount` (ms) when the reading was taken"""
+
+    value: Union[Image, LIDARScan, int, VWPosition]
+    """
+    an :class:`Image` for `"image"` and `"gray_image"`, a :class:`LIDARScan` for `"lidar"`, an `int` for `"psd"`
+    and `"encoder"`, and a :class:`VWPosition` for `"position"`.
+    Images and scans share the log's memory (privately, so writing to them doesn't modify the file).
+    """
+
+class SensorLog:
+    """
+    A log written by :class:`SensorLogWriter`, memory-mapped so only the records used are read from disk.
+    A sequence of :class:`LogRecord` in the order they were written.
+    Can be used as a context manager, which closes the log.
+    """
+    path: str
+
+    index: np.ndarray
+    """
+    structured array with fields `offset` (of the payload), `timestamp`, `kind` (code), `channel` and `size`,
+    one per record; read-only
+    """
+
+    _mmap: Optional[mmap.mmap]
+
+    def __init__(self, path: Union[str, os.PathLike[str]]):
+        """
+        Throws a `ValueError` if the file is not a sensor log.
+        """
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < _FILE_HEADER.size:
+                raise ValueError(f"'{self.path}' is not a sensor log")
+            # copy-on-write, so records can be wrapped (without copying) by ctypes and numpy, which need writable buffers
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, version = _FILE_HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"'{self.path}' is not a sensor log")
+        if version != _VERSION:
+            raise ValueError(f"unsupported sensor log version {version}; expected {_VERSION}")
+
+        self.index = self._read_index(size)
+        self.index.flags.writeable = False
+
+    def _read_index(self, size: int) -> np.ndarray:
+        if size >= _FILE_HEADER.size + _FOOTER.size:
+            magic, offset, count = _FOOTER.unpack_from(self._mmap, size - _FOOTER.size)
+            if magic == _INDEX_MAGIC and offset + count * _INDEX_DTYPE.itemsize + _FOOTER.size == size:
+                return np.frombuffer(self._mmap, dtype=_INDEX_DTYPE, count=count, offset=offset).copy()
+        return self._scan_index(size)
+
+    def _scan_index(self, size: int) -> np.ndarray:
+        """
+        Rebuilds the index of a log that wasn't closed. The scan stops at the first record with an unknown kind
+        (e.g. zero-filled space left by a crash) or which runs past the end of the file (e.g. a partially written
+        last record); it and everything after it are ignored.
+        """
+        entries: list[tuple[int, int, int, int, int]] = []
+        offset = _FILE_HEADER.size
+        while offset + _RECORD_HEADER.size <= size:
+            kind, channel, timestamp, payload_size = _RECORD_HEADER.unpack_from(self._mmap, offset)
+            payload_offset = offset + _RECORD_HEADER.size
+            if kind not in _KINDS or payload_offset + payload_size > size:
+                break
+            entries.append((payload_offset, timestamp, kind, channel, payload_size))
+            offset = payload_offset + payload_size
+        return np.array(entries, dtype=_INDEX_DTYPE)
+
+    def __enter__(self) -> SensorLog:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._mmap is None
+
+    def close(self):
+        """
+        Unmaps the file; does nothing if already closed.
+
+        Throws a `BufferError`, leaving the log open, if images or scans from the log (which share its memory)
+        are still alive; copy anything needed after closing, and delete the rest first.
+        """
+        if self._mmap is None:
+            return
+        try:
+            self._mmap.close()
+        except BufferError:
+            raise BufferError("can't close the log while images or scans from it are still alive") from None
+        self._mmap = None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.index["timestamp"]
+
+    def select(self, kind: Optional[SensorLogKind] = None, channel: Optional[int] = None) -> np.ndarray:
+        """
+        Returns the indices of the records of :param:`kind` (any if `None`) and :param:`channel` (any if `None`), in order.
+        """
+        mask = np.ones(len(self.index), dtype=bool)
+        if kind is not None:
+            mask &= self.index["kind"] == _kind_code(kind)
+        if channel is not None:
+            mask &= self.index["channel"] == channel
+        return np.flatnonzero(mask)
+
+    def find(self, timestamp: int) -> int:
+        """
+        Returns the index of the first record taken at or after :param:`timestamp`, or `len(self)` if there is none.
+        Assumes the records were written in time order.
+        """
+        return int(np.searchsorted(self.index["timestamp"], timestamp, side="left"))
+
+    def __getitem__(self, i: int) -> LogRecord:
+        if self._mmap is None:
+            raise ValueError("log is closed")
+        offset, timestamp, kind, channel, size = self.index[i].tolist()
+        return LogRecord(_KINDS[kind], channel, timestamp, self._decode(kind, offset, size))
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def records(
+        self, kind: Optional[SensorLogKind] = None, channel: Optional[int] = None, *,
+        start: Optional[int] = None, end: Optional[int] = None,
+    ) -> Iterator[LogRecord]:
+        """
+        Iterates over the records of :param:`kind` and :param:`channel` (see :meth:`select`),
+        taken from :param:`start` (inclusive) to :param:`end` (exclusive) (ms, as :attr:`LogRecord.timestamp`).
+        """
+        first = 0 if start is None else self.find(start)
+        last = len(self) if end is None else self.find(end)
+        for i in self.select(kind, channel).tolist():
+            if first <= i < last:
+                yield self[i]
+
+    def _decode(self, kind: int, offset: int, size: int) -> Union[Image, LIDARScan, int, VWPosition]:
+        if kind == _KIND_CODES["image"] or kind == _KIND_CODES["gray_image"]:
+            return self._image(kind, offset)
+        if kind == _KIND_CODES["lidar"]:
+            return self._lidar_scan(offset)
+        if kind == _KIND_CODES["position"]:
+            x, y, phi = _POSITION.unpack_from(self._mmap, offset)
+            return VWPosition(IntPoint(x, y), phi)
+        return _INT.unpack_from(self._mmap, offset)[0]
+
+    def _image_bytes(self, kind: int, offset: int) -> tuple[ctypes.Array[ctypes.c_byte], int, int]:
+        """
+        Returns the pixels of an image record (sharing the log's memory), and the width and height.
+        """
+        width, height = _IMAGE_HEADER.unpack_from(self._mmap, offset)
+        size = width * height * (1 if kind == _KIND_CODES["gray_image"] else 3)
+        return (ctypes.c_byte * size).from_buffer(self._mmap, offset + _IMAGE_HEADER.size), width, height
+
+    def _image(self, kind: int, offset: int) -> Image:
+        c_bytes, width, height = self._image_bytes(kind, offset)
+        return Image.from_c_bytes(c_bytes, gray=kind == _KIND_CODES["gray_image"], resolution=resolution_from_size(width, height))
+
+    def _lidar_scan(self, offset: int) -> LIDARScan:
+        range, tilt, n_points = _LIDAR_HEADER.unpack_from(self._mmap, offset)
+        distances = np.frombuffer(self._mmap, dtype="<i4", count=n_points, offset=offset + _LIDAR_HEADER.size)
+        return LIDARScan(distances, LIDARConfig(range=range, tilt=tilt, n_points=n_points))
+
+
+# patching eyepy
+# recording and replaying replace the `eye` bindings of the eyepy modules (`from eye import X as _X`)
+
+_active: Optional[object] = None
+"""the running :class:`SensorRecorder` or :class:`SensorReplay`"""
+
+def _start_patching(owner: object, wrappers: dict[tuple[ModuleType, str], Callable[[Callable[..., Any]], Callable[..., Any]]]):
+    """
+    :param:`wrappers` returns the replacement of each attribute, given its current value
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("a sensor recording or replay is already running")
+    for (module, attribute), wrap in wrappers.items():
+        patch_attribute(owner, module, attribute, wrap)
+    _active = owner
+
+def _stop_patching(owner: object):
+    global _active
+    if _active is not owner:
+        return
+    unpatch_attributes(owner)
+    _active = None
+
+def _replacing(replacement: Callable[..., Any]) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    return lambda _: replacement
+
+class SensorRecorder:
+    """
+    Writes the result of every :func:`CAMGet`, :func:`CAMGetGray`, :func:`LIDARGet` (and :func:`LIDARGetScan`),
+    :func:`PSDGet`, :func:`ENCODERRead` and :func:`VWGetPosition` call to a :class:`SensorLogWriter` while running,
+    including calls from other threads (e.g. :class:`SensorScheduler`).
+
+    Calls which bypass the `eye` functions aren't recorded: :class:`CAMCapture` frames (write them with
+    :meth:`SensorLogWriter.write_image`), and the bindings from :func:`bind_psd_get` and :func:`bind_encoder_read`.
+    Can be used as a context manager, which starts and stops the recording (and closes the log).
+    """
+    writer: SensorLogWriter
+
+    def __init__(self, log: Union[SensorLogWriter, str, os.PathLike[str]]):
+        """
+        :param:`log` a writer, or the path of a new log
+        """
+        self.writer = log if isinstance(log, SensorLogWriter) else SensorLogWriter(log)
+
+    def __enter__(self) -> SensorRecorder:
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+        self.writer.close()
+
+    @property
+    def running(self) -> bool:
+        return _active is self
+
+    def start(self):
+        """
+        Throws a `RuntimeError` if another recording or replay is running; does nothing if already running.
+        """
+        if self.running:
+            return
+        writer = self.writer
+
+        def recording(write: Callable[..., None]) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+            def wrap(original: Callable[..., Any]) -> Callable[..., Any]:
+                def record(*args: Any) -> Any:
+                    value = original(*args)
+                    write(value, *args)
+                    return value
+                return record
+            return wrap
+
+        def write_frame(gray: bool) -> Callable[[Any], None]:
+            def write(raw_image: Any):
+                writer.write_image(Image.from_c_bytes(raw_image, gray=gray, resolution=_camera._camera_resolution))
+            return write
+
+        def write_lidar(raw_distances: Any):
+            writer.write_lidar(LIDARScan(np.asarray(raw_distances, dtype=np.int32), _lidar.LIDARGetConfig()))
+
+        _start_patching(self, {
+            (_camera, "_CAMGet"): recording(write_frame(False)),
+            (_camera, "_CAMGetGray"): recording(write_frame(True)),
+            (_lidar, "_LIDARGet"): recording(write_lidar),
+            (_psd, "_PSDGet"): recording(lambda value, port: writer.write_psd(port, value)),
+            (_motors, "_ENCODERRead"): recording(lambda value, port: writer.write_encoder(port, value)),
+            (_v_omega, "_VWGetPosition"): recording(lambda value: writer.write_position(VWPosition(IntPoint(value[0], value[1]), value[2]))),
+        })
+
+    def stop(self):
+        """
+        Stops recording; the log stays open.
+        """
+        _stop_patching(self)
+
+class SensorReplay:
+    """
+    Serves :func:`CAMGet`, :func:`CAMGetGray`, :func:`LIDARGet` (and :func:`LIDARGetScan`), :func:`PSDGet`,
+    :func:`ENCODERRead` and :func:`VWGetPosition` from a :class:`SensorLog` while running, so code using them
+    can be run (and benchmarked) without the simulator or robot.
+
+    Each call returns the next record of its kind (and port), in the order they were recorded, and throws
+    a `ValueError` if the log has been closed.
+    :func:`OSGetCount` returns the timestamp of the latest record served, so the log's timing is reproduced.
+    :func:`CAMInit` and :func:`LIDARSet` only update eyepy's config, which must match the recorded frames
+    and scans. Can be used as a context manager, which starts and stops the replay.
+    """
+    log: SensorLog
+    loop: bool
+    _start: int
+    _cursors: dict[tuple[int, int], tuple[np.ndarray, int]]
+    """the indices of the records of each kind and channel, and the next position"""
+    _clock: int
+
+    def __init__(self, log: Union[SensorLog, str, os.PathLike[str]], *, start: Optional[int] = None, loop: bool = False):
+        """
+        :param:`log` a log, or the path of one
+        :param:`start` the timestamp (ms) to start from, or `None` for the start of the log
+        :param:`loop` if `True`, each kind of record restarts from :param:`start` when exhausted;
+        otherwise further calls throw a `RuntimeError`
+        """
+        self.log = log if isinstance(log, SensorLog) else SensorLog(log)
+        self.loop = loop
+        self._start = 0 if start is None else self.log.find(start)
+        self._cursors = {}
+        # calls may come from several threads (e.g. a :class:`SensorScheduler`)
+        self._lock = threading.Lock()
+        self.rewind()
+
+    def __enter__(self) -> SensorReplay:
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return _active is self
+
+    @property
+    def clock(self) -> int:
+        """the timestamp (ms) of the latest record served"""
+        return self._clock
+
+    def rewind(self):
+        """
+        Restarts every kind of record from the start of the replay.
+        """
+        index = self.log.index
+        with self._lock:
+            self._cursors.clear()
+            self._clock = int(index["timestamp"][self._start]) if self._start < len(index) else 0
+
+    def _next(self, kind: SensorLogKind, channel: int = 0) -> int:
+        """
+        Returns the offset of the payload of the next record of :param:`kind` and :param:`channel`, advancing the clock.
+        """
+        key = (_KIND_CODES[kind], channel)
+        with self._lock:
+            if self.log.closed:
+                raise ValueError("can't replay from a closed log")
+            if key not in self._cursors:
+                records = self.log.select(kind, channel)
+                self._cursors[key] = (records[records >= self._start], 0)
+            records, position = self._cursors[key]
+            if position == len(records):
+                if not self.loop or len(records) == 0:
+                    port = f" for port {channel}" if kind in ("psd", "encoder") else ""
+                    raise RuntimeError(f"no more '{kind}' records{port} in the log")
+                position = 0
+            self._cursors[key] = (records, position + 1)
+
+            offset, timestamp = self.log.index[["offset", "timestamp"]][records[position]].tolist()
+            self._clock = timestamp
+            return offset
+
+    def start(self):
+        """
+        Throws a `RuntimeError` if another recording or replay is running, or a `ValueError` if the log is closed;
+        does nothing if already running.
+        """
+        if self.running:
+            return
+        log = self.log
+        if log.closed:
+            raise ValueError("can't replay from a closed log")
+
+        def frame(kind: SensorLogKind) -> Callable[[], Any]:
+            code = _KIND_CODES[kind]
+            def get() -> Any:
+                c_bytes, width, height = log._image_bytes(code, self._next(kind))
+                resolution = _camera._camera_resolution
+                if (width, height) != (resolution.WIDTH, resolution.HEIGHT):
+                    raise ValueError(f"recorded frame is {width}x{height} but the camera resolution is {resolution.WIDTH}x{resolution.HEIGHT}")
+                return c_bytes
+            return get
+
+        def lidar_get() -> np.ndarray:
+            scan = log._lidar_scan(self._next("lidar"))
+            if scan.config != _lidar.LIDARGetConfig():
+                raise ValueError(f"recorded scan has config {scan.config} but the current config is {_lidar.LIDARGetConfig()}")
+            return scan.distances
+
+        def vw_get_position() -> tuple[int, int, int]:
+            return _POSITION.unpack_from(log._mmap, self._next("position"))
+
+        _start_patching(self, {
+            (_camera, "_CAMInit"): _replacing(lambda resolution_code: 0),
+            (_camera, "_CAMGet"): _replacing(frame("image")),
+            (_camera, "_CAMGetGray"): _replacing(frame("gray_image")),
+            (_lidar, "_LIDARSet"): _replacing(lambda range, tilt, n_points: 0),
+            (_lidar, "_LIDARGet"): _replacing(lidar_get),
+            (_psd, "_PSDGet"): _replacing(lambda port: _INT.unpack_from(log._mmap, self._next("psd", port))[0]),
+            (_motors, "_ENCODERRead"): _replacing(lambda port: _INT.unpack_from(log._mmap, self._next("encoder", port))[0]),
+            (_v_omega, "_VWGetPosition"): _replacing(vw_get_position),
+            (_os_funcs, "_OSGetCount"): _replacing(lambda: self._clock),
+        })
+
+    def stop(self):
+        _stop_patching(self)
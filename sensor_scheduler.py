@@ -0,0 +1,200 @@
+"""Polling of multiple sensors at independent rates on one background thread."""
+
+from __future__ import annotations
+import heapq
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, NamedTuple, Optional
+
+from eyepy.internal_utils import eye_lock
+from eyepy.lidar import LIDARGetScan
+from eyepy.motors import ENCODERRead, EncoderPort
+from eyepy.os_funcs import OSGetCount
+from eyepy.psd import PSDGet, PSDPort
+from eyepy.v_omega import VWGetPosition
+
+
+class SensorSample(NamedTuple):
+    value: Any
+
+    timestamp: int
+    """:func:`OSGetCount` (ms) when the value was read"""
+
+    seq: int
+    """the number of successful reads of the sensor before this one"""
+
+class _Sensor:
+    name: str
+    poll: Callable[[], Any]
+    period: float
+    """s"""
+    seq: int
+
+    def __init__(self, name: str, poll: Callable[[], Any], period: float):
+        self.name = name
+        self.poll = poll
+        self.period = period
+        self.seq = 0
+
+class SensorScheduler:
+    """
+    Polls every registered sensor at its own rate on one dedicated thread, and publishes the
+    latest timestamped sample of each. Reading the samples never blocks on a hardware call,
+    or on the polling thread: every update publishes a new immutable snapshot.
+
+    An alternative to polling from :func:`OSAttachTimer` callbacks. Each poll holds :data:`eye_lock`,
+    so while running, calls into `eye` from other threads (including the main thread) must hold it too;
+    otherwise they may run concurrently with a poll.
+    Can be used as a context manager, which starts and stops the polling thread.
+    """
+    _sensors: dict[str, _Sensor]
+    _snapshot: Mapping[str, SensorSample]
+    _thread: Optional[threading.Thread]
+    _stop_event: threading.Event
+    _errors: dict[str, int]
+    _overruns: int
+
+    def __init__(self):
+        self._sensors = {}
+        self._snapshot = MappingProxyType({})
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._errors = {}
+        self._overruns = 0
+
+    def __enter__(self) -> SensorScheduler:
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def register(self, name: str, poll: Callable[[], Any], *, rate_hz: float):
+        """
+        Registers :param:`poll` to be called :param:`rate_hz` times a second, with its results
+        published under :param:`name`.
+
+        Throws a `RuntimeError` if the scheduler is running,
+        or a `ValueError` if the name is already registered or the rate is not positive.
+        """
+        if self.running:
+            raise RuntimeError("can't register sensors while the scheduler is running")
+        if name in self._sensors:
+            raise ValueError(f"a sensor named '{name}' is already registered")
+        if rate_hz <= 0:
+            raise ValueError(f"rate must be positive but got {rate_hz}")
+
+        self._sensors[name] = _Sensor(name, poll, 1 / rate_hz)
+        self._errors[name] = 0
+
+    def register_psd(self, psd: PSDPort, *, rate_hz: float, name: Optional[str] = None):
+        """
+        Registers :func:`PSDGet` for :param:`psd`, by default named `"psd<n>"`.
+        """
+        self.register(name or f"psd{psd}", lambda: PSDGet(psd), rate_hz=rate_hz)
+
+    def register_encoder(self, encoder: EncoderPort, *, rate_hz: float, name: Optional[str] = None):
+        """
+        Registers :func:`ENCODERRead` for :param:`encoder`, by default named `"encoder<n>"`.
+        """
+        self.register(name or f"encoder{encoder}", lambda: ENCODERRead(encoder), rate_hz=rate_hz)
+
+    def register_lidar(self, *, rate_hz: float, name: str = "lidar"):
+        """
+        Registers :func:`LIDARGetScan`.
+        """
+        self.register(name, LIDARGetScan, rate_hz=rate_hz)
+
+    def register_position(self, *, rate_hz: float, name: str = "position"):
+        """
+        Registers :func:`VWGetPosition`.
+        """
+        self.register(name, VWGetPosition, rate_hz=rate_hz)
+
+    def snapshot(self) -> Mapping[str, SensorSample]:
+        """
+        Returns the latest sample of every sensor which has been read at least once.
+        The returned mapping is immutable, and is not affected by later updates.
+        """
+        return self._snapshot
+
+    def latest(self, name: str) -> SensorSample | None:
+        """
+        Returns the latest sample of :param:`name`, or `None` if it hasn't been read yet.
+        """
+        return self._snapshot.get(name)
+
+    def errors(self) -> dict[str, int]:
+        """
+        Returns the number of polls of each sensor which raised an exception.
+        """
+        return dict(self._errors)
+
+    @property
+    def overruns(self) -> int:
+        """the number of polls that were skipped because the scheduler fell behind"""
+        return self._overruns
+
+    def start(self):
+        """
+        Starts the polling thread; does nothing if it is already running.
+        Every sensor is first polled immediately.
+        """
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._poll_loop, name="SensorScheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the polling thread and waits for any in-progress poll to finish.
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _publish(self, name: str, sample: SensorSample):
+        # copy-on-write; replacing the reference is atomic, so readers never need a lock
+        snapshot = dict(self._snapshot)
+        snapshot[name] = sample
+        self._snapshot = MappingProxyType(snapshot)
+
+    def _poll_loop(self):
+        now = time.monotonic()
+        queue: list[tuple[float, int, _Sensor]] = [(now, i, sensor) for i, sensor in enumerate(self._sensors.values())]
+        heapq.heapify(queue)
+
+        while queue:
+            due, i, sensor = queue[0]
+            wait = due - time.monotonic()
+            if wait > 0 and self._stop_event.wait(wait):
+                return
+            if self._stop_event.is_set():
+                return
+
+            try:
+                with eye_lock:
+                    value = sensor.poll()
+                    timestamp = OSGetCount()
+            except Exception:
+                self._errors[sensor.name] += 1
+            else:
+                self._publish(sensor.name, SensorSample(value, timestamp, sensor.seq))
+                sensor.seq += 1
+
+            next_due = due + sensor.period
+            now = time.monotonic()
+            if next_due < now:
+                # fell behind; skip the missed polls rather than bursting to catch up
+                missed = int((now - next_due) / sensor.period) + 1
+                self._overruns += missed
+                next_due += missed * sensor.period
+            heapq.heapreplace(queue, (next_due, i, sensor))
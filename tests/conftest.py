@@ -0,0 +1,24 @@
+"""
+Runs the tests against the headless backend, so the simulator isn't needed.
+"""
+
+import os
+import sys
+
+import pytest
+
+# the directory containing the `eyepy` package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eyepy import headless
+
+headless.install()
+
+@pytest.fixture
+def sim() -> headless.HeadlessEye:
+    """
+    A fresh simulator, with the robot at `(1000, 1000)` facing along the x axis in a 2000mm box.
+    """
+    sim = headless.install(headless.World.box(2000, 2000))
+    sim.set_pose(1000, 1000, 0)
+    return sim
@@ -0,0 +1,14 @@
+import eyepy
+
+
+def test_captures_wait_for_eye_lock(sim):
+    eyepy.CAMInit(eyepy.QQVGA)
+    capture = eyepy.CAMCapture()
+    try:
+        with eyepy.eye_lock:
+            capture.start()
+            assert capture.get(timeout=0.05) is None
+
+        assert capture.get(timeout=1) is not None
+    finally:
+        capture.stop()
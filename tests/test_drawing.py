@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+import eyepy
+
+
+def test_fill_accepts_numpy_integers():
+    image = eyepy.Image.blank(resolution=eyepy.QQVGA)
+    image.fill(np.int64(eyepy.RED))
+    assert image.as_array()[0, 0].tolist() == [255, 0, 0]
+
+    gray = eyepy.Image.blank(gray=True, resolution=eyepy.QQVGA)
+    gray.fill(np.uint8(128))
+    assert gray.as_array()[0, 0] == 128
+
+def test_integral_describes_the_image_when_built():
+    image = eyepy.Image.from_array(np.arange(16, dtype=np.uint8).reshape(4, 4))
+    integral = image.integral()
+    image.fill(0)
+
+    pixels = np.arange(16).reshape(4, 4)
+    assert integral.sum((0, 0), (3, 3)) == pixels.sum()
+    assert integral.variance((0, 0), (3, 3)) == pytest.approx(pixels.var())
+    assert image.integral().sum((0, 0), (3, 3)) == 0
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(0)
+
+def test_histogram_matches_counts(rng):
+    gray = eyepy.Image.from_array(rng.integers(0, 256, (12, 16), dtype=np.uint8))
+    assert gray.histogram().tolist() == [int((gray.as_array() == v).sum()) for v in range(256)]
+
+    colour = eyepy.Image.from_array(rng.integers(0, 256, (12, 16, 3), dtype=np.uint8))
+    histogram = colour.histogram()
+    assert histogram.shape == (3, 256)
+    for c in range(3):
+        assert histogram[c].tolist() == [int((colour.as_array()[..., c] == v).sum()) for v in range(256)]
+
+@pytest.mark.parametrize("shape", [(12, 16), (12, 16, 3)])
+def test_integral_rectangles_match_numpy(rng, shape):
+    pixels = rng.integers(0, 256, shape, dtype=np.uint8)
+    integral = eyepy.Image.from_array(pixels).integral()
+    values = pixels.astype(np.int64)
+
+    np.testing.assert_array_equal(integral.sums[1:, 1:], values.cumsum(0).cumsum(1))
+    np.testing.assert_array_equal(integral.squared_sums[1:, 1:], (values * values).cumsum(0).cumsum(1))
+    assert not integral.sums[0].any() and not integral.sums[:, 0].any()
+
+    corners = rng.integers(0, (16, 12), (50, 2, 2))
+    sums = integral.sum(corners[:, 0], corners[:, 1])
+    means = integral.mean(corners[:, 0], corners[:, 1])
+    variances = integral.variance(corners[:, 0], corners[:, 1])
+    for i, ((x1, y1), (x2, y2)) in enumerate(corners.tolist()):
+        region = values[min(y1, y2):max(y1, y2) + 1, min(x1, x2):max(x1, x2) + 1].reshape(-1, *shape[2:])
+        np.testing.assert_array_equal(sums[i], region.sum(axis=0))
+        np.testing.assert_allclose(means[i], region.mean(axis=0))
+        np.testing.assert_allclose(variances[i], region.var(axis=0), atol=1e-6)
+
+    assert integral.sum((3, 4), (3, 4)).tolist() == values[4, 3].tolist()
+    with pytest.raises(ValueError):
+        integral.sum((0, 0), (16, 0))
+
+def reference_otsu_level(pixels: np.ndarray) -> tuple[int, float]:
+    """
+    Returns the best level and its between-class variance, trying every level.
+    """
+    best = (0, -1.0)
+    for level in range(256):
+        low, high = pixels[pixels <= level].astype(np.float64), pixels[pixels > level].astype(np.float64)
+        if len(low) and len(high):
+            between = len(low) * len(high) * (low.mean() - high.mean()) ** 2
+            if between > best[1]:
+                best = (level, between)
+    return best
+
+def test_otsu_level_matches_reference(rng):
+    two_levels = np.where(rng.random((12, 16)) < 0.3, 50, 200).astype(np.uint8)
+    assert eyepy.Image.from_array(two_levels).otsu_level() == 50
+
+    bimodal = np.clip(np.where(rng.random((40, 60)) < 0.4, rng.normal(70, 20, (40, 60)), rng.normal(180, 25, (40, 60))), 0, 255).astype(np.uint8)
+    level = eyepy.Image.from_array(bimodal).otsu_level()
+    _, best_between = reference_otsu_level(bimodal)
+    low, high = bimodal[bimodal <= level].astype(np.float64), bimodal[bimodal > level].astype(np.float64)
+    assert len(low) * len(high) * (low.mean() - high.mean()) ** 2 == pytest.approx(best_between)
+
+def test_thresholds_are_binary_images(rng):
+    pixels = rng.integers(0, 256, (30, 40), dtype=np.uint8)
+    image = eyepy.Image.from_array(pixels)
+
+    np.testing.assert_array_equal(image.threshold(100).as_array(), pixels <= 100)
+    np.testing.assert_array_equal(image.threshold(100, invert=True).as_array(), pixels > 100)
+    np.testing.assert_array_equal(image.threshold_otsu().as_array(), pixels <= image.otsu_level())
+
+    # each pixel against the mean of its 5x5 neighbourhood, clipped to the image
+    adaptive = image.threshold_adaptive(5, offset=3)
+    assert adaptive.is_gray and adaptive.resolution == image.resolution
+    means = [[pixels[max(y - 2, 0):y + 3, max(x - 2, 0):x + 3].mean() for x in range(40)] for y in range(30)]
+    np.testing.assert_array_equal(adaptive.as_array(), pixels <= np.array(means) - 3)
+
+    with pytest.raises(ValueError):
+        eyepy.Image.from_array(rng.integers(0, 256, (12, 16, 3), dtype=np.uint8)).threshold(100)
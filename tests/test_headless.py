@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+import eyepy
+from eyepy import headless
+
+
+def test_timer_period_must_be_positive(sim):
+    with pytest.raises(ValueError):
+        sim.OSAttachTimer(0, lambda: None)
+    with pytest.raises(ValueError):
+        sim.OSAttachTimer(-10, lambda: None)
+
+def test_images_are_clipped_to_the_lcd(sim):
+    image = eyepy.Image.blank(resolution=eyepy.QQVGA)
+    image.fill(eyepy.RED)
+    assert eyepy.LCDImage(image, start=(-10, -20))
+
+    red = np.all(sim.lcd == [255, 0, 0], axis=2)
+    expected = np.zeros_like(red)
+    expected[:eyepy.QQVGA.HEIGHT - 20, :eyepy.QQVGA.WIDTH - 10] = True
+    assert np.array_equal(red, expected)
+
+def test_shadow_clips_images_as_the_lcd(sim):
+    image = eyepy.Image.blank(resolution=eyepy.QQVGA)
+    image.fill(eyepy.RED)
+    with eyepy.LCDShadow() as shadow:
+        assert eyepy.LCDImage(image, start=(-10, -20))
+        assert eyepy.LCDRefresh()
+        assert np.array_equal(shadow.frame, sim.lcd)
+
+def test_camera_renders_an_empty_world():
+    sim = headless.install()
+    eyepy.CAMInit(eyepy.QQVGA)
+    image = eyepy.CAMGet().as_array()
+    assert image.shape == (eyepy.QQVGA.HEIGHT, eyepy.QQVGA.WIDTH, 3)
+    assert image[0, 0].tolist() == list(eyepy.colour_to_rgb(sim.sky_colour))
@@ -0,0 +1,201 @@
+import numpy as np
+import pytest
+
+import eyepy
+from eyepy import image_ops
+
+
+NP_PAD_MODES = {"constant": "constant", "replicate": "edge", "reflect": "reflect", "wrap": "wrap"}
+
+def reference_windows(array: np.ndarray, kh: int, kw: int, border: str) -> np.ndarray:
+    """
+    The `kh` x `kw` neighbourhood of every pixel, in trailing axes, with a border value of 7 for `"constant"`.
+    """
+    pad_width = [(kh // 2, kh // 2), (kw // 2, kw // 2)] + [(0, 0)] * (array.ndim - 2)
+    extra = {"constant_values": 7} if border == "constant" else {}
+    padded = np.pad(array.astype(np.float64), pad_width, mode=NP_PAD_MODES[border], **extra)
+    return np.lib.stride_tricks.sliding_window_view(padded, (kh, kw), axis=(0, 1))
+
+def reference_correlate(array: np.ndarray, kernel: np.ndarray, border: str) -> np.ndarray:
+    return np.einsum("...ij,ij->...", reference_windows(array, *kernel.shape, border), kernel)
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(0)
+
+@pytest.mark.parametrize("border", list(NP_PAD_MODES))
+@pytest.mark.parametrize("shape", [(12, 16), (12, 16, 3)])
+def test_correlate_matches_reference(rng, border, shape):
+    array = rng.integers(0, 256, shape, dtype=np.uint8)
+    kernel = rng.normal(size=(3, 5))
+
+    result = image_ops.correlate(array, kernel, border=border, border_value=7)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, reference_correlate(array, kernel, border), rtol=1e-5, atol=1e-3)
+
+@pytest.mark.parametrize("border", list(NP_PAD_MODES))
+def test_correlate_splits_rank_one_kernels(rng, border, monkeypatch):
+    array = rng.integers(0, 256, (12, 16, 3), dtype=np.uint8)
+    kernel = np.outer(rng.normal(size=5), rng.normal(size=3))
+
+    separable_calls = []
+    correlate_separable = image_ops.correlate_separable
+    def spy(*args, **kwargs):
+        separable_calls.append(args)
+        return correlate_separable(*args, **kwargs)
+    monkeypatch.setattr(image_ops, "correlate_separable", spy)
+
+    result = image_ops.correlate(array, kernel, border=border, border_value=7)
+    assert len(separable_calls) == 1
+    np.testing.assert_allclose(result, reference_correlate(array, kernel, border), rtol=1e-5, atol=1e-3)
+
+@pytest.mark.parametrize("border", list(NP_PAD_MODES))
+def test_correlate_separable_matches_outer_kernel(rng, border):
+    array = rng.integers(0, 256, (12, 16), dtype=np.uint8)
+    kernel_x, kernel_y = rng.normal(size=5), rng.normal(size=3)
+
+    result = image_ops.correlate_separable(array, kernel_x, kernel_y, border=border, border_value=7)
+    np.testing.assert_allclose(result, reference_correlate(array, np.outer(kernel_y, kernel_x), border), rtol=1e-5, atol=1e-3)
+
+def test_kernels_must_be_odd(rng):
+    array = rng.integers(0, 256, (12, 16), dtype=np.uint8)
+    with pytest.raises(ValueError):
+        image_ops.correlate(array, np.ones((2, 3)))
+    with pytest.raises(ValueError):
+        image_ops.correlate_separable(array, np.ones(3), np.ones(4))
+    with pytest.raises(ValueError):
+        image_ops.median(array, 4)
+
+def test_gaussian_kernel():
+    kernel = image_ops.gaussian_kernel(1.0)
+    assert len(kernel) == 7
+    assert kernel.sum() == pytest.approx(1)
+    np.testing.assert_allclose(kernel, kernel[::-1])
+    np.testing.assert_allclose(kernel / kernel[3], np.exp(-np.arange(-3, 4) ** 2 / 2))
+
+@pytest.mark.parametrize("border", list(NP_PAD_MODES))
+@pytest.mark.parametrize("shape", [(12, 16), (12, 16, 3)])
+def test_median_matches_reference(rng, border, shape):
+    array = rng.integers(0, 256, shape, dtype=np.uint8)
+
+    result = image_ops.median(array, 3, border=border, border_value=7)
+    assert result.dtype == np.uint8
+    expected = np.median(reference_windows(array, 3, 3, border).reshape(shape + (9,)), axis=-1)
+    np.testing.assert_array_equal(result, expected)
+
+def test_image_filters_round_and_saturate(rng):
+    gray = eyepy.Image.from_array(rng.integers(0, 256, (12, 16), dtype=np.uint8))
+    kernel = np.array(((0, -1, 0), (-1, 5, -1), (0, -1, 0)))
+
+    expected = np.clip(np.rint(reference_correlate(gray.as_array(), kernel, "replicate")), 0, 255)
+    np.testing.assert_array_equal(gray.filter(kernel).as_array(), expected)
+
+    colour = eyepy.Image.from_array(rng.integers(0, 256, (12, 16, 3), dtype=np.uint8))
+    box = np.full((3, 3), 1 / 9)
+    expected = np.rint(reference_correlate(colour.as_array(), box, "replicate"))
+    # float32 sums can round the other way at exactly .5
+    assert np.abs(colour.box_filter(3).as_array().astype(int) - expected).max() <= 1
+    assert colour.median_filter(3).shape == colour.shape
+
+def test_sobel_matches_reference(rng):
+    array = rng.integers(0, 256, (12, 16), dtype=np.uint8)
+    gx, gy = eyepy.Image.from_array(array).gradients()
+
+    kernel_x = np.array(((-1, 0, 1), (-2, 0, 2), (-1, 0, 1)))
+    np.testing.assert_allclose(gx, reference_correlate(array, kernel_x, "replicate"), atol=1e-3)
+    np.testing.assert_allclose(gy, reference_correlate(array, kernel_x.T, "replicate"), atol=1e-3)
+
+    # a dark to light step towards +x
+    step = np.zeros((5, 8), dtype=np.uint8)
+    step[:, 4:] = 100
+    gx, gy = image_ops.sobel(step)
+    assert gx[:, 3:5].tolist() == [[400, 400]] * 5
+    assert not gx[:, :3].any() and not gx[:, 5:].any() and not gy.any()
+    assert eyepy.Image.from_array(step).sobel().as_array()[:, 3:5].tolist() == [[255, 255]] * 5
+
+def reference_non_maximum_suppression(magnitude: np.ndarray, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+    height, width = magnitude.shape
+    def at(y: int, x: int) -> float:
+        return magnitude[y, x] if 0 <= y < height and 0 <= x < width else 0
+    # the neighbours along each direction (y down), for the gradient angle rounded to 45 degrees
+    steps = {0: (0, 1), 45: (1, 1), 90: (1, 0), 135: (1, -1)}
+    kept = np.zeros(magnitude.shape, dtype=bool)
+    for y in range(height):
+        for x in range(width):
+            angle = round(np.degrees(np.arctan2(gy[y, x], gx[y, x])) / 45) * 45 % 180
+            dy, dx = steps[angle]
+            kept[y, x] = magnitude[y, x] > max(at(y - dy, x - dx), at(y + dy, x + dx))
+    return kept
+
+def test_non_maximum_suppression_matches_reference(rng):
+    gx, gy = rng.normal(size=(2, 20, 24))
+    magnitude = rng.random((20, 24)) + 0.1
+    expected = reference_non_maximum_suppression(magnitude, gx, gy)
+    np.testing.assert_array_equal(image_ops.non_maximum_suppression(magnitude, gx, gy), expected)
+
+def test_hysteresis_keeps_regions_with_strong_pixels(rng):
+    weak = rng.random((30, 40)) < 0.45
+    strong = weak & (rng.random((30, 40)) < 0.02)
+
+    # 8-connected regions of `weak`, as labelled by a flood fill
+    labels = np.zeros(weak.shape, dtype=np.int64)
+    n = 0
+    for start in zip(*np.nonzero(weak)):
+        if labels[start]:
+            continue
+        n += 1
+        labels[start] = n
+        stack = [start]
+        while stack:
+            y, x = stack.pop()
+            for ny in range(max(y - 1, 0), min(y + 2, 30)):
+                for nx in range(max(x - 1, 0), min(x + 2, 40)):
+                    if weak[ny, nx] and not labels[ny, nx]:
+                        labels[ny, nx] = n
+                        stack.append((ny, nx))
+    expected = np.isin(labels, labels[strong]) & weak
+    np.testing.assert_array_equal(image_ops.hysteresis(weak, strong), expected)
+
+def test_canny_outlines_a_rectangle():
+    array = np.zeros((60, 80), dtype=np.uint8)
+    array[15:45, 20:60] = 200
+    edges = eyepy.Image.from_array(array).canny(50, 100).as_array()
+    assert edges.dtype == np.uint8 and set(np.unique(edges).tolist()) == {0, 1}
+
+    ys, xs = np.nonzero(edges)
+    # every edge pixel is next to the rectangle's boundary
+    to_boundary = np.minimum(np.minimum(np.abs(xs - 19.5), np.abs(xs - 59.5)), np.minimum(np.abs(ys - 14.5), np.abs(ys - 44.5)))
+    assert to_boundary.max() <= 1
+    # one pixel wide along each side (away from the corners), with no gaps
+    assert edges[20:40, 10:30].sum(axis=1).tolist() == [1] * 20
+    assert edges[20:40, 50:70].sum(axis=1).tolist() == [1] * 20
+    assert edges[5:25, 30:50].sum(axis=0).tolist() == [1] * 20
+    assert edges[35:55, 30:50].sum(axis=0).tolist() == [1] * 20
+
+    assert not eyepy.Image.from_array(array).canny(900, 1000).as_array().any()  # gradients of at most 4 * 200
+    with pytest.raises(ValueError):
+        eyepy.Image.from_array(array).canny(100, 50)
+
+def test_hough_finds_drawn_lines():
+    edges = np.zeros((100, 120), dtype=np.uint8)
+    image_ops.draw_line(edges, 10, 20, 90, 20, 1)  # horizontal, 81 pixels
+    image_ops.draw_line(edges, 30, 35, 30, 95, 1)  # vertical, 61 pixels
+    image_ops.draw_line(edges, 50, 40, 100, 90, 1)  # diagonal, 51 pixels
+
+    segments = eyepy.hough_lines(edges, threshold=30, min_length=20)
+    assert [segment.votes for segment in segments] == [81, 61, 51]
+    horizontal, vertical, diagonal = segments
+
+    assert horizontal.theta == pytest.approx(np.pi / 2) and horizontal.rho == pytest.approx(20)
+    assert sorted((horizontal.p1, horizontal.p2)) == [pytest.approx((10, 20), abs=1e-3), pytest.approx((90, 20), abs=1e-3)]
+    assert vertical.theta == pytest.approx(0) and vertical.rho == pytest.approx(30)
+    assert vertical.length == pytest.approx(60, abs=1e-3)
+    # the normal of the line y = x - 10 points down-left, so the line is on its negative side
+    assert diagonal.theta == pytest.approx(3 * np.pi / 4) and diagonal.rho == pytest.approx(-10 / np.sqrt(2), abs=0.5)
+    assert diagonal.length == pytest.approx(50 * np.sqrt(2), abs=1)
+
+    # coarser bins still find the same lines
+    coarse = eyepy.hough_lines(edges, rho_resolution=2, theta_resolution=np.pi / 90, threshold=30, min_length=20)
+    assert [segment.votes for segment in coarse] == [81, 61, 51]
+    assert eyepy.hough_lines(edges, threshold=30, min_length=75) == [horizontal]
+    assert eyepy.hough_lines(np.zeros((10, 10))) == []
@@ -0,0 +1,180 @@
+import os
+
+import numpy as np
+import pytest
+
+import eyepy
+
+
+def test_hue_range_never_matches_gray():
+    gray = np.array([[255, 0, 128]], dtype=np.uint8)
+    assert not eyepy.HSIRange(hue=(200, 255)).matches(gray).any()
+    assert not eyepy.HSIRange(hue=(240, 10)).matches(gray).any()
+    assert eyepy.HSIRange().matches(gray).all()
+
+def test_lookup_table_load_rebuilds_bad_caches(tmp_path):
+    path = eyepy.HSILookupTable.cache_path(4, tmp_path)
+    good = eyepy.HSILookupTable.load(4, cache_dir=tmp_path).table.copy()
+    saved = path.read_bytes()
+
+    bad_files = [
+        saved[:len(saved) // 2],  # truncated
+        saved[:20],  # truncated header
+        b"",
+    ]
+    with open(path, "wb") as f:
+        np.save(f, np.zeros((1 << 12, 3), dtype=np.uint8))  # wrong shape
+    bad_files.append(path.read_bytes())
+
+    for contents in bad_files:
+        path.write_bytes(contents)
+        assert np.array_equal(eyepy.HSILookupTable.load(4, cache_dir=tmp_path).table, good)
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+
+def test_lookup_table_save_removes_temporary_file(tmp_path, monkeypatch):
+    def fail(*_):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        eyepy.HSILookupTable.load(4, cache_dir=tmp_path)
+    assert list(tmp_path.iterdir()) == []
+
+# colours with known RoBIOS values, as (r, g, b), (h, s, i)
+KNOWN_HSI = [
+    ((255, 0, 0), (42, 255, 85)),
+    ((0, 255, 0), (126, 255, 85)),
+    ((0, 0, 255), (210, 255, 85)),
+    ((255, 255, 0), (84, 255, 170)),
+    ((0, 255, 255), (168, 255, 170)),
+    ((255, 0, 255), (0, 255, 170)),
+    ((100, 50, 50), (255, 62, 66)),  # 2 * delta <= max, so no hue
+    ((0, 0, 0), (255, 0, 0)),
+    ((255, 255, 255), (255, 0, 255)),
+    ((200, 10, 30), (38, 224, 80)),  # negative hue offset, truncated towards zero
+]
+
+@pytest.fixture
+def rgb_samples() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    known = np.array([rgb for rgb, _ in KNOWN_HSI], dtype=np.uint8)
+    return np.concatenate((known, rng.integers(0, 256, (2000, 3), dtype=np.uint8)))
+
+def test_rgb_to_hsi_matches_known_values():
+    rgb = np.array([rgb for rgb, _ in KNOWN_HSI], dtype=np.uint8)
+    expected = [hsi for _, hsi in KNOWN_HSI]
+    assert [eyepy.IPPRGB2HSI(tuple(c)) for c in rgb.tolist()] == expected
+    assert eyepy.IPPRGB2HSIImage(rgb, lut=False).tolist() == [list(hsi) for hsi in expected]
+    assert eyepy.IPPRGB2HueImage(rgb, lut=False).tolist() == [h for h, _, _ in expected]
+
+def test_batched_conversions_match_scalar(rgb_samples):
+    expected = [eyepy.IPPRGB2HSI(tuple(c)) for c in rgb_samples.tolist()]
+    assert [tuple(hsi) for hsi in eyepy.IPPRGB2HSIImage(rgb_samples, lut=False).tolist()] == expected
+    assert eyepy.IPPRGB2HueImage(rgb_samples, lut=False).tolist() == [eyepy.IPPRGB2Hue(tuple(c)) for c in rgb_samples.tolist()]
+
+    cols = (rgb_samples[:, 0].astype(np.int64) << 16) | (rgb_samples[:, 1].astype(np.int64) << 8) | rgb_samples[:, 2]
+    assert [tuple(hsi) for hsi in eyepy.IPPCol2HSIArray(cols, lut=False).tolist()] == [eyepy.IPPCol2HSI(c) for c in cols.tolist()]
+
+def test_image_conversions_keep_the_resolution(rgb_samples):
+    image = eyepy.Image.from_array(np.resize(rgb_samples, (120, 160, 3)))
+    hsi = eyepy.IPPRGB2HSIImage(image, lut=False)
+    hue = eyepy.IPPRGB2HueImage(image, lut=False)
+    assert hsi.resolution == image.resolution and not hsi.is_gray
+    assert hue.resolution == image.resolution and hue.is_gray
+    np.testing.assert_array_equal(hue.as_array(), hsi.as_array()[..., 0])
+
+    with pytest.raises(ValueError):
+        eyepy.IPPRGB2HSIImage(eyepy.Image.blank(gray=True, resolution=eyepy.QQVGA))
+
+def test_lookup_table_converts_cell_centres(rgb_samples):
+    lut = eyepy.HSILookupTable.build(4)
+    centres = (rgb_samples >> 4 << 4) + 8
+    np.testing.assert_array_equal(lut.lookup(rgb_samples), eyepy.IPPRGB2HSIImage(centres, lut=False))
+    np.testing.assert_array_equal(eyepy.IPPRGB2HueImage(rgb_samples, lut=lut), eyepy.IPPRGB2HueImage(centres, lut=False))
+
+def test_hsi_to_rgb_matches_scalar():
+    h, s, i = np.meshgrid(np.arange(0, 360, 7), np.arange(0, 256, 15), np.arange(0, 256, 15), indexing="ij")
+    hsi = np.stack((h, s, i), axis=-1).reshape(-1, 3)
+    expected = [eyepy.IPPHSI2RGB(tuple(c)) for c in hsi.tolist()]
+    assert [tuple(rgb) for rgb in eyepy.IPPHSI2RGBImage(hsi).tolist()] == expected
+
+    with pytest.raises(ValueError):
+        eyepy.IPPHSI2RGBImage(np.array([[360, 0, 0]]))
+
+def reference_label_blobs(mask: np.ndarray, connectivity: int, min_area: int) -> tuple[np.ndarray, list[tuple]]:
+    """
+    Flood fills each component from its first pixel in raster order, returning the expected labels
+    and `(area, centroid, top_left, bottom_right, range_index)` per blob.
+    """
+    height, width = mask.shape
+    neighbours = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    if connectivity == 8:
+        neighbours += [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+    component = np.zeros(mask.shape, dtype=np.int64)
+    components = []
+    for y in range(height):
+        for x in range(width):
+            if mask[y, x] == 0 or component[y, x]:
+                continue
+            components.append([])
+            component[y, x] = len(components)
+            stack = [(y, x)]
+            while stack:
+                py, px = stack.pop()
+                components[-1].append((px, py))
+                for dy, dx in neighbours:
+                    ny, nx = py + dy, px + dx
+                    if 0 <= ny < height and 0 <= nx < width and not component[ny, nx] and mask[ny, nx] == mask[y, x]:
+                        component[ny, nx] = len(components)
+                        stack.append((ny, nx))
+
+    kept = sorted((i for i, pixels in enumerate(components) if len(pixels) >= min_area), key=lambda i: -len(components[i]))
+    labels = np.zeros(mask.shape, dtype=np.int32)
+    blobs = []
+    for label, i in enumerate(kept, 1):
+        xs, ys = np.array(components[i]).T
+        labels[ys, xs] = label
+        first_x, first_y = components[i][0]
+        blobs.append((len(xs), (xs.mean(), ys.mean()), (xs.min(), ys.min()), (xs.max(), ys.max()), int(mask[first_y, first_x]) - 1))
+    return labels, blobs
+
+@pytest.mark.parametrize("connectivity", [4, 8])
+@pytest.mark.parametrize("seed", range(3))
+def test_label_blobs_matches_flood_fill(connectivity, seed):
+    rng = np.random.default_rng(seed)
+    # near the percolation threshold, so there are large, winding components
+    mask = (rng.random((30, 40)) < 0.55) * rng.integers(1, 3, (30, 40))
+
+    for min_area in (1, 5):
+        expected_labels, expected_blobs = reference_label_blobs(mask, connectivity, min_area)
+        result = eyepy.label_blobs(mask, connectivity=connectivity, min_area=min_area)
+        np.testing.assert_array_equal(result.labels, expected_labels)
+        assert len(result.blobs) == len(expected_blobs)
+        for label, (blob, (area, centroid, top_left, bottom_right, range_index)) in enumerate(zip(result.blobs, expected_blobs), 1):
+            assert blob.label == label
+            assert blob.area == area
+            assert blob.centroid == pytest.approx(centroid)
+            assert blob.top_left == top_left and blob.bottom_right == bottom_right
+            assert blob.range_index == range_index
+
+def test_label_blobs_joins_u_shapes():
+    mask = np.zeros((6, 9), dtype=bool)
+    mask[0:5, 1] = mask[0:5, 7] = mask[4, 1:8] = True  # two arms only joined at the bottom
+    mask[0:3, 4] = True  # not joined
+    result = eyepy.label_blobs(mask, connectivity=4)
+    assert [blob.area for blob in result.blobs] == [15, 3]
+    assert result.blobs[0].top_left == (1, 0) and result.blobs[0].bottom_right == (7, 4)
+
+def test_find_blobs_finds_coloured_squares():
+    image = np.zeros((40, 60, 3), dtype=np.uint8)
+    image[5:15, 10:30] = (255, 0, 0)
+    image[20:26, 40:44] = (0, 255, 0)
+    image[30:35, 2:7] = (255, 0, 0)
+
+    red = eyepy.HSIRange(hue=(240, 60), saturation=(128, 255))
+    green = eyepy.HSIRange(hue=(100, 150), saturation=(128, 255))
+    result = eyepy.find_blobs(image, [green, red], lut=False)
+    assert [(blob.area, blob.range_index) for blob in result.blobs] == [(200, 1), (25, 1), (24, 0)]
+    assert result.blobs[0].centroid == pytest.approx((19.5, 9.5))
+    assert (result.blobs[2].top_left, result.blobs[2].bottom_right) == ((40, 20), (43, 25))
+    assert (result.labels > 0).sum() == 249
@@ -0,0 +1,13 @@
+import eyepy
+from eyepy import lcd
+
+
+def test_internal_helpers_are_not_exported():
+    assert "repeat_func" not in dir(eyepy)
+    assert not hasattr(eyepy, "repeat_func")
+
+def test_lazy_lcd_default_is_listed(sim):
+    assert "lcd_default_world_coord_map" in dir(lcd)
+    namespace: dict[str, object] = {}
+    exec("from eyepy.lcd import *", namespace)
+    assert namespace["lcd_default_world_coord_map"] is lcd.lcd_default_world_coord_map
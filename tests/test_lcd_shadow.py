@@ -0,0 +1,32 @@
+import eyepy
+from eyepy import lcd as _lcd
+from eyepy.instrumentation import _InstrumentedFunction
+
+
+def test_shadowing_survives_disabling_instrumentation(sim):
+    eyepy.enable_instrumentation()
+    shadow = eyepy.LCDShadow()
+    shadow.start()
+    try:
+        eyepy.disable_instrumentation()
+        eyepy.LCDPixel((10, 10), eyepy.RED)
+        assert shadow.frame[10, 10].tolist() == [255, 0, 0]
+        assert sim.lcd[10, 10].tolist() == [0, 0, 0]
+
+        eyepy.LCDRefresh()
+        assert sim.lcd[10, 10].tolist() == [255, 0, 0]
+    finally:
+        shadow.stop()
+    assert not isinstance(_lcd._LCDPixel, _InstrumentedFunction)
+    assert not isinstance(_lcd._LCDRefresh, _InstrumentedFunction)
+
+def test_instrumentation_times_flushes(sim):
+    eyepy.reset_instrumentation()
+    with eyepy.LCDShadow():
+        eyepy.enable_instrumentation()
+        try:
+            eyepy.LCDRefresh()
+        finally:
+            eyepy.disable_instrumentation()
+    assert eyepy.instrumentation_snapshot()["lib.LCDImage"].calls > 0
+    assert not isinstance(_lcd._LCDPixel, _InstrumentedFunction)
@@ -0,0 +1,78 @@
+import math
+
+import numpy as np
+import pytest
+
+import eyepy
+from eyepy import lidar
+
+
+@pytest.fixture
+def lidar_set_calls(sim, monkeypatch) -> list[tuple[int, int, int]]:
+    """
+    The configs passed to `eye`'s `LIDARSet`, starting from the default config.
+    """
+    monkeypatch.setattr(lidar, "_lidar_range", 360)
+    monkeypatch.setattr(lidar, "_lidar_tilt", 0)
+    monkeypatch.setattr(lidar, "_lidar_n_points", 360)
+
+    calls = []
+    lidar_set = lidar._LIDARSet
+    def spy(*args):
+        calls.append(args)
+        return lidar_set(*args)
+    monkeypatch.setattr(lidar, "_LIDARSet", spy)
+    return calls
+
+def test_set_skips_unchanged_configs(lidar_set_calls):
+    eyepy.LIDARSet(range=360, n_points=360)
+    assert lidar_set_calls == []
+
+    eyepy.LIDARSet(n_points=180)
+    eyepy.LIDARSet(n_points=180)
+    eyepy.LIDARSet(n_points=180, force=True)
+    assert lidar_set_calls == [(360, 0, 180), (360, 0, 180)]
+
+def test_get_only_overrides_changed_configs(lidar_set_calls):
+    assert len(eyepy.LIDARGet(range=360, tilt=0)) == 360
+    assert lidar_set_calls == []
+
+    scan = eyepy.LIDARGetScan(range=180, n_points=90)
+    assert len(scan) == 90
+    assert scan.config == eyepy.LIDARConfig(range=180, tilt=0, n_points=90)
+    assert lidar_set_calls == [(180, 0, 90), (360, 0, 360)]
+    assert eyepy.LIDARGetConfig() == eyepy.LIDARConfig(range=360, tilt=0, n_points=360)
+
+def test_trig_tables_are_cached_per_config():
+    config = eyepy.LIDARConfig(range=240, tilt=10, n_points=120)
+    a = eyepy.LIDARScan(np.zeros(120, dtype=np.int32), config)
+    b = eyepy.LIDARScan(np.ones(120, dtype=np.int32), eyepy.LIDARConfig(*config))
+    assert a.angles() is b.angles()
+    assert not a.angles().flags.writeable
+    assert eyepy.LIDARScan(a.distances, config._replace(n_points=60)).angles() is not a.angles()
+
+@pytest.mark.parametrize("config", [(360, 0, 360), (180, 0, 90), (240, 20, 100)])
+def test_points_match_reference(config):
+    config = eyepy.LIDARConfig(*config)
+    distances = np.random.default_rng(0).integers(0, 5000, config.n_points, dtype=np.int32)
+    scan = eyepy.LIDARScan(distances, config)
+
+    degrees = [config.range / 2 - i * config.range / config.n_points for i in range(config.n_points)]
+    horizontal = [d * math.cos(math.radians(config.tilt)) for d in distances.tolist()]
+    expected = [(h * math.cos(math.radians(a)), h * math.sin(math.radians(a))) for h, a in zip(horizontal, degrees)]
+    np.testing.assert_allclose(scan.angles(), np.radians(degrees))
+    np.testing.assert_allclose(scan.to_points(), expected, atol=1e-6)
+
+    pose = eyepy.Pose2D(100, -50, math.radians(30))
+    expected_world = [(100 + x * math.cos(math.radians(30)) - y * math.sin(math.radians(30)), -50 + x * math.sin(math.radians(30)) + y * math.cos(math.radians(30))) for x, y in expected]
+    np.testing.assert_allclose(scan.to_points(pose), expected_world, atol=1e-6)
+
+def test_world_points_lie_on_walls(sim):
+    sim.set_pose(700, 1200, 90)
+
+    scan = eyepy.LIDARGetScan(tilt=0)
+    assert scan[180] == 800  # straight ahead (up) to the wall at y = 2000
+    points = scan.to_points(eyepy.VWGetPosition())
+    # every point is on one of the walls of the box, to within rounding
+    to_wall = np.minimum(np.abs(points), np.abs(points - 2000)).min(axis=1)
+    assert to_wall.max() < 1
@@ -0,0 +1,40 @@
+import pytest
+
+import eyepy
+
+
+@pytest.fixture(autouse=True)
+def clear_motor_cache():
+    eyepy.forget_motor_speeds([1, 2, 3, 4])
+
+
+def test_drive_many_rewrites_after_vw_command(sim):
+    assert eyepy.MOTORDriveMany({1: 50, 2: 50})
+    eyepy.VWSetSpeed(lin_speed=0, ang_speed=0)
+    assert eyepy.MOTORDriveMany({1: 50, 2: 50})
+
+    sim.advance(1000)
+    assert eyepy.VWGetPosition().pos.x > 1000
+
+def test_drive_many_rewrites_after_fast_path_vw_command(sim):
+    assert eyepy.MOTORDriveMany({1: 50, 2: 50})
+    eyepy.bind_vw_set_speed()(0, 0)
+    assert eyepy.MOTORDriveMany({1: 50, 2: 50})
+
+    sim.advance(1000)
+    assert eyepy.VWGetPosition().pos.x > 1000
+
+def test_drive_many_rewrites_after_fast_path_drive(sim):
+    assert eyepy.MOTORDriveMany({1: 50, 2: 50})
+    eyepy.bind_motor_drive(1)(0)
+    eyepy.bind_motor_drive(2)(0)
+    assert eyepy.MOTORDriveMany({1: 50, 2: 50})
+
+    sim.advance(1000)
+    assert eyepy.VWGetPosition().pos.x > 1000
+
+def test_dual_drive_rejects_same_motor(sim):
+    with pytest.raises(ValueError):
+        eyepy.MOTORDualDrive(1, 1, speed=50)
+    with pytest.raises(ValueError):
+        eyepy.MOTORDualDrive(1, 1, speed=50, skip_unchanged=True)
@@ -0,0 +1,42 @@
+import threading
+import time
+
+import eyepy
+from eyepy import os_funcs
+
+
+def test_core_timer_initialised_once_across_threads(monkeypatch):
+    attached: list[int] = []
+    def attach(period_ms, f):
+        # releases the GIL, as the real call into eye does
+        time.sleep(0.01)
+        attached.append(period_ms)
+        return len(attached)
+    monkeypatch.setattr(os_funcs, "_core_timer_initialised", False)
+    monkeypatch.setattr(os_funcs, "_OSAttachTimer", attach)
+    monkeypatch.setattr(os_funcs, "_OSDetachTimer", lambda timer: 0)
+
+    barrier = threading.Barrier(8)
+    def count():
+        barrier.wait()
+        eyepy.OSGetCount()
+    threads = [threading.Thread(target=count) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(attached) == 1
+
+def test_attaching_a_timer_waits_for_initialisation(sim):
+    attached = threading.Event()
+    def attach():
+        eyepy.OSDetachTimer(eyepy.OSAttachTimer(1000, type(None)))
+        attached.set()
+
+    with os_funcs._core_timer_lock:
+        thread = threading.Thread(target=attach)
+        thread.start()
+        assert not attached.wait(0.05)
+    thread.join()
+    assert attached.is_set()
@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+import eyepy
+from eyepy import psd as _psd
+from eyepy.instrumentation import _InstrumentedFunction
+
+
+def test_recording_survives_disabling_instrumentation(sim, tmp_path):
+    eyepy.enable_instrumentation()
+    recorder = eyepy.SensorRecorder(tmp_path / "log")
+    recorder.start()
+    eyepy.disable_instrumentation()
+    eyepy.PSDGet(eyepy.PSD_FRONT)
+    recorder.stop()
+    recorder.writer.close()
+
+    assert len(eyepy.SensorLog(tmp_path / "log").select("psd", eyepy.PSD_FRONT)) == 1
+    assert not isinstance(_psd._PSDGet, _InstrumentedFunction)
+
+def test_stopping_recording_keeps_instrumentation(sim, tmp_path):
+    with eyepy.SensorRecorder(tmp_path / "log"):
+        eyepy.enable_instrumentation()
+    try:
+        assert isinstance(_psd._PSDGet, _InstrumentedFunction)
+    finally:
+        eyepy.disable_instrumentation()
+    assert not isinstance(_psd._PSDGet, _InstrumentedFunction)
+
+def test_replay_serves_each_record_once_across_threads(tmp_path):
+    with eyepy.SensorLogWriter(tmp_path / "log") as writer:
+        for i in range(4000):
+            writer.write_psd(eyepy.PSD_FRONT, i, timestamp=i)
+
+    served: list[int] = []
+    def poll():
+        values = [eyepy.PSDGet(eyepy.PSD_FRONT) for _ in range(1000)]
+        served.extend(values)
+
+    with eyepy.SensorReplay(tmp_path / "log"):
+        threads = [threading.Thread(target=poll) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert sorted(served) == list(range(4000))
+
+def _write_psd_log(path, n):
+    with eyepy.SensorLogWriter(path) as writer:
+        for i in range(n):
+            writer.write_psd(eyepy.PSD_FRONT, i, timestamp=i)
+
+def test_closing_with_live_images_raises_and_stays_open(tmp_path):
+    with eyepy.SensorLogWriter(tmp_path / "log") as writer:
+        writer.write_image(eyepy.Image.blank(resolution=eyepy.QQVGA), timestamp=0)
+    log = eyepy.SensorLog(tmp_path / "log")
+    record = log[0]
+    with pytest.raises(BufferError):
+        log.close()
+    assert not log.closed
+    assert log[0].timestamp == 0
+
+    del record
+    log.close()
+    assert log.closed
+    with pytest.raises(ValueError):
+        log[0]
+
+def test_replay_from_closed_log_raises(tmp_path):
+    _write_psd_log(tmp_path / "log", 2)
+    log = eyepy.SensorLog(tmp_path / "log")
+    with eyepy.SensorReplay(log):
+        assert eyepy.PSDGet(eyepy.PSD_FRONT) == 0
+        log.close()
+        with pytest.raises(ValueError, match="closed"):
+            eyepy.PSDGet(eyepy.PSD_FRONT)
+    with pytest.raises(ValueError, match="closed"):
+        eyepy.SensorReplay(log).start()
+
+def test_index_scan_stops_at_unknown_kind(tmp_path):
+    writer = eyepy.SensorLogWriter(tmp_path / "log")
+    for i in range(3):
+        writer.write_psd(eyepy.PSD_FRONT, i, timestamp=i)
+    writer.flush()
+    records = (tmp_path / "log").read_bytes()
+    writer.close()
+    # as if the process died after the file system extended the file with zeros
+    (tmp_path / "log").write_bytes(records + bytes(64))
+
+    log = eyepy.SensorLog(tmp_path / "log")
+    assert [record.value for record in log] == [0, 1, 2]
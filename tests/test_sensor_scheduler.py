@@ -0,0 +1,20 @@
+import time
+
+import eyepy
+
+
+def test_polls_wait_for_eye_lock(sim):
+    scheduler = eyepy.SensorScheduler()
+    scheduler.register_psd(eyepy.PSD_FRONT, rate_hz=1000)
+    try:
+        with eyepy.eye_lock:
+            scheduler.start()
+            time.sleep(0.05)
+            assert scheduler.latest("psd1") is None
+
+        deadline = time.monotonic() + 1
+        while scheduler.latest("psd1") is None and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert scheduler.latest("psd1") is not None
+    finally:
+        scheduler.stop()
@@ -5,7 +5,7 @@ from typing import NamedTuple, overload
 from eye import lib
 
 from eyepy.drawing import IntPoint, Point
-from eyepy.motors import MOTORDrive
+from eyepy.motors import MOTORDrive, forget_motor_speeds
 from eyepy.utils import wrap
 
 
@@ -18,6 +18,13 @@ def _VW_OK(return_code: int) -> bool:
 def wrap_turn_angle(angle: int) -> int:
     return wrap(angle, -180, 180)
 
+def _forget_wheel_speeds():
+    """
+    The VW commands drive the wheels (motors 1 and 2) themselves, so the speeds last set by
+    :func:`MOTORDrive` no longer apply; forgetting them makes :func:`MOTORDriveMany` rewrite them.
+    """
+    forget_motor_speeds([1, 2])
+
 from eye import VWSetSpeed as _VWSetSpeed
 def VWSetSpeed(*, lin_speed: int, ang_speed: int) -> bool:
     """
@@ -26,6 +33,7 @@ def VWSetSpeed(*, lin_speed: int, ang_speed: int) -> bool:
 
     Returns `True` if ok.
     """
+    _forget_wheel_speeds()
     return_code = _VWSetSpeed(lin_speed, ang_speed)
     return _VW_OK(return_code)
 
@@ -92,6 +100,7 @@ def VWStraight(dist: int, *, lin_speed: int) -> bool:
 
     Returns `True` if ok.
     """
+    _forget_wheel_speeds()
     return_code = _VWStraight(dist, lin_speed)
     return _VW_OK(return_code)
 
@@ -107,6 +116,7 @@ def VWTurn(angle: int, *, ang_speed: int, wrap: bool = True) -> bool:
     if wrap:
         angle = wrap_turn_angle(angle)
     
+    _forget_wheel_speeds()
     return_code = _VWTurn(angle, ang_speed)
     return _VW_OK(return_code)
 
@@ -123,6 +133,7 @@ def VWCurve(*, dist: int, angle: int, lin_speed: int, wrap: bool = True) -> bool
     if wrap:
         angle = wrap_turn_angle(angle)
 
+    _forget_wheel_speeds()
     return_code = _VWCurve(dist, angle, lin_speed)
     return _VW_OK(return_code)
 
@@ -138,6 +149,7 @@ def VWDrive(*, dx: int, dy: int, lin_speed: int) -> bool:
     Returns `True` if ok.
     """
     # ! TODO check if should throw exception if x <= |y|
+    _forget_wheel_speeds()
     return_code = _VWDrive(dx, dy, lin_speed)
     return _VW_OK(return_code)
 